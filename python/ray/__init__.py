@@ -82,7 +82,8 @@ _config = _Config()
 from ray.profiling import profile  # noqa: E402
 from ray.state import (global_state, jobs, nodes, tasks, objects, timeline,
                        object_transfer_timeline, cluster_resources,
-                       available_resources, errors)  # noqa: E402
+                       available_resources, errors,
+                       memory_summary)  # noqa: E402
 from ray.worker import (
     LOCAL_MODE,
     SCRIPT_MODE,
@@ -96,6 +97,7 @@ from ray.worker import (
     init,
     is_initialized,
     put,
+    put_many,
     register_custom_serializer,
     remote,
     shutdown,
@@ -107,6 +109,7 @@ import ray.projects  # noqa: E402
 # some functions in the worker.
 import ray.actor  # noqa: F401
 from ray.actor import method  # noqa: E402
+from ray.object_cache import cache_arguments  # noqa: E402
 from ray.runtime_context import _get_runtime_context  # noqa: E402
 
 # Ray version string.
@@ -123,6 +126,7 @@ __all__ = [
     "cluster_resources",
     "available_resources",
     "errors",
+    "memory_summary",
     "LOCAL_MODE",
     "PYTHON_MODE",
     "SCRIPT_MODE",
@@ -131,6 +135,7 @@ __all__ = [
     "_config",
     "_get_runtime_context",
     "actor",
+    "cache_arguments",
     "connect",
     "disconnect",
     "get",
@@ -144,6 +149,7 @@ __all__ = [
     "profile",
     "projects",
     "put",
+    "put_many",
     "register_custom_serializer",
     "remote",
     "shutdown",
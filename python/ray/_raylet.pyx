@@ -191,7 +191,15 @@ cdef c_bool is_simple_value(value, int64_t *num_elements_contained):
         return (num_elements_contained[0] <
                 RayConfig.instance().num_elements_limit())
 
-    if isinstance(value, numpy.ndarray):
+    if ((type(value) is set or type(value) is frozenset) and
+            len(value) < RayConfig.instance().size_limit()):
+        for item in value:
+            if not is_simple_value(item, num_elements_contained):
+                return False
+        return (num_elements_contained[0] <
+                RayConfig.instance().num_elements_limit())
+
+    if isinstance(value, (numpy.ndarray, numpy.generic)):
         if value.dtype == "O":
             return False
         num_elements_contained[0] += value.nbytes
@@ -211,6 +219,9 @@ def check_simple_value(value):
     But for performance reasons, it is better to place "small" objects in
     the task itself and "large" objects in the object store.
 
+    The size thresholds are the "size_limit" and "num_elements_limit" entries
+    of the internal config, which can be set through `ray.init`.
+
     Args:
         value: Python object that should be checked.
 
@@ -510,6 +521,47 @@ cdef class CoreWorker:
         with nogil:
             check_status(self.core_worker.get().Objects().Seal(c_object_id))
 
+    def put_serialized_objects(self, serialized_objects, object_ids,
+                               int memcopy_threads=6):
+        """Write and seal a list of serialized objects.
+
+        Each object is sealed before the next one is created, so if this
+        fails, e.g. because the object store is full, all objects before the
+        failed one are available. Objects that already exist are skipped.
+        """
+        cdef:
+            shared_ptr[CBuffer] data
+            shared_ptr[CBuffer] metadata
+            c_vector[CObjectID] c_object_ids = ObjectIDsToVector(object_ids)
+            CObjectID c_object_id
+            size_t data_size
+            size_t i
+
+        assert len(serialized_objects) == c_object_ids.size()
+        for i in range(c_object_ids.size()):
+            serialized_object = serialized_objects[i]
+            c_object_id = c_object_ids[i]
+            data_size = serialized_object.total_bytes
+
+            with nogil:
+                check_status(self.core_worker.get().Objects().Create(
+                            metadata, data_size, c_object_id, &data))
+
+            # If data is nullptr, that means the ObjectID already existed,
+            # which we ignore.
+            if not data:
+                continue
+
+            stream = pyarrow.FixedSizeBufferWriter(
+                pyarrow.py_buffer(Buffer.make(data)))
+            stream.set_memcopy_threads(memcopy_threads)
+            serialized_object.write_to(stream)
+            data.reset()
+
+            with nogil:
+                check_status(self.core_worker.get().Objects().Seal(
+                    c_object_id))
+
     def put_raw_buffer(self, c_string value, ObjectID object_id,
                        int memcopy_threads=6):
         cdef:
@@ -636,6 +688,46 @@ cdef class CoreWorker:
 
             return VectorToObjectIDs(return_ids)
 
+    def submit_tasks(self,
+                     function_descriptor,
+                     list args_list,
+                     int num_return_vals,
+                     resources):
+        """Submit one task per entry of args_list with the same options.
+
+        The function, resources and task options are only converted once,
+        and all tasks are submitted without reacquiring the GIL.
+
+        Returns:
+            A list with the list of return ObjectIDs of each task.
+        """
+        cdef:
+            unordered_map[c_string, double] c_resources
+            CTaskOptions task_options
+            CRayFunction ray_function
+            c_vector[c_vector[CTaskArg]] args_vectors
+            c_vector[c_vector[CObjectID]] return_ids
+            size_t i
+
+        with profiling.profile("submit_tasks"):
+            prepare_resources(resources, &c_resources)
+            task_options = CTaskOptions(num_return_vals, c_resources)
+            ray_function = CRayFunction(
+                LANGUAGE_PYTHON, string_vector_from_list(function_descriptor))
+            args_vectors.resize(len(args_list))
+            return_ids.resize(len(args_list))
+            for i in range(len(args_list)):
+                prepare_args(args_list[i], &args_vectors[i])
+
+            with nogil:
+                for i in range(args_vectors.size()):
+                    check_status(self.core_worker.get().Tasks().SubmitTask(
+                        ray_function, args_vectors[i], task_options,
+                        &return_ids[i]))
+
+            return [VectorToObjectIDs(return_ids[i])
+                    for i in range(return_ids.size())]
+
     def create_actor(self,
                      function_descriptor,
                      args,
@@ -12,6 +12,7 @@ from abc import ABCMeta, abstractmethod
 from collections import namedtuple
 
 from ray.function_manager import FunctionDescriptor
+import ray.object_store_profiler as object_store_profiler
 import ray.ray_constants as ray_constants
 import ray._raylet
 import ray.signature as signature
@@ -451,6 +452,10 @@ class ActorHandle(object):
         _ray_original_handle: True if this is the original actor handle for a
             given actor. If this is true, then the actor will be destroyed when
             this handle goes out of scope.
+        _ray_function_descriptors: A map from method name to the method's
+            FunctionDescriptor and its descriptor list, computed the first
+            time the method is called through this handle.
+        _ray_actor_method_resources: The resources required by actor methods.
     """
 
     def __init__(self,
@@ -474,6 +479,8 @@ class ActorHandle(object):
         self._ray_class_name = class_name
         self._ray_actor_method_cpus = actor_method_cpus
         self._ray_session_and_job = session_and_job
+        self._ray_function_descriptors = {}
+        self._ray_actor_method_resources = {"CPU": actor_method_cpus}
 
     def _actor_method_call(self,
                            method_name,
@@ -508,8 +515,16 @@ class ActorHandle(object):
             kwargs = {}
         args = signature.extend_args(function_signature, args, kwargs)
 
-        function_descriptor = FunctionDescriptor(
-            self._ray_module_name, method_name, self._ray_class_name)
+        try:
+            function_descriptor, function_descriptor_list = (
+                self._ray_function_descriptors[method_name])
+        except KeyError:
+            function_descriptor = FunctionDescriptor(
+                self._ray_module_name, method_name, self._ray_class_name)
+            function_descriptor_list = (
+                function_descriptor.get_function_descriptor_list())
+            self._ray_function_descriptors[method_name] = (
+                function_descriptor, function_descriptor_list)
 
         with profiling.profile("submit_task"):
             if worker.mode == ray.LOCAL_MODE:
@@ -518,9 +533,12 @@ class ActorHandle(object):
                     function, function_descriptor, args, num_return_vals)
             else:
                 object_ids = worker.core_worker.submit_actor_task(
-                    self._ray_core_handle,
-                    function_descriptor.get_function_descriptor_list(), args,
-                    num_return_vals, {"CPU": self._ray_actor_method_cpus})
+                    self._ray_core_handle, function_descriptor_list, args,
+                    num_return_vals, self._ray_actor_method_resources)
+                if worker.object_store_profiler is not None:
+                    worker.object_store_profiler.record_tasks(
+                        [args], [object_ids],
+                        object_store_profiler.ACTOR_HANDLE)
 
         if len(object_ids) == 1:
             object_ids = object_ids[0]
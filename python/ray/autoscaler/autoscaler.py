@@ -20,6 +20,8 @@ from ray.worker import global_worker
 from ray.autoscaler.docker import dockerize_if_needed
 from ray.autoscaler.node_provider import get_node_provider, \
     get_default_config
+from ray.autoscaler.resource_demand_scheduler import demands_from_load, \
+    demands_from_requests, get_nodes_to_launch
 from ray.autoscaler.tags import (TAG_RAY_LAUNCH_CONFIG, TAG_RAY_RUNTIME_CONFIG,
                                  TAG_RAY_NODE_STATUS, TAG_RAY_NODE_TYPE,
                                  TAG_RAY_NODE_NAME, STATUS_UP_TO_DATE,
@@ -223,6 +225,17 @@ class LoadMetrics(object):
     def approx_workers_used(self):
         return self._info()["NumNodesUsed"]
 
+    def get_resource_demands(self):
+        """Returns the queued resource demands of all nodes.
+
+        Returns:
+            A list of (shape, count) pairs, see `demands_from_load`.
+        """
+        demands = []
+        for resource_load in self.resource_load_by_ip.values():
+            demands.extend(demands_from_load(resource_load))
+        return demands
+
     def num_workers_connected(self):
         return self._info()["NumNodesConnected"]
 
@@ -448,6 +461,7 @@ class StandardAutoscaler(object):
             assert os.path.exists(local_path)
 
         self.resource_requests = defaultdict(int)
+        self.resource_request_bundles = []
 
         logger.info("StandardAutoscaler: {}".format(self.config))
 
@@ -477,11 +491,11 @@ class StandardAutoscaler(object):
         nodes = self.workers()
         self.load_metrics.prune_active_ips(
             [self.provider.internal_ip(node_id) for node_id in nodes])
-        target_workers = self.target_num_workers()
+        target_workers = self.target_num_workers(nodes)
 
         if len(nodes) >= target_workers:
-            if "CPU" in self.resource_requests:
-                del self.resource_requests["CPU"]
+            self.resource_requests.clear()
+            self.resource_request_bundles = []
 
         self.log_info_string(nodes, target_workers)
 
@@ -584,7 +598,7 @@ class StandardAutoscaler(object):
                 logger.exception("StandardAutoscaler: "
                                  "Error parsing config.")
 
-    def target_num_workers(self):
+    def target_num_workers(self, nodes=None):
         target_frac = self.config["target_utilization_fraction"]
         cur_used = self.load_metrics.approx_workers_used()
         ideal_num_nodes = int(np.ceil(cur_used / float(target_frac)))
@@ -598,23 +612,85 @@ class StandardAutoscaler(object):
             # If we want any workers, we want at least initial_workers
             ideal_num_workers = max(ideal_num_workers, initial_workers)
 
-        # Other resources are not supported at present.
-        if "CPU" in self.resource_requests:
-            try:
-                cores_per_worker = self.config["worker_nodes"]["Resources"][
-                    "CPU"]
-            except KeyError:
-                cores_per_worker = 1  # Assume the worst
-
-            cores_desired = self.resource_requests["CPU"]
-
-            ideal_num_workers = max(
-                ideal_num_workers,
-                int(np.ceil(cores_desired / cores_per_worker)))
+        if nodes is None:
+            nodes = self.workers()
+        ideal_num_workers = max(ideal_num_workers,
+                                self.num_workers_for_demands(nodes))
 
         return min(self.config["max_workers"],
                    max(self.config["min_workers"], ideal_num_workers))
 
+    def num_workers_for_demands(self, nodes):
+        """Returns the number of workers needed to fit all resource demands.
+
+        This simulates packing the queued load reported by the raylets onto
+        the resources available on the nodes, and each kind of resource
+        request onto the total resources of the nodes. Workers that are
+        still being launched or haven't sent a heartbeat yet are counted as
+        empty nodes. The remaining demands are packed onto new workers.
+
+        Returns:
+            The number of workers including the new ones, or 0 if all
+                demands fit on the current workers.
+        """
+        load_demands = self.load_metrics.get_resource_demands()
+        request_demands = demands_from_requests(self.resource_requests)
+        bundle_demands = demands_from_requests(self.resource_request_bundles)
+        if not (load_demands or request_demands or bundle_demands):
+            return 0
+
+        worker_resources = self.worker_node_resources()
+        if worker_resources is None:
+            # The queued load is handled by the utilization target. For
+            # requests, assume the worst, i.e., one unit of each resource.
+            worker_resources = {
+                resource: 1
+                for shape, _ in request_demands + bundle_demands
+                for resource in shape
+            }
+            load_demands = []
+
+        num_pending = self.num_launches_pending.value
+        static_resources = self.load_metrics.static_resources_by_ip
+        num_unreported = num_pending + len([
+            node_id for node_id in nodes
+            if self.provider.internal_ip(node_id) not in static_resources
+        ])
+        empty_nodes = [worker_resources] * num_unreported
+        max_to_launch = max(
+            0, self.config["max_workers"] - len(nodes) - num_pending)
+        node_types = {NODE_TYPE_WORKER: worker_resources}
+
+        num_to_launch = 0
+        for node_resources, demands in [
+            (self.load_metrics.dynamic_resources_by_ip, load_demands),
+            (static_resources, request_demands),
+            (static_resources, bundle_demands),
+        ]:
+            to_launch = get_nodes_to_launch(
+                list(node_resources.values()) + empty_nodes, node_types,
+                demands, max_to_launch)
+            num_to_launch = max(num_to_launch, sum(to_launch.values()))
+        if num_to_launch == 0:
+            return 0
+        return len(nodes) + num_pending + num_to_launch
+
+    def worker_node_resources(self):
+        """Returns the resources of a worker node, or None if unknown.
+
+        These are taken from the "Resources" field of the worker node config
+        if set, or else from the heartbeats of the existing workers.
+        """
+        resources = self.config["worker_nodes"].get("Resources")
+        if resources:
+            return resources
+        head_ip = self.load_metrics.local_ip
+        for ip, static_resources in sorted(
+                self.load_metrics.static_resources_by_ip.items()):
+            if ip != head_ip and static_resources:
+                return static_resources
+        return None
+
     def launch_config_ok(self, node_id):
         launch_conf = self.provider.node_tags(node_id).get(
             TAG_RAY_LAUNCH_CONFIG)
@@ -740,12 +816,24 @@ class StandardAutoscaler(object):
         return "{}/{} target nodes{}".format(len(nodes), target, suffix)
 
     def request_resources(self, resources):
-        for resource, count in resources.items():
-            self.resource_requests[resource] = max(
-                self.resource_requests[resource], count)
+        """Requests cluster resources that must be available.
+
+        Args:
+            resources: Either a dict of the total quantity of each resource,
+                which is merged with earlier requests, or a list of resource
+                dicts that must each fit on a single node, which replaces
+                the earlier list.
+        """
+        if isinstance(resources, list):
+            self.resource_request_bundles = resources
+        else:
+            for resource, count in resources.items():
+                self.resource_requests[resource] = max(
+                    self.resource_requests[resource], count)
 
-        logger.info("StandardAutoscaler: resource_requests={}".format(
-            self.resource_requests))
+        logger.info("StandardAutoscaler: resource_requests={}, "
+                    "resource_request_bundles={}".format(
+                        self.resource_requests, self.resource_request_bundles))
 
     def kill_workers(self):
         logger.error("StandardAutoscaler: kill_workers triggered")
@@ -888,32 +976,36 @@ def hash_runtime_conf(file_mounts, extra_objs):
     return _hash_cache[conf_str]
 
 
-def request_resources(num_cpus=None, num_gpus=None):
-    """Remotely request some CPU or GPU resources from the autoscaler.
+def request_resources(num_cpus=None, num_gpus=None, bundles=None):
+    """Remotely request some resources from the autoscaler.
 
     This function is to be called e.g. on a node before submitting a bunch of
-    ray.remote calls to ensure that resources rapidly become available.
-
-    In the future this could be extended to do GPU cores or other custom
-    resources.
+    ray.remote calls to ensure that resources rapidly become available. The
+    autoscaler launches the workers needed to fit the requested resources
+    into the cluster, in addition to the ones needed for the queued tasks.
 
     This function is non blocking.
 
     Args:
 
         num_cpus: int -- the number of CPU cores to request
-        num_gpus: int -- the number of GPUs to request (Not implemented)
+        num_gpus: int -- the number of GPUs to request
+        bundles: list -- resource dicts, e.g. [{"CPU": 4, "GPU": 1}], that
+            must each fit on a single node. This replaces earlier bundle
+            requests.
 
     """
-    if num_gpus is not None:
-        raise NotImplementedError(
-            "GPU resource is not yet supported through request_resources")
     r = services.create_redis_client(
         global_worker.node.redis_address,
         password=global_worker.node.redis_password)
-    assert isinstance(num_cpus, int)
-    if num_cpus > 0:
-        r.publish(AUTOSCALER_RESOURCE_REQUEST_CHANNEL,
-                  json.dumps({
-                      "CPU": num_cpus
-                  }))
+    resources = {}
+    for resource, count in [("CPU", num_cpus), ("GPU", num_gpus)]:
+        if count is not None:
+            assert isinstance(count, int)
+            if count > 0:
+                resources[resource] = count
+    if resources:
+        r.publish(AUTOSCALER_RESOURCE_REQUEST_CHANNEL, json.dumps(resources))
+    if bundles is not None:
+        assert all(isinstance(bundle, dict) for bundle in bundles)
+        r.publish(AUTOSCALER_RESOURCE_REQUEST_CHANNEL, json.dumps(bundles))
@@ -0,0 +1,170 @@
+"""Bin-packing of resource demands onto existing and new nodes.
+
+The autoscaler uses this to compute how many nodes of each type it has to
+launch so that queued tasks and explicit resource requests fit into the
+cluster. Demands are given as (shape, count) pairs, where the shape is a
+dict of resource quantities needed by a single task, e.g. {"CPU": 1,
+"GPU": 1}. Identical shapes are packed together, which keeps the simulation
+cheap even for many thousands of queued tasks.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# Tolerance for the float division of resource quantities.
+EPSILON = 1e-6
+
+
+def demands_from_load(resource_load):
+    """Approximates the demand shapes that make up a queued resource load.
+
+    Raylets only report the sum of the resource demands of their queued
+    tasks. The load is split into the smallest number of equal shapes that
+    need at most one unit of each resource.
+
+    Args:
+        resource_load: Dict of the queued quantity of each resource.
+
+    Returns:
+        A list of (shape, count) pairs.
+    """
+    resource_load = {
+        resource: amount
+        for resource, amount in resource_load.items() if amount > 0
+    }
+    if not resource_load:
+        return []
+    count = int(math.ceil(max(resource_load.values()) - EPSILON))
+    shape = {
+        resource: amount / float(count)
+        for resource, amount in resource_load.items()
+    }
+    return [(shape, count)]
+
+
+def demands_from_requests(resource_requests):
+    """Converts autoscaler resource requests into demand shapes.
+
+    Args:
+        resource_requests: Either a dict of the total quantity requested of
+            each resource, which is split into units of one, or a list of
+            resource dicts that must each fit on a single node.
+
+    Returns:
+        A list of (shape, count) pairs.
+    """
+    if isinstance(resource_requests, dict):
+        demands = []
+        for resource, amount in resource_requests.items():
+            demands.append(({resource: 1}, int(math.ceil(amount))))
+    else:
+        demands = [(bundle, 1) for bundle in resource_requests]
+    return group_demands(demands)
+
+
+def group_demands(demands):
+    """Merges the counts of identical demand shapes, dropping empty ones."""
+    counts = {}
+    for shape, count in demands:
+        key = tuple(
+            sorted((resource, amount) for resource, amount in shape.items()
+                   if amount > 0))
+        if not key or count <= 0:
+            continue
+        counts[key] = counts.get(key, 0) + count
+    return [(dict(key), count) for key, count in counts.items()]
+
+
+def fit_count(node_resources, shape):
+    """Returns how many demands of the given shape fit on a node."""
+    fits = [
+        int(math.floor(node_resources.get(resource, 0) / amount + EPSILON))
+        for resource, amount in shape.items()
+    ]
+    return max(0, min(fits))
+
+
+def _subtract(node_resources, shape, count):
+    for resource, amount in shape.items():
+        node_resources[resource] = node_resources.get(resource,
+                                                      0) - amount * count
+
+
+def get_nodes_to_launch(node_resources,
+                        node_types,
+                        demands,
+                        max_to_launch=None):
+    """Computes the new nodes needed to fit the resource demands.
+
+    Demands are first packed onto the given existing nodes, then onto new
+    nodes of the type that fits the most demands of each shape. Shapes are
+    placed largest first, relative to the node sizes, so that small demands
+    fill the gaps left by large ones.
+
+    Args:
+        node_resources: List of the resources left on the existing nodes.
+            This list is not modified.
+        node_types: Dict from node type to the resources of a node of that
+            type.
+        demands: List of (shape, count) pairs.
+        max_to_launch: The maximum total number of nodes to launch.
+
+    Returns:
+        Dict from node type to the number of nodes of that type to launch.
+    """
+    nodes = [dict(resources) for resources in node_resources]
+    to_launch = {}
+    num_launched = 0
+    max_capacity = {}
+    for resources in node_types.values():
+        for resource, amount in resources.items():
+            max_capacity[resource] = max(max_capacity.get(resource, 0), amount)
+
+    def size(demand):
+        shape, _ = demand
+        dominant_share = max(amount / float(max_capacity[resource])
+                             if max_capacity.get(resource) else float("inf")
+                             for resource, amount in shape.items())
+        return dominant_share, sorted(shape.items())
+
+    infeasible = []
+    for shape, count in sorted(group_demands(demands), key=size, reverse=True):
+        for node in nodes:
+            if count == 0:
+                break
+            placed = min(count, fit_count(node, shape))
+            if placed:
+                _subtract(node, shape, placed)
+                count -= placed
+
+        if count > 0:
+            best_type, best_fit = None, 0
+            for node_type in sorted(node_types):
+                fit = fit_count(node_types[node_type], shape)
+                if fit > best_fit:
+                    best_type, best_fit = node_type, fit
+            if best_type is None:
+                infeasible.append(shape)
+                continue
+            num_nodes = int(math.ceil(count / float(best_fit)))
+            if max_to_launch is not None:
+                num_nodes = min(num_nodes, max_to_launch - num_launched)
+            for _ in range(num_nodes):
+                placed = min(count, best_fit)
+                node = dict(node_types[best_type])
+                _subtract(node, shape, placed)
+                nodes.append(node)
+                count -= placed
+            to_launch[best_type] = to_launch.get(best_type, 0) + num_nodes
+            num_launched += num_nodes
+
+    if infeasible:
+        logger.warning("ResourceDemandScheduler: No node type can fit the "
+                       "resource demands {}".format(infeasible))
+    return to_launch
@@ -119,7 +119,6 @@ interface NodeInfo {
         vms: number;
         rss: number;
       };
-      memory_full_info: null;
     }>;
   }>;
   logs: {
@@ -10,11 +10,14 @@ except ImportError:
     sys.exit(1)
 
 import argparse
+import copy
 import datetime
+import hashlib
 import json
 import logging
 import os
 import threading
+import time
 import traceback
 import yaml
 
@@ -161,9 +164,14 @@ class Dashboard(object):
             return await json_response(result=D)
 
         async def node_info(req) -> aiohttp.web.Response:
-            now = datetime.datetime.utcnow()
-            D = self.node_stats.get_node_stats()
-            return await json_response(result=D, ts=now)
+            body, etag = self.node_stats.get_node_stats_response()
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if self.is_dev:
+                headers["Access-Control-Allow-Origin"] = "*"
+            if req.headers.get("If-None-Match") == etag:
+                return aiohttp.web.Response(status=304, headers=headers)
+            return aiohttp.web.Response(
+                text=body, content_type="application/json", headers=headers)
 
         self.app.router.add_get("/", get_index)
 
@@ -193,93 +201,166 @@ class Dashboard(object):
         aiohttp.web.run_app(self.app, host="0.0.0.0", port=self.port)
 
 
+# The node info response is rebuilt at most this often (seconds).
+NODE_INFO_REFRESH_S = 1
+# Nodes that have not reported for this long (seconds) are dropped.
+NODE_TIMEOUT_S = max(5,
+                     2 * ray_constants.REPORTER_MAX_UPDATE_INTERVAL_MS / 1000)
+
+
+def node_totals(stats) -> Dict:
+    """Returns the contribution of one node to the cluster totals."""
+    return {
+        "boot_time": stats["boot_time"],
+        "n_workers": len(stats["workers"]),
+        "n_cores": stats["cpus"][0],
+        "m_avail": stats["mem"][1],
+        "m_total": stats["mem"][0],
+        "d_avail": stats["disk"]["/"]["free"],
+        "d_total": stats["disk"]["/"]["total"],
+        "load": list(stats["load_avg"][0]),
+        "n_sent": stats["net"][0],
+        "n_recv": stats["net"][1],
+    }
+
+
 class NodeStats(threading.Thread):
+    """Keeps the stats of all nodes up to date from the reporters.
+
+    Reporters publish a full snapshot of their stats now and then, and only
+    the changed stats in between. The cluster totals and task counts are
+    updated incrementally for each report, and the JSON served to the
+    dashboard is rebuilt at most every NODE_INFO_REFRESH_S.
+    """
+
     def __init__(self, redis_address, redis_password=None):
         self.redis_key = "{}.*".format(ray.gcs_utils.REPORTER_CHANNEL)
         self.redis_client = ray.services.create_redis_client(
             redis_address, password=redis_password)
 
         self._node_stats = {}
+        # Mapping from hostname to the sequence number of the last report.
+        self._node_seqs = {}
         self._node_stats_lock = threading.Lock()
+        self._totals = self._empty_totals()
+        self._tasks = Counter()
 
         # Mapping from IP address to PID to list of log lines
         self._logs = defaultdict(lambda: defaultdict(list))
 
+        self._update_time = datetime.datetime.utcnow()
+        self._cached_time = 0
+        self._cached_response = None
+
         ray.init(redis_address=redis_address, redis_password=redis_password)
 
         super().__init__()
 
-    def calculate_totals(self) -> Dict:
-        total_boot_time = 0
-        total_cpus = 0
-        total_workers = 0
-        total_load = [0.0, 0.0, 0.0]
-        total_storage_avail = 0
-        total_storage_total = 0
-        total_ram_avail = 0
-        total_ram_total = 0
-        total_sent = 0
-        total_recv = 0
-
-        for v in self._node_stats.values():
-            total_boot_time += v["boot_time"]
-            total_cpus += v["cpus"][0]
-            total_workers += len(v["workers"])
-            total_load[0] += v["load_avg"][0][0]
-            total_load[1] += v["load_avg"][0][1]
-            total_load[2] += v["load_avg"][0][2]
-            total_storage_avail += v["disk"]["/"]["free"]
-            total_storage_total += v["disk"]["/"]["total"]
-            total_ram_avail += v["mem"][1]
-            total_ram_total += v["mem"][0]
-            total_sent += v["net"][0]
-            total_recv += v["net"][1]
+    @staticmethod
+    def _empty_totals() -> Dict:
+        totals = node_totals({
+            "boot_time": 0,
+            "workers": {},
+            "cpus": [0, 0],
+            "mem": [0, 0, 0],
+            "disk": {
+                "/": {
+                    "free": 0,
+                    "total": 0
+                }
+            },
+            "load_avg": [[0.0, 0.0, 0.0]],
+            "net": [0, 0],
+        })
+        return totals
+
+    def _add_node(self, stats, sign=1):
+        """Adds the stats of a node to the totals, or removes them."""
+        for key, value in node_totals(stats).items():
+            if key == "load":
+                for i in range(len(value)):
+                    self._totals[key][i] += sign * value[i]
+            else:
+                self._totals[key] += sign * value
+        for worker in stats["workers"].values():
+            self._tasks[worker["name"]] += sign
+        self._tasks += Counter()  # Drops the tasks with a zero count.
+
+    def _changed(self):
+        self._update_time = datetime.datetime.utcnow()
+
+    def update_node(self, message):
+        """Applies a full or delta report of a reporter."""
+        hostname = message["hostname"]
+        stats = self._node_stats.get(hostname)
+        if "delta" in message and (stats is None or self._node_seqs[hostname]
+                                   != message["seq"] - 1):
+            # A report was missed, so wait for the next full report.
+            return
+        if stats is not None:
+            self._add_node(stats, sign=-1)
+        if "stats" in message:
+            stats = message["stats"]
+        else:
+            ray.utils.apply_delta(stats, message["delta"])
+        self._add_node(stats)
+        self._node_stats[hostname] = stats
+        self._node_seqs[hostname] = message["seq"]
+        self._changed()
 
-        return {
-            "boot_time": total_boot_time,
-            "n_workers": total_workers,
-            "n_cores": total_cpus,
-            "m_avail": total_ram_avail,
-            "m_total": total_ram_total,
-            "d_avail": total_storage_avail,
-            "d_total": total_storage_total,
-            "load": total_load,
-            "n_sent": total_sent,
-            "n_recv": total_recv,
-        }
+    def calculate_totals(self) -> Dict:
+        return copy.deepcopy(self._totals)
 
     def calculate_tasks(self) -> Counter:
-        return Counter(
-            (x["name"]
-             for y in (v["workers"] for v in self._node_stats.values())
-             for x in y))
+        return Counter(self._tasks)
 
     def purge_outdated_stats(self):
-        def current(then, now):
-            if (now - then) > 5:
-                return False
-
-            return True
-
         now = to_unix_time(datetime.datetime.utcnow())
-        self._node_stats = {
-            k: v
-            for k, v in self._node_stats.items() if current(v["now"], now)
+        for hostname, stats in list(self._node_stats.items()):
+            if now - stats["now"] > NODE_TIMEOUT_S:
+                self._add_node(stats, sign=-1)
+                del self._node_stats[hostname]
+                del self._node_seqs[hostname]
+                self._changed()
+
+    def _get_node_stats(self) -> Dict:
+        self.purge_outdated_stats()
+        node_stats = sorted(
+            (dict(
+                v,
+                workers=sorted(v["workers"].values(), key=itemgetter("pid")))
+             for v in self._node_stats.values()),
+            key=itemgetter("boot_time"))
+        return {
+            "totals": self.calculate_totals(),
+            "tasks": self.calculate_tasks(),
+            "clients": node_stats,
+            "logs": self._logs,
+            "errors": ray.errors(all_jobs=True),
         }
 
     def get_node_stats(self) -> Dict:
         with self._node_stats_lock:
-            self.purge_outdated_stats()
-            node_stats = sorted(
-                (v for v in self._node_stats.values()),
-                key=itemgetter("boot_time"))
-            return {
-                "totals": self.calculate_totals(),
-                "tasks": self.calculate_tasks(),
-                "clients": node_stats,
-                "logs": self._logs,
-                "errors": ray.errors(all_jobs=True),
-            }
+            return self._get_node_stats()
+
+    def get_node_stats_response(self):
+        """Returns the node stats response as JSON, and its ETag.
+
+        The ETag only changes with the response, so clients do not download
+        unchanged responses again.
+        """
+        with self._node_stats_lock:
+            now = time.time()
+            if now - self._cached_time > NODE_INFO_REFRESH_S:
+                body = json.dumps({
+                    "result": self._get_node_stats(),
+                    "timestamp": to_unix_time(self._update_time),
+                    "error": None,
+                })
+                etag = "\"{}\"".format(hashlib.md5(body.encode()).hexdigest())
+                self._cached_response = (body, etag)
+                self._cached_time = now
+            return self._cached_response
 
     def run(self):
         p = self.redis_client.pubsub(ignore_subscribe_messages=True)
@@ -296,11 +377,12 @@ class NodeStats(threading.Thread):
                 with self._node_stats_lock:
                     channel = ray.utils.decode(x["channel"])
                     if channel == log_channel:
-                        D = json.loads(ray.utils.decode(x["data"]))
-                        self._logs[D["ip"]][D["pid"]].extend(D["lines"])
+                        for D in json.loads(ray.utils.decode(x["data"])):
+                            self._logs[D["ip"]][D["pid"]].extend(D["lines"])
+                        self._changed()
                     else:
-                        D = json.loads(ray.utils.decode(x["data"]))
-                        self._node_stats[D["hostname"]] = D
+                        self.update_node(
+                            json.loads(ray.utils.decode(x["data"])))
             except Exception:
                 logger.exception(traceback.format_exc())
                 continue
@@ -0,0 +1,124 @@
+"""Benchmark distributed arrays against single-node numpy.
+
+Example:
+    python distributed_array_benchmark.py --size 4000 --block-size 1000
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy as np
+
+import ray
+import ray.experimental.array.distributed as da
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--address",
+    default=None,
+    type=str,
+    help="the address of the cluster to connect to, if not given a local "
+    "cluster is started")
+parser.add_argument(
+    "--size", default=2000, type=int, help="the side length of the matrices")
+parser.add_argument(
+    "--block-size",
+    default=None,
+    type=int,
+    help="the block size of the distributed arrays, by default it is chosen "
+    "from the array size and the number of CPUs in the cluster")
+parser.add_argument(
+    "--chain-length",
+    default=10,
+    type=int,
+    help="the number of operations in the elementwise chain")
+parser.add_argument(
+    "--rounds", default=3, type=int, help="the number of rounds to time")
+
+
+def timeit(name, fn, rounds):
+    fn()  # warmup
+    times = []
+    for _ in range(rounds):
+        start = time.time()
+        fn()
+        times.append(time.time() - start)
+    print("{}: {:.3f}s +- {:.3f}s".format(name, np.mean(times), np.std(times)))
+
+
+def wait(a):
+    """Wait until all blocks of a distributed array are computed."""
+    if isinstance(a, ray.ObjectID):
+        a = ray.get(a)
+    blocks = list(a.objectids.flat)
+    ray.wait(blocks, num_returns=len(blocks))
+
+
+def main(args):
+    ray.init(address=args.address)
+    n = args.size
+    block_size = args.block_size or da.choose_block_size([n, n])
+    print("Using {}x{} matrices with a block size of {}.".format(
+        n, n, block_size))
+
+    x_val = np.random.normal(size=[n, n])
+    y_val = np.random.normal(size=[n, n])
+    x = da.numpy_to_dist.remote(x_val, block_size=block_size)
+    y = da.numpy_to_dist.remote(y_val, block_size=block_size)
+    wait(x)
+    wait(y)
+
+    def numpy_chain():
+        z = x_val
+        for _ in range(args.chain_length):
+            z = (z + x_val) - y_val
+
+    def eager_chain():
+        z = x
+        for _ in range(args.chain_length):
+            z = da.subtract.remote(da.add.remote(z, x), y)
+        wait(z)
+
+    def lazy_chain():
+        lazy_x, lazy_y = da.lazy(x), da.lazy(y)
+        z = lazy_x
+        for _ in range(args.chain_length):
+            z = (z + lazy_x) - lazy_y
+        wait(z.evaluate())
+
+    timeit("numpy elementwise chain", numpy_chain, args.rounds)
+    timeit("distributed elementwise chain", eager_chain, args.rounds)
+    timeit("distributed fused elementwise chain", lazy_chain, args.rounds)
+
+    def numpy_dot():
+        np.dot(x_val, y_val)
+
+    def dist_dot():
+        wait(da.dot.remote(x, y))
+
+    timeit("numpy dot", numpy_dot, args.rounds)
+    timeit("distributed dot", dist_dot, args.rounds)
+
+    # tsqr needs the matrix to have a single column of blocks.
+    num_columns = min(block_size, 100)
+    tall_val = np.random.normal(size=[4 * n, num_columns])
+    tall = da.numpy_to_dist.remote(tall_val, block_size=block_size)
+    wait(tall)
+
+    def numpy_qr():
+        np.linalg.qr(tall_val)
+
+    def dist_tsqr():
+        q, r = da.linalg.tsqr.remote(tall)
+        wait(q)
+
+    timeit("numpy qr of a tall matrix", numpy_qr, args.rounds)
+    timeit("distributed tsqr of a tall matrix", dist_tsqr, args.rounds)
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+"""Measure how the distributed matmul scales with the cluster size.
+
+Run this once for each cluster size, e.g. on clusters of 1, 2, 4 and 8
+nodes, and compare the reported GFLOP/s. Every run prints one row per
+configuration, prefixed with the number of nodes and CPUs in the cluster.
+
+Example:
+    python dot_benchmark.py --address auto --sizes 4000 8000 --num-groups 1 4
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy as np
+
+import ray
+import ray.experimental.array.distributed as da
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--address",
+    default=None,
+    type=str,
+    help="the address of the cluster to connect to, if not given a local "
+    "cluster is started")
+parser.add_argument(
+    "--sizes",
+    default=[2000],
+    type=int,
+    nargs="+",
+    help="the side lengths of the matrices to multiply")
+parser.add_argument(
+    "--block-size",
+    default=None,
+    type=int,
+    help="the block size of the distributed arrays, by default it is chosen "
+    "from the array size and the number of CPUs in the cluster")
+parser.add_argument(
+    "--num-groups",
+    default=[None],
+    type=int,
+    nargs="+",
+    help="the numbers of groups to split the inner dimension into, by "
+    "default it is chosen from the number of CPUs in the cluster")
+parser.add_argument(
+    "--fanout",
+    default=None,
+    type=int,
+    help="the fanout of the broadcast tree for the input blocks")
+parser.add_argument(
+    "--spill-dir",
+    default=None,
+    type=str,
+    help="a directory on a shared file system to spill partial results to")
+parser.add_argument(
+    "--rounds", default=3, type=int, help="the number of rounds to time")
+
+
+def wait(a):
+    """Wait until all blocks of a distributed array are computed."""
+    a = ray.get(a)
+    blocks = list(a.objectids.flat)
+    ray.wait(blocks, num_returns=len(blocks))
+
+
+@ray.remote
+def blockwise_dot(a, b):
+    """The previous implementation of dot, as a baseline."""
+    result = da.DistArray([a.shape[0], b.shape[1]], block_size=a.block_size)
+    for (i, j) in np.ndindex(*result.num_blocks):
+        args = list(a.objectids[i, :]) + list(b.objectids[:, j])
+        result.objectids[i, j] = da.blockwise_dot.remote(*args)
+    return result
+
+
+def timeit(fn, rounds):
+    fn()  # warmup
+    times = []
+    for _ in range(rounds):
+        start = time.time()
+        fn()
+        times.append(time.time() - start)
+    return np.mean(times), np.std(times)
+
+
+def main(args):
+    ray.init(address=args.address)
+    num_nodes = len([node for node in ray.nodes() if node["Alive"]])
+    num_cpus = int(ray.cluster_resources().get("CPU", 0))
+    print("nodes  cpus  size  block  method        time         GFLOP/s")
+
+    def report(n, block_size, method, mean, std):
+        gflops = 2 * n**3 / mean / 1e9
+        print("{:5d} {:5d} {:5d} {:6d}  {:12s} {:.3f}s+-{:.3f} {:8.2f}".format(
+            num_nodes, num_cpus, n, block_size, method, mean, std, gflops))
+
+    for n in args.sizes:
+        block_size = args.block_size or da.choose_block_size([n, n])
+        x = da.random.normal.remote([n, n], block_size=block_size)
+        y = da.random.normal.remote([n, n], block_size=block_size)
+        wait(x)
+        wait(y)
+
+        mean, std = timeit(lambda: wait(blockwise_dot.remote(x, y)),
+                           args.rounds)
+        report(n, block_size, "blockwise", mean, std)
+
+        for num_groups in args.num_groups:
+            mean, std = timeit(
+                lambda: wait(
+                    da.dot.remote(
+                        x,
+                        y,
+                        num_groups=num_groups,
+                        fanout=args.fanout,
+                        spill_dir=args.spill_dir)), args.rounds)
+            report(n, block_size, "summa/{}".format(num_groups or "auto"),
+                   mean, std)
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
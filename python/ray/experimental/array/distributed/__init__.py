@@ -4,12 +4,14 @@ from __future__ import print_function
 
 from . import random
 from . import linalg
-from .core import (BLOCK_SIZE, DistArray, assemble, zeros, ones, copy, eye,
-                   triu, tril, blockwise_dot, dot, transpose, add, subtract,
-                   numpy_to_dist, subblocks)
+from .core import (BLOCK_SIZE, DistArray, choose_block_size, assemble, zeros,
+                   ones, copy, eye, triu, tril, blockwise_dot, dot, transpose,
+                   add, subtract, numpy_to_dist, subblocks)
+from .lazy_array import LazyArray, lazy
 
 __all__ = [
-    "random", "linalg", "BLOCK_SIZE", "DistArray", "assemble", "zeros", "ones",
-    "copy", "eye", "triu", "tril", "blockwise_dot", "dot", "transpose", "add",
-    "subtract", "numpy_to_dist", "subblocks"
+    "random", "linalg", "BLOCK_SIZE", "DistArray", "choose_block_size",
+    "assemble", "zeros", "ones", "copy", "eye", "triu", "tril",
+    "blockwise_dot", "dot", "transpose", "add", "subtract", "numpy_to_dist",
+    "subblocks", "LazyArray", "lazy"
 ]
@@ -2,20 +2,64 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numbers
+import os
+import uuid
+
 import numpy as np
 import ray.experimental.array.remote as ra
 import ray
+import ray.ray_constants as ray_constants
 
 BLOCK_SIZE = 10
+# The number of blocks per CPU in the cluster that choose_block_size aims
+# for, so that the blocks of an array can be spread across the cluster.
+BLOCKS_PER_CPU = 4
+# The maximum number of elements of a block chosen by choose_block_size.
+MAX_BLOCK_ELEMENTS = 2**22
+# The fanout of the broadcast tree that dot uses on multi-node clusters.
+BROADCAST_FANOUT = 4
+# dot spills partial results to disk if they may take up more than this
+# fraction of the object store.
+SPILL_FRACTION = 0.5
+
+
+def choose_block_size(shape, num_cpus=None):
+    """Choose the side length of the blocks of an array of the given shape.
+
+    The blocks are as large as possible while still giving each CPU in the
+    cluster about BLOCKS_PER_CPU blocks, because every operation on a
+    distributed array runs one task per block. Blocks are at least
+    BLOCK_SIZE long and have at most about MAX_BLOCK_ELEMENTS elements.
+
+    Arrays are only created with this block size if it is passed to their
+    constructor, e.g. da.zeros.remote(shape, block_size=block_size). By
+    default they use BLOCK_SIZE, because operations on several arrays, such
+    as dot and add, need their block sizes to match.
+
+    Args:
+        shape: The shape of the array.
+        num_cpus: The number of CPUs to spread the array across. Defaults to
+            the number of CPUs in the cluster.
+
+    Returns:
+        The block size to pass to DistArray.
+    """
+    if num_cpus is None:
+        num_cpus = ray.cluster_resources().get("CPU", 1)
+    ndim = max(len(shape), 1)
+    num_blocks = max(BLOCKS_PER_CPU * num_cpus, 1)
+    block_size = int(np.ceil((np.prod(shape) / num_blocks)**(1.0 / ndim)))
+    max_block_size = int(MAX_BLOCK_ELEMENTS**(1.0 / ndim))
+    return max(BLOCK_SIZE, min(block_size, max_block_size))
 
 
 class DistArray(object):
-    def __init__(self, shape, objectids=None):
+    def __init__(self, shape, objectids=None, block_size=BLOCK_SIZE):
         self.shape = shape
         self.ndim = len(shape)
-        self.num_blocks = [
-            int(np.ceil(1.0 * a / BLOCK_SIZE)) for a in self.shape
-        ]
+        self.block_size = block_size
+        self.num_blocks = DistArray.compute_num_blocks(shape, block_size)
         if objectids is not None:
             self.objectids = objectids
         else:
@@ -27,51 +71,115 @@ class DistArray(object):
                                                   list(self.objectids.shape)))
 
     @staticmethod
-    def compute_block_lower(index, shape):
+    def compute_block_lower(index, shape, block_size=BLOCK_SIZE):
         if len(index) != len(shape):
             raise Exception("The fields `index` and `shape` must have the "
                             "same length, but `index` is {} and `shape` is "
                             "{}.".format(index, shape))
-        return [elem * BLOCK_SIZE for elem in index]
+        return [elem * block_size for elem in index]
 
     @staticmethod
-    def compute_block_upper(index, shape):
+    def compute_block_upper(index, shape, block_size=BLOCK_SIZE):
         if len(index) != len(shape):
             raise Exception("The fields `index` and `shape` must have the "
                             "same length, but `index` is {} and `shape` is "
                             "{}.".format(index, shape))
         upper = []
         for i in range(len(shape)):
-            upper.append(min((index[i] + 1) * BLOCK_SIZE, shape[i]))
+            upper.append(min((index[i] + 1) * block_size, shape[i]))
         return upper
 
     @staticmethod
-    def compute_block_shape(index, shape):
-        lower = DistArray.compute_block_lower(index, shape)
-        upper = DistArray.compute_block_upper(index, shape)
+    def compute_block_shape(index, shape, block_size=BLOCK_SIZE):
+        lower = DistArray.compute_block_lower(index, shape, block_size)
+        upper = DistArray.compute_block_upper(index, shape, block_size)
         return [u - l for (l, u) in zip(lower, upper)]
 
     @staticmethod
-    def compute_num_blocks(shape):
-        return [int(np.ceil(1.0 * a / BLOCK_SIZE)) for a in shape]
+    def compute_num_blocks(shape, block_size=BLOCK_SIZE):
+        return [int(np.ceil(1.0 * a / block_size)) for a in shape]
+
+    def block_slices(self, index):
+        """The slices of the array covered by the block at the index."""
+        lower = DistArray.compute_block_lower(index, self.shape,
+                                              self.block_size)
+        upper = DistArray.compute_block_upper(index, self.shape,
+                                              self.block_size)
+        return tuple(slice(l, u) for (l, u) in zip(lower, upper))
 
     def assemble(self):
         """Assemble an array from a distributed array of object IDs."""
-        first_block = ray.get(self.objectids[(0, ) * self.ndim])
-        dtype = first_block.dtype
-        result = np.zeros(self.shape, dtype=dtype)
-        for index in np.ndindex(*self.num_blocks):
-            lower = DistArray.compute_block_lower(index, self.shape)
-            upper = DistArray.compute_block_upper(index, self.shape)
-            result[[slice(l, u) for (l, u) in zip(lower, upper)]] = ray.get(
-                self.objectids[index])
+        return self._fetch_region([0] * self.ndim, self.shape)
+
+    def _fetch_region(self, lower, upper):
+        """Fetch the part of the array between lower and upper.
+
+        All blocks that overlap the region are fetched with a single call to
+        ray.get.
+        """
+        first = [low // self.block_size for low in lower]
+        last = [(high - 1) // self.block_size for high in upper]
+        indices = [
+            tuple(f + i for (f, i) in zip(first, offset))
+            for offset in np.ndindex(
+                *[end - start + 1 for (start, end) in zip(first, last)])
+        ]
+        blocks = ray.get([self.objectids[index] for index in indices])
+        result = np.empty(
+            [high - low for (low, high) in zip(lower, upper)],
+            dtype=blocks[0].dtype)
+        for index, block in zip(indices, blocks):
+            source, target = [], []
+            for s, low, high in zip(self.block_slices(index), lower, upper):
+                start, stop = max(s.start, low), min(s.stop, high)
+                source.append(slice(start - s.start, stop - s.start))
+                target.append(slice(start - low, stop - low))
+            result[tuple(target)] = block[tuple(source)]
         return result
 
     def __getitem__(self, sliced):
-        # TODO(rkn): Fix this, this is just a placeholder that should work but
-        # is inefficient.
-        a = self.assemble()
-        return a[sliced]
+        """Get a part of the array as a numpy array.
+
+        For indexing with integers and slices, only the blocks that overlap
+        the result are fetched. Other kinds of indexing assemble the whole
+        array first.
+        """
+        if not isinstance(sliced, tuple):
+            sliced = (sliced, )
+        if len(sliced) > self.ndim or not all(
+                isinstance(s, (slice, numbers.Integral)) for s in sliced):
+            return self.assemble()[sliced]
+        sliced += (slice(None), ) * (self.ndim - len(sliced))
+        lower, upper, local = [], [], []
+        for s, size in zip(sliced, self.shape):
+            if isinstance(s, slice):
+                start, stop, step = s.indices(size)
+                indices = range(start, stop, step)
+                if len(indices) == 0:
+                    return self.assemble()[sliced]
+                low = min(indices[0], indices[-1])
+                lower.append(low)
+                upper.append(max(indices[0], indices[-1]) + 1)
+                local.append(
+                    slice(start - low, stop - low
+                          if stop - low >= 0 else None, step))
+            else:
+                index = s + size if s < 0 else s
+                if not 0 <= index < size:
+                    raise IndexError("Index {} is out of bounds for an axis "
+                                     "of size {}.".format(s, size))
+                lower.append(index)
+                upper.append(index + 1)
+                local.append(0)
+        return self._fetch_region(lower, upper)[tuple(local)]
+
+
+def check_block_sizes(name, *arrays):
+    block_sizes = [a.block_size for a in arrays]
+    if len(set(block_sizes)) > 1:
+        raise Exception("{} expects its arguments to have the same block "
+                        "size, but the block sizes are {}.".format(
+                            name, block_sizes))
 
 
 @ray.remote
@@ -81,37 +189,36 @@ def assemble(a):
 
 # TODO(rkn): What should we call this method?
 @ray.remote
-def numpy_to_dist(a):
-    result = DistArray(a.shape)
+def numpy_to_dist(a, block_size=BLOCK_SIZE):
+    result = DistArray(a.shape, block_size=block_size)
     for index in np.ndindex(*result.num_blocks):
-        lower = DistArray.compute_block_lower(index, a.shape)
-        upper = DistArray.compute_block_upper(index, a.shape)
-        result.objectids[index] = ray.put(
-            a[[slice(l, u) for (l, u) in zip(lower, upper)]])
+        result.objectids[index] = ray.put(a[result.block_slices(index)])
     return result
 
 
 @ray.remote
-def zeros(shape, dtype_name="float"):
-    result = DistArray(shape)
+def zeros(shape, dtype_name="float", block_size=BLOCK_SIZE):
+    result = DistArray(shape, block_size=block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.zeros.remote(
-            DistArray.compute_block_shape(index, shape), dtype_name=dtype_name)
+            DistArray.compute_block_shape(index, shape, block_size),
+            dtype_name=dtype_name)
     return result
 
 
 @ray.remote
-def ones(shape, dtype_name="float"):
-    result = DistArray(shape)
+def ones(shape, dtype_name="float", block_size=BLOCK_SIZE):
+    result = DistArray(shape, block_size=block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.ones.remote(
-            DistArray.compute_block_shape(index, shape), dtype_name=dtype_name)
+            DistArray.compute_block_shape(index, shape, block_size),
+            dtype_name=dtype_name)
     return result
 
 
 @ray.remote
 def copy(a):
-    result = DistArray(a.shape)
+    result = DistArray(a.shape, block_size=a.block_size)
     for index in np.ndindex(*result.num_blocks):
         # We don't need to actually copy the objects because remote objects are
         # immutable.
@@ -120,12 +227,12 @@ def copy(a):
 
 
 @ray.remote
-def eye(dim1, dim2=-1, dtype_name="float"):
+def eye(dim1, dim2=-1, dtype_name="float", block_size=BLOCK_SIZE):
     dim2 = dim1 if dim2 == -1 else dim2
     shape = [dim1, dim2]
-    result = DistArray(shape)
+    result = DistArray(shape, block_size=block_size)
     for (i, j) in np.ndindex(*result.num_blocks):
-        block_shape = DistArray.compute_block_shape([i, j], shape)
+        block_shape = DistArray.compute_block_shape([i, j], shape, block_size)
         if i == j:
             result.objectids[i, j] = ra.eye.remote(
                 block_shape[0], block_shape[1], dtype_name=dtype_name)
@@ -140,7 +247,7 @@ def triu(a):
     if a.ndim != 2:
         raise Exception("Input must have 2 dimensions, but a.ndim is "
                         "{}.".format(a.ndim))
-    result = DistArray(a.shape)
+    result = DistArray(a.shape, block_size=a.block_size)
     for (i, j) in np.ndindex(*result.num_blocks):
         if i < j:
             result.objectids[i, j] = ra.copy.remote(a.objectids[i, j])
@@ -156,7 +263,7 @@ def tril(a):
     if a.ndim != 2:
         raise Exception("Input must have 2 dimensions, but a.ndim is "
                         "{}.".format(a.ndim))
-    result = DistArray(a.shape)
+    result = DistArray(a.shape, block_size=a.block_size)
     for (i, j) in np.ndindex(*result.num_blocks):
         if i > j:
             result.objectids[i, j] = ra.copy.remote(a.objectids[i, j])
@@ -180,8 +287,122 @@ def blockwise_dot(*matrices):
     return result
 
 
+def broadcast(object_id, num_consumers, fanout=None):
+    """Make copies of an object so that each copy has few readers.
+
+    Without a broadcast tree, every task that reads an object fetches it
+    from the node that created it. With a tree, the object is copied to at
+    most fanout other objects, each of which is copied again until every
+    copy serves at most fanout tasks, so the transfers are spread across
+    the nodes holding the copies.
+
+    Args:
+        object_id: The object to broadcast.
+        num_consumers: The number of tasks that will read the object.
+        fanout: The maximum number of tasks reading any copy. If this is
+            None, all consumers read the original object.
+
+    Returns:
+        A list of num_consumers object IDs, one for each consumer.
+    """
+    if fanout is None or num_consumers <= fanout:
+        return [object_id] * num_consumers
+    per_copy = int(np.ceil(num_consumers / fanout))
+    object_ids = []
+    for start in range(0, num_consumers, per_copy):
+        count = min(per_copy, num_consumers - start)
+        copy_id = ra.copy.remote(object_id) if count > 1 else object_id
+        object_ids.extend(broadcast(copy_id, count, fanout))
+    return object_ids
+
+
+def _load_block(block):
+    if isinstance(block, str):
+        return np.load(block)
+    return block
+
+
 @ray.remote
-def dot(a, b):
+def multiply_accumulate(c, a, b, spill_path=None):
+    """Compute c + a.dot(b) for one step of a SUMMA-style matmul.
+
+    Args:
+        c: The partial result so far, the path of a spilled partial result,
+            or None for the first step.
+        a: A block of the left matrix.
+        b: A block of the right matrix.
+        spill_path: If given, the result is saved to this .npy file and the
+            path is returned instead of the block.
+    """
+    result = np.dot(a, b)
+    if c is not None:
+        result += _load_block(c)
+    if spill_path is None:
+        return result
+    np.save(spill_path, result)
+    return spill_path
+
+
+@ray.remote
+def sum_blocks(spill_paths, *blocks):
+    """Sum partial results and remove the files they were spilled to."""
+    result = _load_block(blocks[0]).copy()
+    for block in blocks[1:]:
+        result += _load_block(block)
+    for path in spill_paths:
+        os.remove(path)
+    return result
+
+
+def _dot_num_groups(num_output_blocks, num_inner_blocks):
+    # Replicate the work along the inner dimension only when there are too
+    # few output blocks to keep all CPUs in the cluster busy.
+    num_cpus = int(ray.cluster_resources().get("CPU", 1))
+    return max(1, min(num_inner_blocks, num_cpus // num_output_blocks))
+
+
+def _dot_should_spill(result, num_groups):
+    # Estimate the partial results in flight, assuming float64 blocks.
+    object_store_memory = ray_constants.from_memory_units(
+        ray.cluster_resources().get("object_store_memory", 0))
+    partial_bytes = (
+        np.prod(result.shape) * np.dtype(np.float64).itemsize * num_groups)
+    return partial_bytes > SPILL_FRACTION * object_store_memory
+
+
+@ray.remote
+def dot(a, b, num_groups=None, fanout=None, spill_dir=None, spill=None):
+    """Multiply two distributed matrices.
+
+    The product is computed like SUMMA: for each block k along the inner
+    dimension, column k of a's blocks is broadcast along the rows of the
+    result and row k of b's blocks along its columns, and every output
+    block accumulates one product per step. Each task holds only three
+    blocks, instead of a full row of a and column of b.
+
+    Like 2.5D matmul, the inner dimension can be split into num_groups
+    ranges that are accumulated in parallel and summed at the end. This
+    shortens the chain of tasks for each output block at the cost of
+    num_groups partial results in flight.
+
+    Args:
+        a: The left matrix.
+        b: The right matrix.
+        num_groups: The number of ranges to split the inner dimension into.
+            Defaults to enough groups to give every CPU in the cluster a
+            chain of tasks.
+        fanout: The fanout of the broadcast tree for the input blocks. If
+            None, a tree is only used if the cluster has more than one node,
+            with a fanout of BROADCAST_FANOUT.
+        spill_dir: A directory to spill the partial results to. It must be
+            visible to all nodes, e.g. on a shared file system.
+        spill: Whether to spill the partial results to spill_dir. Defaults
+            to spilling only if they may take up more than SPILL_FRACTION of
+            the object store.
+
+    Returns:
+        The product of a and b.
+    """
     if a.ndim != 2:
         raise Exception("dot expects its arguments to be 2-dimensional, but "
                         "a.ndim = {}.".format(a.ndim))
@@ -192,11 +413,54 @@ def dot(a, b):
         raise Exception("dot expects a.shape[1] to equal b.shape[0], but "
                         "a.shape = {} and b.shape = {}.".format(
                             a.shape, b.shape))
+    check_block_sizes("dot", a, b)
     shape = [a.shape[0], b.shape[1]]
-    result = DistArray(shape)
-    for (i, j) in np.ndindex(*result.num_blocks):
-        args = list(a.objectids[i, :]) + list(b.objectids[:, j])
-        result.objectids[i, j] = blockwise_dot.remote(*args)
+    result = DistArray(shape, block_size=a.block_size)
+    num_rows, num_columns = result.num_blocks
+    num_inner = a.num_blocks[1]
+    if num_groups is None:
+        num_groups = _dot_num_groups(num_rows * num_columns, num_inner)
+    num_groups = max(1, min(num_groups, num_inner))
+    if fanout is None and len([n for n in ray.nodes() if n["Alive"]]) > 1:
+        fanout = BROADCAST_FANOUT
+    if spill is None:
+        spill = (spill_dir is not None
+                 and _dot_should_spill(result, num_groups))
+    if spill and spill_dir is None:
+        raise Exception("dot was asked to spill, but no spill_dir is given.")
+    spill_prefix = os.path.join(spill_dir, "dot-{}".format(
+        uuid.uuid4().hex)) if spill else None
+
+    # a_blocks[i][k][j] is the copy of a.objectids[i, k] that is read when
+    # computing the output block (i, j), and similarly for b_blocks.
+    a_blocks = [[
+        broadcast(a.objectids[i, k], num_columns, fanout)
+        for k in range(num_inner)
+    ] for i in range(num_rows)]
+    b_blocks = [[
+        broadcast(b.objectids[k, j], num_rows, fanout)
+        for j in range(num_columns)
+    ] for k in range(num_inner)]
+
+    group_bounds = np.linspace(0, num_inner, num_groups + 1).astype(int)
+    for i, j in np.ndindex(num_rows, num_columns):
+        partials = []
+        spill_paths = []
+        for group in range(num_groups):
+            partial = None
+            for k in range(group_bounds[group], group_bounds[group + 1]):
+                spill_path = None
+                if spill:
+                    spill_path = "{}-{}-{}-{}.npy".format(
+                        spill_prefix, i, j, k)
+                    spill_paths.append(spill_path)
+                partial = multiply_accumulate.remote(
+                    partial, a_blocks[i][k][j], b_blocks[k][j][i], spill_path)
+            partials.append(partial)
+        if len(partials) == 1 and not spill:
+            result.objectids[i, j] = partials[0]
+        else:
+            result.objectids[i, j] = sum_blocks.remote(spill_paths, *partials)
     return result
 
 
@@ -235,10 +499,11 @@ def subblocks(a, *ranges):
                             "the {}th range is {}, and a.num_blocks = {}."
                             .format(i, ranges[i], a.num_blocks))
     last_index = [r[-1] for r in ranges]
-    last_block_shape = DistArray.compute_block_shape(last_index, a.shape)
-    shape = [(len(ranges[i]) - 1) * BLOCK_SIZE + last_block_shape[i]
+    last_block_shape = DistArray.compute_block_shape(last_index, a.shape,
+                                                     a.block_size)
+    shape = [(len(ranges[i]) - 1) * a.block_size + last_block_shape[i]
              for i in range(a.ndim)]
-    result = DistArray(shape)
+    result = DistArray(shape, block_size=a.block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = a.objectids[tuple(
             ranges[i][index[i]] for i in range(a.ndim))]
@@ -251,7 +516,7 @@ def transpose(a):
         raise Exception("transpose expects its argument to be 2-dimensional, "
                         "but a.ndim = {}, a.shape = {}.".format(
                             a.ndim, a.shape))
-    result = DistArray([a.shape[1], a.shape[0]])
+    result = DistArray([a.shape[1], a.shape[0]], block_size=a.block_size)
     for i in range(result.num_blocks[0]):
         for j in range(result.num_blocks[1]):
             result.objectids[i, j] = ra.transpose.remote(a.objectids[j, i])
@@ -265,7 +530,8 @@ def add(x1, x2):
         raise Exception("add expects arguments `x1` and `x2` to have the same "
                         "shape, but x1.shape = {}, and x2.shape = {}.".format(
                             x1.shape, x2.shape))
-    result = DistArray(x1.shape)
+    check_block_sizes("add", x1, x2)
+    result = DistArray(x1.shape, block_size=x1.block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.add.remote(x1.objectids[index],
                                                 x2.objectids[index])
@@ -279,7 +545,8 @@ def subtract(x1, x2):
         raise Exception("subtract expects arguments `x1` and `x2` to have the "
                         "same shape, but x1.shape = {}, and x2.shape = {}."
                         .format(x1.shape, x2.shape))
-    result = DistArray(x1.shape)
+    check_block_sizes("subtract", x1, x2)
+    result = DistArray(x1.shape, block_size=x1.block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.subtract.remote(x1.objectids[index],
                                                      x2.objectids[index])
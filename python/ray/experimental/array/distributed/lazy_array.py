@@ -0,0 +1,165 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numbers
+
+import numpy as np
+import ray
+
+from .core import DistArray, check_block_sizes
+
+__all__ = ["LazyArray", "lazy"]
+
+# The kinds of nodes in the program that is evaluated for each block.
+_BLOCK, _SCALAR, _CALL = range(3)
+
+
+class LazyArray(object):
+    """An elementwise expression over distributed arrays.
+
+    Operations on lazy arrays only record an expression graph. Calling
+    `evaluate` computes each block of the result with a single task that
+    runs the whole expression, so a chain of elementwise operations costs
+    one task per block instead of one task per block and operation, and the
+    intermediate blocks are never put in the object store.
+
+    .. code-block:: python
+
+        x = da.lazy(da.random.normal.remote([1000, 1000]))
+        y = da.lazy(da.random.normal.remote([1000, 1000]))
+        z = (2 * x + y).apply(np.exp).evaluate()  # A DistArray.
+
+    The arrays in an expression must have the same shape and block size.
+    Scalars are broadcast.
+    """
+
+    def __init__(self, func=None, args=(), array=None):
+        self.func = func
+        self.args = args
+        self.array = array
+        arrays = [array] if array is not None else [
+            arg for arg in args if isinstance(arg, LazyArray)
+        ]
+        self.shape = arrays[0].shape
+        self.block_size = arrays[0].block_size
+        for other in arrays[1:]:
+            if list(other.shape) != list(self.shape):
+                raise Exception("Lazy arrays in an expression must have the "
+                                "same shape, but the shapes are {} and {}."
+                                .format(self.shape, other.shape))
+        check_block_sizes("LazyArray", *arrays)
+
+    def apply(self, func, *args):
+        """Apply an elementwise function to this array and the given args.
+
+        The args can be lazy arrays, distributed arrays or scalars.
+        """
+        return LazyArray(func, (self, ) + tuple(_as_arg(arg) for arg in args))
+
+    def evaluate(self):
+        """Compute the expression.
+
+        Returns:
+            A DistArray with the result.
+        """
+        if self.array is not None:
+            return self.array
+        arrays = []
+        program = self._program(arrays, {})
+        result = DistArray(self.shape, block_size=self.block_size)
+        for index in np.ndindex(*result.num_blocks):
+            result.objectids[index] = _evaluate_block.remote(
+                program, *[a.objectids[index] for a in arrays])
+        return result
+
+    def _program(self, arrays, positions):
+        """Convert the expression to nested tuples that refer to blocks.
+
+        Distributed arrays are appended to arrays, and are referred to by
+        their position so that each block is passed to the task only once.
+        """
+        if self.array is not None:
+            if id(self.array) not in positions:
+                positions[id(self.array)] = len(arrays)
+                arrays.append(self.array)
+            return (_BLOCK, positions[id(self.array)])
+        return (_CALL, self.func,
+                tuple(
+                    arg._program(arrays, positions) if isinstance(
+                        arg, LazyArray) else (_SCALAR, arg)
+                    for arg in self.args))
+
+    def __add__(self, other):
+        return self.apply(np.add, other)
+
+    def __radd__(self, other):
+        return LazyArray(np.add, (_as_arg(other), self))
+
+    def __sub__(self, other):
+        return self.apply(np.subtract, other)
+
+    def __rsub__(self, other):
+        return LazyArray(np.subtract, (_as_arg(other), self))
+
+    def __mul__(self, other):
+        return self.apply(np.multiply, other)
+
+    def __rmul__(self, other):
+        return LazyArray(np.multiply, (_as_arg(other), self))
+
+    def __truediv__(self, other):
+        return self.apply(np.true_divide, other)
+
+    def __rtruediv__(self, other):
+        return LazyArray(np.true_divide, (_as_arg(other), self))
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        return self.apply(np.power, other)
+
+    def __neg__(self):
+        return self.apply(np.negative)
+
+    def __abs__(self):
+        return self.apply(np.absolute)
+
+
+def _as_arg(value):
+    if isinstance(value, (LazyArray, numbers.Number)):
+        return value
+    return lazy(value)
+
+
+def lazy(a):
+    """Wrap a distributed array to build an elementwise expression.
+
+    Args:
+        a: A DistArray or the ID of a DistArray.
+
+    Returns:
+        A LazyArray.
+    """
+    if isinstance(a, ray.ObjectID):
+        a = ray.get(a)
+    if not isinstance(a, DistArray):
+        raise Exception("lazy expects a DistArray, but received an object "
+                        "of type {}.".format(type(a)))
+    return LazyArray(array=a)
+
+
+def _run(program, blocks):
+    kind = program[0]
+    if kind == _BLOCK:
+        return blocks[program[1]]
+    if kind == _SCALAR:
+        return program[1]
+    _, func, args = program
+    return func(*[_run(arg, blocks) for arg in args])
+
+
+@ray.remote
+def _evaluate_block(program, *blocks):
+    return _run(program, blocks)
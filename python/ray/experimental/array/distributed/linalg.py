@@ -60,9 +60,9 @@ def tsqr(a):
         q_shape = a.shape
     else:
         q_shape = [a.shape[0], a.shape[0]]
-    q_num_blocks = core.DistArray.compute_num_blocks(q_shape)
+    q_num_blocks = core.DistArray.compute_num_blocks(q_shape, a.block_size)
     q_objectids = np.empty(q_num_blocks, dtype=object)
-    q_result = core.DistArray(q_shape, q_objectids)
+    q_result = core.DistArray(q_shape, q_objectids, a.block_size)
 
     # reconstruct output
     for i in range(num_blocks):
@@ -71,10 +71,10 @@ def tsqr(a):
         for j in range(1, K):
             if np.mod(ith_index, 2) == 0:
                 lower = [0, 0]
-                upper = [a.shape[1], core.BLOCK_SIZE]
+                upper = [a.shape[1], a.block_size]
             else:
                 lower = [a.shape[1], 0]
-                upper = [2 * a.shape[1], core.BLOCK_SIZE]
+                upper = [2 * a.shape[1], a.block_size]
             ith_index //= 2
             q_block_current = ra.dot.remote(
                 q_block_current,
@@ -122,7 +122,8 @@ def modified_lu(q):
         L[i, i] = 1
     U = np.triu(q_work)[:b, :]
     # TODO(rkn): Get rid of the put below.
-    return ray.get(core.numpy_to_dist.remote(ray.put(L))), U, S
+    return ray.get(
+        core.numpy_to_dist.remote(ray.put(L), block_size=q.block_size)), U, S
 
 
 @ray.remote(num_return_vals=2)
@@ -171,15 +172,17 @@ def qr(a):
     k = min(m, n)
 
     # we will store our scratch work in a_work
-    a_work = core.DistArray(a.shape, np.copy(a.objectids))
+    a_work = core.DistArray(a.shape, np.copy(a.objectids), a.block_size)
 
     result_dtype = np.linalg.qr(ray.get(a.objectids[0, 0]))[0].dtype.name
     # TODO(rkn): It would be preferable not to get this right after creating
     # it.
-    r_res = ray.get(core.zeros.remote([k, n], result_dtype))
+    r_res = ray.get(
+        core.zeros.remote([k, n], result_dtype, block_size=a.block_size))
     # TODO(rkn): It would be preferable not to get this right after creating
     # it.
-    y_res = ray.get(core.zeros.remote([m, k], result_dtype))
+    y_res = ray.get(
+        core.zeros.remote([m, k], result_dtype, block_size=a.block_size))
     Ts = []
 
     # The for loop differs from the paper, which says
@@ -201,7 +204,7 @@ def qr(a):
             r_res.objectids[i, i] = ra.dot.remote(eye_temp, R)
         else:
             r_res.objectids[i, i] = R
-        Ts.append(core.numpy_to_dist.remote(t))
+        Ts.append(core.numpy_to_dist.remote(t, block_size=a.block_size))
 
         for c in range(i + 1, a.num_blocks[1]):
             W_rcs = []
@@ -216,7 +219,7 @@ def qr(a):
             r_res.objectids[i, c] = a_work.objectids[i, c]
 
     # construct q_res from Ys and Ts
-    q = core.eye.remote(m, k, dtype_name=result_dtype)
+    q = core.eye.remote(m, k, dtype_name=result_dtype, block_size=a.block_size)
     for i in range(len(Ts))[::-1]:
         y_col_block = core.subblocks.remote(y_res, [], [i])
         q = core.subtract.remote(
@@ -6,15 +6,15 @@ import numpy as np
 import ray.experimental.array.remote as ra
 import ray
 
-from .core import DistArray
+from .core import BLOCK_SIZE, DistArray
 
 
 @ray.remote
-def normal(shape):
-    num_blocks = DistArray.compute_num_blocks(shape)
+def normal(shape, block_size=BLOCK_SIZE):
+    num_blocks = DistArray.compute_num_blocks(shape, block_size)
     objectids = np.empty(num_blocks, dtype=object)
     for index in np.ndindex(*num_blocks):
         objectids[index] = ra.random.normal.remote(
-            DistArray.compute_block_shape(index, shape))
-    result = DistArray(shape, objectids)
+            DistArray.compute_block_shape(index, shape, block_size))
+    result = DistArray(shape, objectids, block_size)
     return result
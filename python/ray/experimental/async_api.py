@@ -67,19 +67,36 @@ def thread_safe_client(client, lock=None):
     return _ThreadSafeProxy(client, lock)
 
 
+def _create_handler():
+    """Subscribes to plasma notifications and creates the event handler.
+
+    This is done synchronously so that futures can be registered right
+    away. Notifications are buffered in the socket until it's connected.
+
+    Returns:
+        The plasma client that receives the notifications.
+    """
+    global handler
+    worker = ray.worker.global_worker
+    plasma_client = thread_safe_client(
+        plasma.connect(worker.node.plasma_store_socket_name, None, 0, 300))
+    plasma_client.subscribe()
+    handler = PlasmaEventHandler(asyncio.get_event_loop(), worker)
+    return plasma_client
+
+
+async def _connect(plasma_client):
+    global transport, protocol
+    loop = asyncio.get_event_loop()
+    rsock = plasma_client.get_notification_socket()
+    transport, protocol = await loop.create_connection(
+        lambda: PlasmaProtocol(plasma_client, handler), sock=rsock)
+    logger.debug("AsyncPlasma Connection Created!")
+
+
 async def _async_init():
-    global handler, transport, protocol
     if handler is None:
-        worker = ray.worker.global_worker
-        plasma_client = thread_safe_client(
-            plasma.connect(worker.node.plasma_store_socket_name, None, 0, 300))
-        loop = asyncio.get_event_loop()
-        plasma_client.subscribe()
-        rsock = plasma_client.get_notification_socket()
-        handler = PlasmaEventHandler(loop, worker)
-        transport, protocol = await loop.create_connection(
-            lambda: PlasmaProtocol(plasma_client, handler), sock=rsock)
-        logger.debug("AsyncPlasma Connection Created!")
+        await _connect(_create_handler())
 
 
 def init():
@@ -90,14 +107,17 @@ def init():
 
     loop = asyncio.get_event_loop()
     if loop.is_running():
-        asyncio.ensure_future(_async_init())
+        if handler is None:
+            asyncio.ensure_future(_connect(_create_handler()))
     else:
-        asyncio.get_event_loop().run_until_complete(_async_init())
+        loop.run_until_complete(_async_init())
 
 
 def as_future(object_id):
     """Turn an object_id into a Future object.
 
+    This is also what `await object_id` does.
+
     Args:
         object_id: A Ray object_id.
 
@@ -117,7 +137,8 @@ def shutdown():
     global handler, transport, protocol
     if handler is not None:
         handler.close()
-        transport.close()
+        if transport is not None:
+            transport.close()
         handler = None
         transport = None
         protocol = None
@@ -10,11 +10,6 @@ from ray.services import logger
 INT64_SIZE = ctypes.sizeof(ctypes.c_int64)
 
 
-def _release_waiter(waiter, *_):
-    if not waiter.done():
-        waiter.set_result(None)
-
-
 class PlasmaProtocol(asyncio.Protocol):
     """Protocol control for the asyncio connection."""
 
@@ -56,9 +51,6 @@ class PlasmaProtocol(asyncio.Protocol):
 class PlasmaObjectFuture(asyncio.Future):
     """This class manages the lifecycle of a Future contains an object_id.
 
-    Note:
-        This Future is an item in an linked list.
-
     Attributes:
         object_id: The object_id this Future contains.
     """
@@ -66,8 +58,6 @@ class PlasmaObjectFuture(asyncio.Future):
     def __init__(self, loop, object_id):
         super().__init__(loop=loop)
         self.object_id = object_id
-        self.prev = None
-        self.next = None
 
     @property
     def ray_object_id(self):
@@ -77,131 +67,51 @@ class PlasmaObjectFuture(asyncio.Future):
         return super().__repr__() + "{object_id=%s}" % self.object_id
 
 
-class PlasmaObjectLinkedList(asyncio.Future):
-    """This class is a doubly-linked list.
-    It holds a ObjectID and maintains futures assigned to the ObjectID.
+class PlasmaEventHandler:
+    """This class is an event handler for Plasma.
 
-    Args:
-        loop: an event loop.
-        plain_object_id (plasma.ObjectID):
-            The plasma ObjectID this class holds.
+    Futures are kept in a set per object, so registering and removing a
+    future is O(1) regardless of the number of outstanding futures. All
+    futures are created and resolved on the event loop thread, which is
+    also where the notifications are processed.
     """
 
-    def __init__(self, loop, plain_object_id):
-        super().__init__(loop=loop)
-        assert isinstance(plain_object_id, plasma.ObjectID)
-        self.object_id = plain_object_id
-        self.head = None
-        self.tail = None
-
-    def append(self, future):
-        """Append an object to the linked list.
-
-        Args:
-            future (PlasmaObjectFuture): A PlasmaObjectFuture instance.
-        """
-        future.prev = self.tail
-        if self.tail is None:
-            assert self.head is None
-            self.head = future
-        else:
-            self.tail.next = future
-        self.tail = future
-        # Once done, it will be removed from the list.
-        future.add_done_callback(self.remove)
-
-    def remove(self, future):
-        """Remove an object from the linked list.
-
-        Args:
-            future (PlasmaObjectFuture): A PlasmaObjectFuture instance.
-        """
-        if self._loop.get_debug():
-            logger.debug("Removing %s from the linked list.", future)
-        if future.prev is None:
-            assert future is self.head
-            self.head = future.next
-            if self.head is None:
-                self.tail = None
-                if not self.cancelled():
-                    self.set_result(None)
-            else:
-                self.head.prev = None
-        elif future.next is None:
-            assert future is self.tail
-            self.tail = future.prev
-            if self.tail is None:
-                self.head = None
-                if not self.cancelled():
-                    self.set_result(None)
-            else:
-                self.tail.prev = None
-
-    def cancel(self, *args, **kwargs):
-        """Manually cancel all tasks assigned to this event loop."""
-        # Because remove all futures will trigger `set_result`,
-        # we cancel itself first.
-        super().cancel()
-        for future in self.traverse():
-            # All cancelled futures should have callbacks to removed itself
-            # from this linked list. However, these callbacks are scheduled in
-            # an event loop, so we could still find them in our list.
-            if not future.cancelled():
-                future.cancel()
-
-    def set_result(self, result):
-        """Complete all tasks. """
-        for future in self.traverse():
-            # All cancelled futures should have callbacks to removed itself
-            # from this linked list. However, these callbacks are scheduled in
-            # an event loop, so we could still find them in our list.
-            future.set_result(result)
-        if not self.done():
-            super().set_result(result)
-
-    def traverse(self):
-        """Traverse this linked list.
-
-        Yields:
-            PlasmaObjectFuture: PlasmaObjectFuture instances.
-        """
-        current = self.head
-        while current is not None:
-            yield current
-            current = current.next
-
-
-class PlasmaEventHandler:
-    """This class is an event handler for Plasma."""
-
     def __init__(self, loop, worker):
         super().__init__()
         self._loop = loop
         self._worker = worker
+        # Map from plasma ObjectID to the set of futures waiting for it.
         self._waiting_dict = {}
 
     def process_notifications(self, messages):
         """Process notifications."""
         for object_id, object_size, metadata_size in messages:
             if object_size > 0 and object_id in self._waiting_dict:
-                linked_list = self._waiting_dict[object_id]
-                self._complete_future(linked_list)
+                futures = self._waiting_dict.pop(object_id)
+                self._complete_futures(object_id, futures)
 
     def close(self):
         """Clean up this handler."""
-        for linked_list in self._waiting_dict.values():
-            linked_list.cancel()
-        # All cancelled linked lists should have callbacks to removed itself
-        # from the waiting dict. However, these callbacks are scheduled in
-        # an event loop, so we don't check them now.
+        waiting_dict, self._waiting_dict = self._waiting_dict, {}
+        for futures in waiting_dict.values():
+            for future in futures:
+                future.cancel()
 
     def _unregister_callback(self, fut):
-        del self._waiting_dict[fut.object_id]
-
-    def _complete_future(self, fut):
+        # Futures of completed objects were already popped from the dict.
+        futures = self._waiting_dict.get(fut.object_id)
+        if futures is not None:
+            futures.discard(fut)
+            if not futures:
+                del self._waiting_dict[fut.object_id]
+
+    def _complete_futures(self, plain_object_id, futures):
+        # The object is deserialized once for all of its futures.
         obj = self._worker.retrieve_and_deserialize(
-            [ray.ObjectID(fut.object_id.binary())], 0)[0]
-        fut.set_result(obj)
+            [ray.ObjectID(plain_object_id.binary())], 0)[0]
+        for future in futures:
+            if not future.done():
+                future.set_result(obj)
 
     def as_future(self, object_id, check_ready=True):
         """Turn an object_id into a Future object.
@@ -219,19 +129,22 @@ class PlasmaEventHandler:
         plain_object_id = plasma.ObjectID(object_id.binary())
         fut = PlasmaObjectFuture(loop=self._loop, object_id=plain_object_id)
 
-        if check_ready:
-            ready, _ = ray.wait([object_id], timeout=0)
-            if ready:
-                if self._loop.get_debug():
-                    logger.debug("%s has been ready.", plain_object_id)
-                self._complete_future(fut)
-                return fut
-
-        if plain_object_id not in self._waiting_dict:
-            linked_list = PlasmaObjectLinkedList(self._loop, plain_object_id)
-            linked_list.add_done_callback(self._unregister_callback)
-            self._waiting_dict[plain_object_id] = linked_list
-        self._waiting_dict[plain_object_id].append(fut)
+        # Notifications are processed on this thread, so an object that is
+        # not local yet is guaranteed to be completed by a later one.
+        if check_ready and self._worker.core_worker.object_exists(object_id):
+            if self._loop.get_debug():
+                logger.debug("%s has been ready.", plain_object_id)
+            self._complete_futures(plain_object_id, [fut])
+            return fut
+
+        futures = self._waiting_dict.get(plain_object_id)
+        if futures is None:
+            futures = self._waiting_dict[plain_object_id] = set()
+            # Ask the raylet to pull the object to this node without
+            # blocking, the seal notification tells us once it's here.
+            self._worker.raylet_client.fetch_or_reconstruct([object_id], True)
+        futures.add(fut)
+        fut.add_done_callback(self._unregister_callback)
         if self._loop.get_debug():
             logger.debug("%s added to the waiting list.", fut)
 
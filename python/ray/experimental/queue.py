@@ -19,6 +19,11 @@ class Full(Exception):
 class Queue(object):
     """Queue implementation on Ray.
 
+    Blocking calls don't poll the queue actor for items. Instead, the actor
+    parks waiting producers and consumers and returns the ID of an object
+    that it creates once the request can be served, which the caller waits
+    on. Waiting producers and consumers are served in FIFO order.
+
     Args:
         maxsize (int): maximum size of the queue. If zero, size is unboundend.
     """
@@ -40,7 +45,7 @@ class Queue(object):
 
     def empty(self):
         """Whether the queue is empty."""
-        return ray.get(self.actor.qsize.remote())
+        return ray.get(self.actor.empty.remote())
 
     def full(self):
         """Whether the queue is full."""
@@ -49,70 +54,80 @@ class Queue(object):
     def put(self, item, block=True, timeout=None):
         """Adds an item to the queue.
 
-        Uses polling if block=True, so there is no guarantee of order if
-        multiple producers put to the same full queue.
+        If the queue is full and block=True, waits until a consumer makes
+        room for the item.
+
+        Raises:
+            Full if the queue is full and blocking is False, or if the item
+                could not be added within the timeout.
+        """
+        self.put_batch([item], block=block, timeout=timeout)
+
+    def put_batch(self, items, block=True, timeout=None):
+        """Adds a list of items to the queue with a single actor call.
+
+        If block=False, either all of the items or none of them are added.
 
         Raises:
-            Full if the queue is full and blocking is False.
+            Full if there is not enough room for all items and blocking is
+                False, or if not all items could be added within the timeout.
+                In the latter case, some of the items may have been added.
         """
         if self.maxsize <= 0:
-            self.actor.put.remote(item)
+            self.actor.put_batch.remote(items)
         elif not block:
-            if not ray.get(self.actor.put.remote(item)):
+            if not ray.get(self.actor.put_batch.remote(items)):
                 raise Full
-        elif timeout is None:
-            # Polling
-            # Use a not_full condition variable or promise?
-            while not ray.get(self.actor.put.remote(item)):
-                # Consider adding time.sleep here
-                pass
-        elif timeout < 0:
+        elif timeout is not None and timeout < 0:
             raise ValueError("'timeout' must be a non-negative number")
         else:
-            endtime = time.time() + timeout
-            # Polling
-            # Use a condition variable or switch to promise?
-            success = False
-            while not success and time.time() < endtime:
-                success = ray.get(self.actor.put.remote(item))
-            if not success:
-                raise Full
+            ack_id = ray.get(self.actor.put_wait.remote(items))
+            if ack_id is not None and not self._wait(ack_id, timeout):
+                # The request may have been served since the timeout.
+                if ray.get(self.actor.cancel_put.remote(ack_id)):
+                    raise Full
 
     def get(self, block=True, timeout=None):
         """Gets an item from the queue.
 
-        Uses polling if block=True, so there is no guarantee of order if
-        multiple consumers get from the same empty queue.
+        If the queue is empty and block=True, waits until a producer adds an
+        item.
 
         Returns:
             The next item in the queue.
 
         Raises:
-            Empty if the queue is empty and blocking is False.
+            Empty if the queue is empty and blocking is False, or if no item
+                was added within the timeout.
         """
         if not block:
             success, item = ray.get(self.actor.get.remote())
             if not success:
                 raise Empty
-        elif timeout is None:
-            # Polling
-            # Use a not_empty condition variable or return a promise?
-            success, item = ray.get(self.actor.get.remote())
-            while not success:
-                # Consider adding time.sleep here
-                success, item = ray.get(self.actor.get.remote())
-        elif timeout < 0:
-            raise ValueError("'timeout' must be a non-negative number")
-        else:
-            endtime = time.time() + timeout
-            # Polling
-            # Use a not_full condition variable or return a promise?
-            success = False
-            while not success and time.time() < endtime:
-                success, item = ray.get(self.actor.get.remote())
-            if not success:
+            return item
+        return self._get_wait(None, timeout)
+
+    def get_batch(self, num_items, block=True, timeout=None):
+        """Gets up to num_items items from the queue with one actor call.
+
+        If the queue is empty and block=True, waits until at least one item
+        is available.
+
+        Returns:
+            A list of between one and num_items items.
+
+        Raises:
+            Empty if the queue is empty and blocking is False, or if no item
+                was added within the timeout.
+        """
+        if num_items < 1:
+            raise ValueError("'num_items' must be a positive number")
+        if not block:
+            items = ray.get(self.actor.get_batch.remote(num_items))
+            if not items:
                 raise Empty
-        return item
+            return items
+        return self._get_wait(num_items, timeout)
 
     def put_nowait(self, item):
         """Equivalent to put(item, block=False).
@@ -130,12 +145,67 @@ class Queue(object):
         """
         return self.get(block=False)
 
+    def _get_wait(self, num_items, timeout):
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        ready, result = ray.get(self.actor.get_wait.remote(num_items))
+        if ready:
+            return result
+        if not self._wait(result, timeout):
+            # The request may have been served since the timeout.
+            if ray.get(self.actor.cancel_get.remote(result)):
+                raise Empty
+        return ray.get(ray.ObjectID(result))
+
+    def _wait(self, object_id_binary, timeout):
+        """Waits for the actor to create the object with the given ID.
+
+        The object is put by an actor task that has already finished, so the
+        raylet would try to reconstruct it if it were waited on for longer
+        than the reconstruction timeout. The wait is therefore split into
+        shorter slices, and after each one the actor is called once, which
+        raises an error if the actor died instead of waiting forever.
+
+        Returns:
+            True if the object was created within the timeout.
+        """
+        object_id = ray.ObjectID(object_id_binary)
+        slice_s = (
+            ray._config.initial_reconstruction_timeout_milliseconds() / 2000)
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            wait_s = slice_s
+            if deadline is not None:
+                wait_s = max(min(wait_s, deadline - time.time()), 0)
+            ready, _ = ray.wait([object_id], timeout=wait_s)
+            if ready:
+                return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            self.size()
+
+
+def _new_object_id():
+    """Returns a new ID for an object that will be put by this actor."""
+    worker = ray.worker.global_worker
+    object_id = ray._raylet.compute_put_id(worker.current_task_id,
+                                           worker.task_context.put_index)
+    worker.task_context.put_index += 1
+    return object_id
+
 
 @ray.remote
 class _QueueActor(object):
     def __init__(self, maxsize):
         self.maxsize = maxsize
         self._init(maxsize)
+        # Consumers waiting for items, as pairs of the object ID to put the
+        # result in and the requested batch size (None for a single item).
+        self.getters = deque()
+        # Items of producers waiting for room, as (ack ID, item) pairs.
+        self.putters = deque()
+        # Number of waiting items of each producer, by binary ack ID.
+        self.pending_puts = {}
 
     def qsize(self):
         return self._qsize()
@@ -147,15 +217,110 @@ class _QueueActor(object):
         return 0 < self.maxsize <= self._qsize()
 
     def put(self, item):
-        if self.maxsize > 0 and self._qsize() >= self.maxsize:
+        return self.put_batch([item])
+
+    def put_batch(self, items):
+        """Adds all items if there is room for all of them."""
+        room = len(self.getters) + self.maxsize - self._qsize()
+        if self.maxsize > 0 and len(items) > room:
+            return False
+        for item in items:
+            self._put_or_hand_off(item)
+        return True
+
+    def put_wait(self, items):
+        """Adds the items, parking the ones there is no room for.
+
+        Returns:
+            None if all of the items were added. Otherwise, the binary ID of
+                an object that is created once the rest was added.
+        """
+        remaining = deque(items)
+        while remaining and self._has_room():
+            self._put_or_hand_off(remaining.popleft())
+        if not remaining:
+            return None
+        ack_id = _new_object_id().binary()
+        self.pending_puts[ack_id] = len(remaining)
+        self.putters.extend((ack_id, item) for item in remaining)
+        return ack_id
+
+    def cancel_put(self, ack_id):
+        """Drops the parked items of a producer.
+
+        Returns:
+            True if the request was cancelled, False if all of its items
+                were already added.
+        """
+        if ack_id not in self.pending_puts:
             return False
-        self._put(item)
+        del self.pending_puts[ack_id]
+        self.putters = deque(p for p in self.putters if p[0] != ack_id)
         return True
 
     def get(self):
         if not self._qsize():
             return False, None
-        return True, self._get()
+        item = self._get()
+        self._admit_putters()
+        return True, item
+
+    def get_batch(self, num_items):
+        items = []
+        while self._qsize() and len(items) < num_items:
+            items.append(self._get())
+        self._admit_putters()
+        return items
+
+    def get_wait(self, num_items=None):
+        """Gets an item or a batch of items, or parks the consumer.
+
+        Returns:
+            (True, result) if items were available. Otherwise, (False, the
+                binary ID of an object the result will be put in).
+        """
+        if self._qsize():
+            if num_items is None:
+                return self.get()
+            return True, self.get_batch(num_items)
+        object_id = _new_object_id()
+        self.getters.append((object_id, num_items))
+        return False, object_id.binary()
+
+    def cancel_get(self, object_id_binary):
+        """Removes a parked consumer.
+
+        Returns:
+            True if the request was cancelled, False if it was already
+                served.
+        """
+        for i, (object_id, _) in enumerate(self.getters):
+            if object_id.binary() == object_id_binary:
+                del self.getters[i]
+                return True
+        return False
+
+    def _has_room(self):
+        return self.maxsize <= 0 or self._qsize() < self.maxsize
+
+    def _put_or_hand_off(self, item):
+        # Consumers only wait if the queue is empty, so FIFO order is kept
+        # by handing the item to the first waiting one directly.
+        if self.getters:
+            object_id, num_items = self.getters.popleft()
+            ray.worker.global_worker.put_object(
+                object_id, item if num_items is None else [item])
+        else:
+            self._put(item)
+
+    def _admit_putters(self):
+        while self.putters and self._has_room():
+            ack_id, item = self.putters.popleft()
+            self._put_or_hand_off(item)
+            self.pending_puts[ack_id] -= 1
+            if self.pending_puts[ack_id] == 0:
+                del self.pending_puts[ack_id]
+                ray.worker.global_worker.put_object(ray.ObjectID(ack_id), True)
 
     # Override these for different queue implementations
     def _init(self, maxsize):
@@ -0,0 +1,121 @@
+"""Compares the communication strategies of PyTorchTrainer on CPUs.
+
+Trains an MLP on a synthetic classification task with gloo, once with
+DistributedDataParallel and once with each communication strategy, and
+prints the training throughput and the validation accuracy of each.
+
+Example:
+    python communication_benchmark.py --address auto --num-replicas 4
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+import torch
+import torch.nn as nn
+
+import ray
+from ray.experimental.sgd.pytorch import (PyTorchTrainer, FP16AllReduce,
+                                          TopKAllReduce, LocalSGD)
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--address",
+    default=None,
+    type=str,
+    help="the address of the cluster to connect to, if not given a local "
+    "cluster is started")
+parser.add_argument(
+    "--num-replicas", default=2, type=int, help="the number of replicas")
+parser.add_argument(
+    "--hidden-size",
+    default=1024,
+    type=int,
+    help="the width of the hidden layers, which sets the size of the "
+    "gradients")
+parser.add_argument(
+    "--batch-size", default=256, type=int, help="the total batch size")
+parser.add_argument(
+    "--epochs", default=3, type=int, help="the number of epochs to train")
+
+NUM_FEATURES = 64
+NUM_CLASSES = 10
+
+
+def make_dataset(size, seed):
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+    features = torch.randn(size, NUM_FEATURES, generator=generator)
+    # The labels come from a fixed random linear teacher.
+    teacher = torch.randn(
+        NUM_FEATURES, NUM_CLASSES, generator=torch.Generator().manual_seed(0))
+    labels = features.mm(teacher).argmax(dim=1)
+    return torch.utils.data.TensorDataset(features, labels)
+
+
+def data_creator(config):
+    return make_dataset(20000, 1), make_dataset(2000, 2)
+
+
+def model_creator(config):
+    hidden_size = config["hidden_size"]
+    return nn.Sequential(
+        nn.Linear(NUM_FEATURES, hidden_size), nn.ReLU(),
+        nn.Linear(hidden_size, hidden_size), nn.ReLU(),
+        nn.Linear(hidden_size, NUM_CLASSES))
+
+
+def optimizer_creator(model, config):
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.05, momentum=0.9)
+    return criterion, optimizer
+
+
+def accuracy(model, dataset):
+    features, labels = dataset.tensors
+    with torch.no_grad():
+        predictions = model(features).argmax(dim=1)
+    return (predictions == labels).float().mean().item()
+
+
+def main(args):
+    ray.init(address=args.address)
+    config = {"hidden_size": args.hidden_size}
+    _, validation_set = data_creator(config)
+    strategies = [
+        ("ddp", None),
+        ("fp16", FP16AllReduce()),
+        ("topk 1%", TopKAllReduce(ratio=0.01)),
+        ("local sgd 8", LocalSGD(sync_period=8)),
+    ]
+    print("strategy       samples/s  accuracy")
+    for name, communication in strategies:
+        trainer = PyTorchTrainer(
+            model_creator,
+            data_creator,
+            optimizer_creator,
+            config=config,
+            num_replicas=args.num_replicas,
+            batch_size=args.batch_size,
+            backend="gloo",
+            communication=communication)
+        num_samples = 0
+        start = time.time()
+        for _ in range(args.epochs):
+            stats = trainer.train()
+            num_samples += stats["batch_processed"] * args.num_replicas
+        throughput = num_samples / (time.time() - start)
+        model = trainer.get_model()
+        model.eval()
+        print("{:12s} {:11.1f} {:9.3f}".format(name, throughput,
+                                               accuracy(model,
+                                                        validation_set)))
+        trainer.shutdown()
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
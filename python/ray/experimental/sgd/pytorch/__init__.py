@@ -4,5 +4,11 @@ from __future__ import print_function
 
 from ray.experimental.sgd.pytorch.pytorch_trainer import (PyTorchTrainer,
                                                           PyTorchTrainable)
+from ray.experimental.sgd.pytorch.data_pipeline import ShardedDataset
+from ray.experimental.sgd.pytorch.communication import (
+    CommunicationStrategy, FP16AllReduce, TopKAllReduce, LocalSGD)
 
-__all__ = ["PyTorchTrainer", "PyTorchTrainable"]
+__all__ = [
+    "PyTorchTrainer", "PyTorchTrainable", "ShardedDataset",
+    "CommunicationStrategy", "FP16AllReduce", "TopKAllReduce", "LocalSGD"
+]
@@ -0,0 +1,154 @@
+"""Communication-efficient alternatives to DistributedDataParallel.
+
+Pass one of these as the `communication` argument of PyTorchTrainer. Every
+replica gets its own copy, so strategies may keep per-replica state.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import torch
+import torch.distributed as dist
+
+
+def _flatten(tensors):
+    return torch.cat([tensor.contiguous().view(-1) for tensor in tensors])
+
+
+def _unflatten_into(flat, tensors):
+    offset = 0
+    for tensor in tensors:
+        numel = tensor.numel()
+        tensor.copy_(flat[offset:offset + numel].view_as(tensor))
+        offset += numel
+
+
+def _gradients(model):
+    return [p.grad.data for p in model.parameters() if p.grad is not None]
+
+
+def _average_parameters(model):
+    parameters = [p.data for p in model.parameters()]
+    flat = _flatten(parameters)
+    dist.all_reduce(flat)
+    flat /= dist.get_world_size()
+    _unflatten_into(flat, parameters)
+
+
+class CommunicationStrategy(object):
+    """Synchronizes the model replicas during training.
+
+    The model is not wrapped in DistributedDataParallel if a strategy is
+    given, so the strategy must keep the replicas in sync.
+    """
+
+    def setup(self, model):
+        """Called once the process group is formed, before training.
+
+        By default this copies the parameters of the first replica to all
+        others, so that all replicas start from the same model.
+        """
+        for parameter in model.parameters():
+            dist.broadcast(parameter.data, 0)
+
+    def after_backward(self, model):
+        """Called after the gradients of a batch are computed."""
+        pass
+
+    def after_step(self, model):
+        """Called after the optimizer updated the parameters."""
+        pass
+
+    def after_epoch(self, model):
+        """Called at the end of each training epoch."""
+        pass
+
+
+class FP16AllReduce(CommunicationStrategy):
+    """Averages the gradients in half precision.
+
+    Gradients are cast to fp16 and packed into buckets of about
+    bucket_size_mb, so that small gradients are sent in few all-reduces.
+    This halves the bytes sent compared to fp32 all-reduce.
+    """
+
+    def __init__(self, bucket_size_mb=25):
+        self.bucket_size_mb = bucket_size_mb
+
+    def _buckets(self, gradients):
+        max_numel = self.bucket_size_mb * 1024 * 1024 // 2
+        bucket, numel = [], 0
+        for gradient in gradients:
+            if bucket and numel + gradient.numel() > max_numel:
+                yield bucket
+                bucket, numel = [], 0
+            bucket.append(gradient)
+            numel += gradient.numel()
+        if bucket:
+            yield bucket
+
+    def after_backward(self, model):
+        world_size = dist.get_world_size()
+        for bucket in self._buckets(_gradients(model)):
+            flat = _flatten(bucket).half()
+            # Divide before summing so that large sums do not overflow.
+            flat /= world_size
+            dist.all_reduce(flat)
+            _unflatten_into(flat.float(), bucket)
+
+
+class TopKAllReduce(CommunicationStrategy):
+    """Sends only the largest gradient entries, with error feedback.
+
+    Each replica sends the ratio of its gradient entries with the largest
+    magnitude. The entries that were not sent are added to the gradient of
+    the next step, so that no update is lost, only delayed.
+    """
+
+    def __init__(self, ratio=0.01):
+        self.ratio = ratio
+        self.residual = None
+
+    def after_backward(self, model):
+        gradients = _gradients(model)
+        flat = _flatten(gradients)
+        if self.residual is not None:
+            flat += self.residual
+        k = max(1, int(flat.numel() * self.ratio))
+        _, indices = flat.abs().topk(k)
+        values = flat[indices]
+        self.residual = flat
+        self.residual[indices] = 0
+
+        world_size = dist.get_world_size()
+        all_indices = [torch.empty_like(indices) for _ in range(world_size)]
+        all_values = [torch.empty_like(values) for _ in range(world_size)]
+        dist.all_gather(all_indices, indices)
+        dist.all_gather(all_values, values)
+        total = torch.zeros_like(flat)
+        for replica_indices, replica_values in zip(all_indices, all_values):
+            total.index_add_(0, replica_indices, replica_values)
+        total /= world_size
+        _unflatten_into(total, gradients)
+
+
+class LocalSGD(CommunicationStrategy):
+    """Trains the replicas independently and averages them periodically.
+
+    The replicas only communicate every sync_period steps and at the end of
+    each epoch, when their parameters are averaged.
+    """
+
+    def __init__(self, sync_period=8):
+        self.sync_period = sync_period
+        self.num_steps = 0
+
+    def after_step(self, model):
+        self.num_steps += 1
+        if self.num_steps % self.sync_period == 0:
+            _average_parameters(model)
+
+    def after_epoch(self, model):
+        if self.num_steps % self.sync_period != 0:
+            _average_parameters(model)
@@ -0,0 +1,147 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import logging
+import threading
+
+from six.moves import queue
+import torch
+import torch.utils.data
+
+import ray
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedDataset(object):
+    """A data set split into shards that are loaded by different replicas.
+
+    Return this from the data_creator instead of a torch Dataset so that
+    each replica only loads its own shards, instead of every replica
+    loading the whole data set and sampling a part of it.
+
+    Examples:
+        Shard an in-memory data set through the object store. The shards
+        are created once on the driver and only fetched by the replicas.
+
+        >>> train_shards = ShardedDataset.from_dataset(train_set, 8)
+        >>> def data_creator(config):
+        ...     return train_shards, validation_set
+
+        Shard a data set saved to one file per shard.
+
+        >>> ShardedDataset(paths, load_fn=lambda path: MyDataset(path))
+    """
+
+    def __init__(self, shards, load_fn=None):
+        """Creates a sharded data set.
+
+        Args:
+            shards (list): the shards, e.g. object IDs or file paths.
+            load_fn (shard -> Dataset): loads a shard on a replica. Defaults
+                to ray.get for object IDs and torch.load otherwise.
+        """
+        self.shards = list(shards)
+        self.load_fn = load_fn
+
+    @classmethod
+    def from_dataset(cls, dataset, num_shards):
+        """Splits a data set into shards that are put in the object store.
+
+        Args:
+            dataset (Dataset): the data set to split.
+            num_shards (int): the number of shards, which should be a
+                multiple of the number of replicas.
+        """
+        bounds = [len(dataset) * i // num_shards for i in range(num_shards)]
+        bounds.append(len(dataset))
+        shards = [
+            ray.put([dataset[i] for i in range(start, end)])
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        return cls(shards)
+
+    def __len__(self):
+        return len(self.shards)
+
+    def _load_shard(self, shard):
+        if self.load_fn is not None:
+            return self.load_fn(shard)
+        if isinstance(shard, ray.ObjectID):
+            return ray.get(shard)
+        return torch.load(shard)
+
+    def load(self, world_rank=0, world_size=1):
+        """Loads the shards of one replica.
+
+        Args:
+            world_rank (int): the index of the replica.
+            world_size (int): the total number of replicas.
+
+        Returns:
+            A Dataset of every world_size-th shard, starting at world_rank.
+        """
+        if len(self.shards) < world_size:
+            raise ValueError(
+                "Cannot split {} shards across {} replicas.".format(
+                    len(self.shards), world_size))
+        shards = self.shards[world_rank::world_size]
+        logger.debug("Loading {} of {} shards".format(
+            len(shards), len(self.shards)))
+        return torch.utils.data.ConcatDataset(
+            [self._load_shard(shard) for shard in shards])
+
+
+class PrefetchIterator(object):
+    """Loads the next batches of a data loader on a background thread.
+
+    The data loader's workers collate batches in parallel, but only start
+    loading once the training loop asks for the next batch. This keeps up
+    to num_batches batches ready, so that loading overlaps with the forward
+    and backward passes.
+    """
+
+    def __init__(self, loader, num_batches=2):
+        self.loader = loader
+        self.num_batches = num_batches
+
+    def __len__(self):
+        return len(self.loader)
+
+    def _put(self, batches, stopped, item):
+        # Time out regularly so that the thread exits if iteration stops.
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _fill(self, batches, stopped):
+        try:
+            for batch in self.loader:
+                if not self._put(batches, stopped, (batch, None)):
+                    return
+        except Exception as e:
+            self._put(batches, stopped, (None, e))
+            return
+        self._put(batches, stopped, (None, None))
+
+    def __iter__(self):
+        batches = queue.Queue(maxsize=self.num_batches)
+        stopped = threading.Event()
+        thread = threading.Thread(target=self._fill, args=(batches, stopped))
+        thread.daemon = True
+        thread.start()
+        try:
+            while True:
+                batch, error = batches.get()
+                if error is not None:
+                    raise error
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            stopped.set()
@@ -2,12 +2,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import datetime
 import logging
 import os
 import torch.distributed as dist
 import torch.utils.data
 
 from ray.experimental.sgd.pytorch.pytorch_runner import PyTorchRunner
+from ray.experimental.sgd.pytorch.data_pipeline import ShardedDataset
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +23,11 @@ class DistributedPyTorchRunner(PyTorchRunner):
                  optimizer_creator,
                  config=None,
                  batch_size=16,
-                 backend="gloo"):
+                 backend="gloo",
+                 num_data_workers=2,
+                 prefetch_batches=2,
+                 communication=None,
+                 timeout_s=None):
         """Initializes the runner.
 
         Args:
@@ -32,20 +38,36 @@ class DistributedPyTorchRunner(PyTorchRunner):
             config (dict):  see pytorch_trainer.py.
             batch_size (int): batch size used by one replica for an update.
             backend (string):  see pytorch_trainer.py.
+            num_data_workers (int): see pytorch_trainer.py.
+            prefetch_batches (int): see pytorch_trainer.py.
+            communication (CommunicationStrategy): see pytorch_trainer.py.
+            timeout_s (float): the timeout of collective operations.
+                Defaults to the timeout of distributed PyTorch.
         """
 
         super(DistributedPyTorchRunner, self).__init__(
-            model_creator, data_creator, optimizer_creator, config, batch_size)
+            model_creator, data_creator, optimizer_creator, config, batch_size,
+            num_data_workers, prefetch_batches)
         self.backend = backend
+        self.communication = communication
+        self.timeout_s = timeout_s
 
-    def setup(self, url, world_rank, world_size):
-        """Connects to the distributed PyTorch backend and initializes the model.
+    def setup(self, url, world_rank, world_size, batch_size=None):
+        """Connects to distributed PyTorch and initializes the model.
+
+        This may be called again to join a new process group, in which case
+        the model is initialized again.
 
         Args:
             url (str): the URL used to connect to distributed PyTorch.
             world_rank (int): the index of the runner.
             world_size (int): the total number of runners.
+            batch_size (int): if given, the new batch size of the runner.
         """
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if dist.is_initialized():
+            dist.destroy_process_group()
         self._setup_distributed_pytorch(url, world_rank, world_size)
         self._setup_training()
 
@@ -53,22 +75,30 @@ class DistributedPyTorchRunner(PyTorchRunner):
         os.environ["CUDA_LAUNCH_BLOCKING"] = "1"
         with self._timers["setup_proc"]:
             self.world_rank = world_rank
+            self.world_size = world_size
             logger.debug(
                 "Connecting to {} world_rank: {} world_size: {}".format(
                     url, world_rank, world_size))
             logger.debug("using {}".format(self.backend))
+            kwargs = {}
+            if self.timeout_s is not None:
+                kwargs["timeout"] = datetime.timedelta(seconds=self.timeout_s)
             dist.init_process_group(
                 backend=self.backend,
                 init_method=url,
                 rank=world_rank,
-                world_size=world_size)
+                world_size=world_size,
+                **kwargs)
 
     def _setup_training(self):
         logger.debug("Creating model")
         self.model = self.model_creator(self.config)
         if torch.cuda.is_available():
-            self.model = torch.nn.parallel.DistributedDataParallel(
-                self.model.cuda())
+            self.model = self.model.cuda()
+        if self.communication is not None:
+            self.communication.setup(self.model)
+        elif torch.cuda.is_available():
+            self.model = torch.nn.parallel.DistributedDataParallel(self.model)
         else:
             self.model = torch.nn.parallel.DistributedDataParallelCPU(
                 self.model)
@@ -81,40 +111,49 @@ class DistributedPyTorchRunner(PyTorchRunner):
 
         logger.debug("Creating dataset")
         self.training_set, self.validation_set = self.data_creator(self.config)
-
-        # TODO: make num_workers configurable
-        self.train_sampler = torch.utils.data.distributed.DistributedSampler(
-            self.training_set)
-        self.train_loader = torch.utils.data.DataLoader(
-            self.training_set,
-            batch_size=self.batch_size,
-            shuffle=(self.train_sampler is None),
-            num_workers=2,
-            pin_memory=False,
-            sampler=self.train_sampler)
-
-        self.validation_sampler = (
-            torch.utils.data.distributed.DistributedSampler(
-                self.validation_set))
-        self.validation_loader = torch.utils.data.DataLoader(
-            self.validation_set,
-            batch_size=self.batch_size,
-            shuffle=(self.validation_sampler is None),
-            num_workers=2,
-            pin_memory=False,
-            sampler=self.validation_sampler)
+        self.training_set, self.train_sampler = self._shard(self.training_set)
+        self.validation_set, self.validation_sampler = self._shard(
+            self.validation_set)
+        self.train_loader = self._create_loader(self.training_set,
+                                                self.train_sampler)
+        self.validation_loader = self._create_loader(self.validation_set,
+                                                     self.validation_sampler)
+
+    def _shard(self, dataset):
+        """Returns the part of the data set of this replica and its sampler.
+
+        A ShardedDataset is loaded shard by shard, and every replica is cut
+        to the size of the smallest one so that all replicas take the same
+        number of steps. Other data sets are loaded completely and sampled
+        with a DistributedSampler.
+        """
+        if not isinstance(dataset, ShardedDataset):
+            return dataset, torch.utils.data.distributed.DistributedSampler(
+                dataset)
+        dataset = dataset.load(self.world_rank, self.world_size)
+        size = torch.tensor([len(dataset)])
+        dist.all_reduce(size, op=dist.ReduceOp.MIN)
+        if size.item() < len(dataset):
+            dataset = torch.utils.data.Subset(dataset, range(size.item()))
+        return dataset, None
 
     def step(self):
         """Runs a training epoch and updates the model parameters."""
         logger.debug("Starting step")
-        self.train_sampler.set_epoch(self.epoch)
+        if self.train_sampler is not None:
+            self.train_sampler.set_epoch(self.epoch)
         return super(DistributedPyTorchRunner, self).step()
 
+    def _unwrapped_model(self):
+        if self.communication is not None:
+            return self.model
+        return self.model.module
+
     def get_state(self):
         """Returns the state of the runner."""
         return {
             "epoch": self.epoch,
-            "model": self.model.module.state_dict(),
+            "model": self._unwrapped_model().state_dict(),
             "optimizer": self.optimizer.state_dict(),
             "stats": self.stats()
         }
@@ -122,7 +161,7 @@ class DistributedPyTorchRunner(PyTorchRunner):
     def set_state(self, state):
         """Sets the state of the model."""
         # TODO: restore timer stats
-        self.model.module.load_state_dict(state["model"])
+        self._unwrapped_model().load_state_dict(state["model"])
         self.optimizer.load_state_dict(state["optimizer"])
         self.epoch = state["stats"]["epoch"]
 
@@ -8,6 +8,8 @@ import torch.utils.data
 
 import ray
 from ray.experimental.sgd.pytorch import pytorch_utils
+from ray.experimental.sgd.pytorch.data_pipeline import (ShardedDataset,
+                                                        PrefetchIterator)
 from ray.experimental.sgd import utils
 
 logger = logging.getLogger(__name__)
@@ -21,7 +23,9 @@ class PyTorchRunner(object):
                  data_creator,
                  optimizer_creator,
                  config=None,
-                 batch_size=16):
+                 batch_size=16,
+                 num_data_workers=2,
+                 prefetch_batches=2):
         """Initializes the runner.
 
         Args:
@@ -31,6 +35,8 @@ class PyTorchRunner(object):
                 see pytorch_trainer.py.
             config (dict): see pytorch_trainer.py.
             batch_size (int): see pytorch_trainer.py.
+            num_data_workers (int): see pytorch_trainer.py.
+            prefetch_batches (int): see pytorch_trainer.py.
         """
 
         self.model_creator = model_creator
@@ -38,6 +44,9 @@ class PyTorchRunner(object):
         self.optimizer_creator = optimizer_creator
         self.config = {} if config is None else config
         self.batch_size = batch_size
+        self.num_data_workers = num_data_workers
+        self.prefetch_batches = prefetch_batches
+        self.communication = None
         self.verbose = True
 
         self.epoch = 0
@@ -64,19 +73,25 @@ class PyTorchRunner(object):
 
         logger.debug("Creating dataset")
         self.training_set, self.validation_set = self.data_creator(self.config)
-        self.train_loader = torch.utils.data.DataLoader(
-            self.training_set,
+        if isinstance(self.training_set, ShardedDataset):
+            self.training_set = self.training_set.load()
+        if isinstance(self.validation_set, ShardedDataset):
+            self.validation_set = self.validation_set.load()
+        self.train_loader = self._create_loader(self.training_set)
+        self.validation_loader = self._create_loader(self.validation_set)
+
+    def _create_loader(self, dataset, sampler=None):
+        """Creates a data loader that prefetches batches of the data set."""
+        loader = torch.utils.data.DataLoader(
+            dataset,
             batch_size=self.batch_size,
-            shuffle=True,
-            num_workers=2,
-            pin_memory=False)
-
-        self.validation_loader = torch.utils.data.DataLoader(
-            self.validation_set,
-            batch_size=self.batch_size,
-            shuffle=True,
-            num_workers=2,
-            pin_memory=False)
+            shuffle=(sampler is None),
+            num_workers=self.num_data_workers,
+            pin_memory=torch.cuda.is_available(),
+            sampler=sampler)
+        if self.prefetch_batches > 0:
+            loader = PrefetchIterator(loader, self.prefetch_batches)
+        return loader
 
     def get_node_ip(self):
         """Returns the IP address of the current node."""
@@ -91,7 +106,8 @@ class PyTorchRunner(object):
         logger.debug("Begin Training Epoch {}".format(self.epoch + 1))
         with self._timers["training"]:
             train_stats = pytorch_utils.train(self.train_loader, self.model,
-                                              self.criterion, self.optimizer)
+                                              self.criterion, self.optimizer,
+                                              self.communication)
             train_stats["epoch"] = self.epoch
 
         self.epoch += 1
@@ -10,6 +10,7 @@ import logging
 
 import ray
 
+from ray.exceptions import RayActorError, RayTaskError
 from ray.tune import Trainable
 from ray.tune.resources import Resources
 from ray.experimental.sgd.pytorch.pytorch_runner import PyTorchRunner
@@ -36,14 +37,21 @@ class PyTorchTrainer(object):
                  num_replicas=1,
                  use_gpu=False,
                  batch_size=16,
-                 backend="auto"):
+                 backend="auto",
+                 num_data_workers=2,
+                 prefetch_batches=2,
+                 communication=None,
+                 elastic=False,
+                 elastic_timeout_s=None):
         """Sets up the PyTorch trainer.
 
         Args:
             model_creator (dict -> torch.nn.Module): creates the model
                 using the config.
             data_creator (dict -> Dataset, Dataset): creates the training
-                and validation data sets using the config.
+                and validation data sets using the config. Either may be a
+                ShardedDataset, in which case each replica only loads its
+                own shards.
             optimizer_creator (torch.nn.Module, dict -> loss, optimizer):
                 creates the loss and optimizer using the model and the config.
             config (dict): configuration passed to 'model_creator',
@@ -54,6 +62,30 @@ class PyTorchTrainer(object):
                 if true.
             batch_size (int): batch size for an update.
             backend (string): backend used by distributed PyTorch.
+            num_data_workers (int): the number of processes each replica
+                uses to load and collate batches.
+            prefetch_batches (int): the number of batches each replica loads
+                ahead on a background thread while training. Set to 0 to
+                only load batches when they are needed.
+            communication (CommunicationStrategy): how the replicas are kept
+                in sync, e.g. FP16AllReduce(), TopKAllReduce() or
+                LocalSGD(). Defaults to DistributedDataParallel. Ignored if
+                num_replicas is 1.
+            elastic (bool): whether to keep training if replicas fail. The
+                surviving replicas are restored from the state of one of
+                them and replaced with new replicas if there are enough
+                resources. At the start of each epoch, replicas are added
+                back up to num_replicas if resources became available. The
+                per-replica batch size is adjusted so that the total batch
+                size stays the same.
+            elastic_timeout_s (float): in elastic mode, the timeout of the
+                rendezvous and collective operations of the replicas. A
+                replica whose process exits is noticed right away, since its
+                connections close, so this only bounds how long the others
+                wait for a replica that hangs or becomes unreachable. It must
+                be longer than any skew between the replicas, e.g. in
+                starting up, loading data or finishing an epoch. Defaults to
+                the timeout of distributed PyTorch, 30 minutes.
         """
         # TODO: add support for mixed precision
         # TODO: add support for callbacks
@@ -73,25 +105,33 @@ class PyTorchTrainer(object):
 
         logger.info("Using {} as backend.".format(backend))
 
-        if num_replicas == 1:
+        self.data_creator = data_creator
+        self.optimizer_creator = optimizer_creator
+        self.num_replicas = num_replicas
+        self.use_gpu = use_gpu
+        self.batch_size = batch_size
+        self.backend = backend
+        self.num_data_workers = num_data_workers
+        self.prefetch_batches = prefetch_batches
+        self.communication = communication
+        self.elastic = elastic
+        self.elastic_timeout_s = elastic_timeout_s if elastic else None
+
+        if num_replicas == 1 and not elastic:
             # Generate actor class
             Runner = ray.remote(
                 num_cpus=1, num_gpus=int(use_gpu))(PyTorchRunner)
             # Start workers
             self.workers = [
                 Runner.remote(model_creator, data_creator, optimizer_creator,
-                              self.config, batch_size)
+                              self.config, batch_size, num_data_workers,
+                              prefetch_batches)
             ]
             # Get setup tasks in order to throw errors on failure
             ray.get(self.workers[0].setup.remote())
         else:
-            # Geneate actor class
-            Runner = ray.remote(
-                num_cpus=1, num_gpus=int(use_gpu))(DistributedPyTorchRunner)
-            # Compute batch size per replica
-            batch_size_per_replica = batch_size // num_replicas
             if batch_size % num_replicas > 0:
-                new_batch_size = batch_size_per_replica * num_replicas
+                new_batch_size = (batch_size // num_replicas) * num_replicas
                 logger.warning(
                     ("Changing batch size from {old_batch_size} to "
                      "{new_batch_size} to evenly distribute batches across "
@@ -99,35 +139,115 @@ class PyTorchTrainer(object):
                          old_batch_size=batch_size,
                          new_batch_size=new_batch_size,
                          num_replicas=num_replicas))
-            # Start workers
-            self.workers = [
-                Runner.remote(model_creator, data_creator, optimizer_creator,
-                              self.config, batch_size_per_replica, backend)
-                for i in range(num_replicas)
-            ]
-            # Compute URL for initializing distributed PyTorch
-            ip = ray.get(self.workers[0].get_node_ip.remote())
-            port = ray.get(self.workers[0].find_free_port.remote())
-            address = "tcp://{ip}:{port}".format(ip=ip, port=port)
-            # Get setup tasks in order to throw errors on failure
-            ray.get([
-                worker.setup.remote(address, i, len(self.workers))
-                for i, worker in enumerate(self.workers)
-            ])
+            self.workers = self._start_workers(num_replicas)
+            self._setup_workers()
+
+    def _start_workers(self, num_workers):
+        """Starts distributed runners without setting them up."""
+        # Geneate actor class
+        Runner = ray.remote(
+            num_cpus=1, num_gpus=int(self.use_gpu))(DistributedPyTorchRunner)
+        # The batch size of each replica is set in _setup_workers.
+        return [
+            Runner.remote(self.model_creator, self.data_creator,
+                          self.optimizer_creator, self.config, 1, self.backend,
+                          self.num_data_workers, self.prefetch_batches,
+                          self.communication, self.elastic_timeout_s)
+            for _ in range(num_workers)
+        ]
+
+    def _setup_workers(self, state_id=None):
+        """Forms the process group of the current workers.
+
+        Args:
+            state_id (ObjectID): if given, the state to restore all workers
+                to after the setup.
+        """
+        # Compute batch size per replica
+        batch_size_per_replica = max(1, self.batch_size // len(self.workers))
+        # Compute URL for initializing distributed PyTorch
+        ip = ray.get(self.workers[0].get_node_ip.remote())
+        port = ray.get(self.workers[0].find_free_port.remote())
+        address = "tcp://{ip}:{port}".format(ip=ip, port=port)
+        # Get setup tasks in order to throw errors on failure
+        ray.get([
+            worker.setup.remote(address, i, len(self.workers),
+                                batch_size_per_replica)
+            for i, worker in enumerate(self.workers)
+        ])
+        if state_id is not None:
+            ray.get(
+                [worker.set_state.remote(state_id) for worker in self.workers])
+
+    def _num_startable_workers(self):
+        """Returns the number of replicas that fit in the free resources."""
+        resources = ray.available_resources()
+        num_workers = int(resources.get("CPU", 0))
+        if self.use_gpu:
+            num_workers = min(num_workers, int(resources.get("GPU", 0)))
+        return num_workers
+
+    def _resize(self, live_workers):
+        """Restores training on the live workers, adding new ones if possible.
+
+        The state is copied from a live worker through the object store, so
+        training continues from the parameters at the failed step.
+        """
+        num_new = min(self.num_replicas - len(live_workers),
+                      self._num_startable_workers())
+        state_id = live_workers[0].get_state.remote()
+        self.workers = live_workers + self._start_workers(max(0, num_new))
+        logger.warning("Resizing training from {} to {} replicas.".format(
+            len(live_workers), len(self.workers)))
+        self._setup_workers(state_id)
+
+    def _live_workers(self):
+        live_workers = []
+        for worker in self.workers:
+            try:
+                ray.get(worker.get_node_ip.remote())
+                live_workers.append(worker)
+            except RayActorError:
+                pass
+        return live_workers
+
+    def _call_workers(self, method):
+        """Calls a method on all workers, recovering from failures if elastic.
+        """
+        if not self.elastic:
+            return ray.get([getattr(w, method).remote() for w in self.workers])
+        while True:
+            try:
+                return ray.get(
+                    [getattr(w, method).remote() for w in self.workers])
+            except (RayActorError, RayTaskError) as e:
+                live_workers = self._live_workers()
+                # Errors that were not caused by a failed replica, e.g. in
+                # the training code, would only happen again.
+                if (not live_workers
+                        or len(live_workers) == len(self.workers)):
+                    raise
+                logger.warning("{} of {} replicas failed: {}".format(
+                    len(self.workers) - len(live_workers), len(self.workers),
+                    e))
+                self._resize(live_workers)
 
     def train(self):
         """Runs a training epoch."""
+        if (self.elastic and len(self.workers) < self.num_replicas
+                and self._num_startable_workers() > 0):
+            self._resize(self.workers)
         with self.optimizer_timer:
-            worker_stats = ray.get([w.step.remote() for w in self.workers])
+            worker_stats = self._call_workers("step")
 
         train_stats = worker_stats[0].copy()
-        train_stats["train_loss"] = np.mean(
-            [s["train_loss"] for s in worker_stats])
+        for stat in ["train_loss", "data_time", "stall_fraction"]:
+            train_stats[stat] = np.mean([s[stat] for s in worker_stats])
         return train_stats
 
     def validate(self):
         """Evaluates the model on the validation data set."""
-        worker_stats = ray.get([w.validate.remote() for w in self.workers])
+        worker_stats = self._call_workers("validate")
         validation_stats = worker_stats[0].copy()
         validation_stats["validation_loss"] = np.mean(
             [s["validation_loss"] for s in worker_stats])
@@ -187,7 +307,11 @@ class PyTorchTrainable(Trainable):
             num_replicas=config["num_replicas"],
             use_gpu=config["use_gpu"],
             batch_size=config["batch_size"],
-            backend=config["backend"])
+            backend=config["backend"],
+            num_data_workers=config.get("num_data_workers", 2),
+            prefetch_batches=config.get("prefetch_batches", 2),
+            communication=config.get("communication"),
+            elastic=config.get("elastic", False))
 
     def _train(self):
 
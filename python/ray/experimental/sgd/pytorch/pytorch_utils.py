@@ -9,8 +9,15 @@ import torch.nn as nn
 from ray.experimental.sgd import utils
 
 
-def train(train_iterator, model, criterion, optimizer):
-    """Runs 1 training epoch"""
+def train(train_iterator, model, criterion, optimizer, communication=None):
+    """Runs 1 training epoch.
+
+    If a CommunicationStrategy is given, its hooks are called to keep the
+    model replicas in sync.
+
+    The returned data_time is the mean time per step spent waiting for the
+    next batch, and stall_fraction the fraction of the epoch spent waiting.
+    """
     batch_time = utils.AverageMeter()
     data_time = utils.AverageMeter()
     losses = utils.AverageMeter()
@@ -44,20 +51,28 @@ def train(train_iterator, model, criterion, optimizer):
             # compute gradients in a backward pass
             optimizer.zero_grad()
             loss.backward()
+            if communication is not None:
+                communication.after_backward(model)
 
         with timers["apply"]:
             # Call step of optimizer to update model params
             optimizer.step()
+            if communication is not None:
+                communication.after_step(model)
 
         # measure elapsed time
         batch_time.update(time.time() - end)
         end = time.time()
 
+    if communication is not None:
+        communication.after_epoch(model)
+
     stats = {
         "batch_time": batch_time.avg,
         "batch_processed": losses.count,
         "train_loss": losses.avg,
         "data_time": data_time.avg,
+        "stall_fraction": data_time.sum / max(batch_time.sum, 1e-9),
     }
     stats.update({k: t.mean for k, t in timers.items()})
     return stats
@@ -5,15 +5,20 @@ from __future__ import print_function
 import os
 import pytest
 import tempfile
+import time
 import torch
 import torch.distributed as dist
 
+import ray
 from ray import tune
 from ray.tests.conftest import ray_start_2_cpus  # noqa: F401
-from ray.experimental.sgd.pytorch import PyTorchTrainer, PyTorchTrainable
+from ray.experimental.sgd.pytorch import (
+    PyTorchTrainer, PyTorchTrainable, FP16AllReduce, TopKAllReduce, LocalSGD)
+from ray.experimental.sgd.pytorch.data_pipeline import (ShardedDataset,
+                                                        PrefetchIterator)
 
 from ray.experimental.sgd.examples.train_example import (
-    model_creator, optimizer_creator, data_creator)
+    model_creator, optimizer_creator, data_creator, LinearDataset)
 
 
 @pytest.mark.parametrize(  # noqa: F811
@@ -37,6 +42,132 @@ def test_train(ray_start_2_cpus, num_replicas):  # noqa: F811
     assert validation_loss2 <= validation_loss1
 
 
+@pytest.mark.parametrize(  # noqa: F811
+    "num_replicas", [1, 2] if dist.is_available() else [1])
+def test_train_sharded(ray_start_2_cpus, num_replicas):  # noqa: F811
+    train_shards = ShardedDataset.from_dataset(LinearDataset(2, 5), 5)
+    validation_shards = ShardedDataset.from_dataset(
+        LinearDataset(2, 5, size=400), 2)
+    assert len(train_shards) == 5
+    assert len(train_shards.load()) == 1000
+    assert len(train_shards.load(1, 2)) == 400
+
+    def sharded_data_creator(config):
+        return train_shards, validation_shards
+
+    trainer = PyTorchTrainer(
+        model_creator,
+        sharded_data_creator,
+        optimizer_creator,
+        num_replicas=num_replicas)
+    stats1 = trainer.train()
+    validation_loss1 = trainer.validate()["validation_loss"]
+    stats2 = trainer.train()
+    validation_loss2 = trainer.validate()["validation_loss"]
+
+    assert 0 <= stats1["stall_fraction"] <= 1
+    assert stats2["train_loss"] <= stats1["train_loss"]
+    assert validation_loss2 <= validation_loss1
+
+
+@pytest.mark.skipif(  # noqa: F811
+    not dist.is_available(), reason="needs distributed PyTorch")
+@pytest.mark.parametrize(
+    "communication", [
+        FP16AllReduce(bucket_size_mb=1e-6),
+        TopKAllReduce(ratio=0.5),
+        LocalSGD(sync_period=3)
+    ])
+def test_train_communication(ray_start_2_cpus, communication):  # noqa: F811
+    trainer = PyTorchTrainer(
+        model_creator,
+        data_creator,
+        optimizer_creator,
+        num_replicas=2,
+        communication=communication)
+    train_loss1 = trainer.train()["train_loss"]
+    validation_loss1 = trainer.validate()["validation_loss"]
+    train_loss2 = trainer.train()["train_loss"]
+    validation_loss2 = trainer.validate()["validation_loss"]
+
+    assert train_loss2 <= train_loss1
+    assert validation_loss2 <= validation_loss1
+
+    # The replicas are in sync at the end of each epoch.
+    states = ray.get([w.get_state.remote() for w in trainer.workers])
+    for k in states[0]["model"]:
+        assert torch.allclose(states[0]["model"][k], states[1]["model"][k])
+
+
+@pytest.mark.skipif(  # noqa: F811
+    not dist.is_available(), reason="needs distributed PyTorch")
+def test_train_elastic(ray_start_2_cpus):  # noqa: F811
+    trainer = PyTorchTrainer(
+        model_creator,
+        data_creator,
+        optimizer_creator,
+        num_replicas=2,
+        batch_size=32,
+        elastic=True)
+    train_loss1 = trainer.train()["train_loss"]
+    failed_worker = trainer.workers[1]
+    failed_worker.__ray_terminate__.remote()
+    with pytest.raises(ray.exceptions.RayActorError):
+        ray.get(failed_worker.get_node_ip.remote())
+
+    # The failed replica is replaced and training continues.
+    train_loss2 = trainer.train()["train_loss"]
+    assert len(trainer.workers) == 2
+    assert failed_worker not in trainer.workers
+    assert train_loss2 <= train_loss1
+    states = ray.get([w.get_state.remote() for w in trainer.workers])
+    assert states[0]["epoch"] == states[1]["epoch"] == 2
+
+
+class _SlowLoss(torch.nn.MSELoss):
+    """Delays the first step of the replica with rank 1."""
+
+    def forward(self, *args):
+        if dist.get_rank() == 1 and not getattr(self, "delayed", False):
+            self.delayed = True
+            time.sleep(15)
+        return super(_SlowLoss, self).forward(*args)
+
+
+def slow_optimizer_creator(model, config):
+    _, optimizer = optimizer_creator(model, config)
+    return _SlowLoss(), optimizer
+
+
+@pytest.mark.skipif(  # noqa: F811
+    not dist.is_available(), reason="needs distributed PyTorch")
+def test_train_elastic_slow_replica(ray_start_2_cpus):  # noqa: F811
+    trainer = PyTorchTrainer(
+        model_creator,
+        data_creator,
+        slow_optimizer_creator,
+        num_replicas=2,
+        batch_size=32,
+        elastic=True)
+    workers = list(trainer.workers)
+    # Replicas that are alive are waited for, however slow they are.
+    trainer.train()
+    assert trainer.workers == workers
+    states = ray.get([w.get_state.remote() for w in trainer.workers])
+    assert states[0]["epoch"] == states[1]["epoch"] == 1
+
+
+def test_prefetch_iterator():
+    assert list(PrefetchIterator(range(10), num_batches=2)) == list(range(10))
+
+    def fail():
+        yield 1
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        list(PrefetchIterator(fail()))
+
+
 @pytest.mark.parametrize(  # noqa: F811
     "num_replicas", [1, 2] if dist.is_available() else [1])
 def test_tune_train(ray_start_2_cpus, num_replicas):  # noqa: F811
@@ -42,6 +42,38 @@ def test_simple(init):
     assert result["key1"] == ["value"]
 
 
+def test_await_object_id(init):
+    @ray.remote
+    def f(n):
+        time.sleep(0.01 * (n % 10))
+        return n
+
+    async def g(object_id):
+        return await object_id
+
+    loop = asyncio.get_event_loop()
+    object_ids = [f.remote(i) for i in range(2000)]
+    # Await every object twice to share the pending futures of an object.
+    coros = [g(object_id) for object_id in object_ids + object_ids]
+    results = loop.run_until_complete(asyncio.gather(*coros))
+    assert results == list(range(2000)) * 2
+    assert not async_api.handler._waiting_dict
+
+
+def test_cancel(init):
+    @ray.remote
+    def f():
+        time.sleep(1)
+        return 1
+
+    loop = asyncio.get_event_loop()
+    object_id = f.remote()
+    futures = [async_api.as_future(object_id) for _ in range(2)]
+    futures[0].cancel()
+    assert loop.run_until_complete(futures[1]) == 1
+    assert not async_api.handler._waiting_dict
+
+
 def test_gather(init):
     loop = asyncio.get_event_loop()
     tasks = gen_tasks()
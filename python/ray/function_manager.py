@@ -14,6 +14,7 @@ import traceback
 from collections import (
     namedtuple,
     defaultdict,
+    OrderedDict,
 )
 
 import ray
@@ -282,6 +283,11 @@ class FunctionActorManager(object):
             execution times.
         imported_actor_classes: The set of actor classes keys (format:
             ActorClass:function_id) that are already in GCS.
+        lazy_import: Whether remote functions and actor classes are fetched
+            from GCS when they are first needed instead of being imported by
+            the import thread.
+        _cached_functions: The remote functions imported lazily, ordered
+            from least to most recently used.
     """
 
     def __init__(self, worker):
@@ -300,6 +306,8 @@ class FunctionActorManager(object):
         # these types.
         self.imported_actor_classes = set()
         self._loaded_actor_classes = {}
+        self.lazy_import = ray_constants.LAZY_FUNCTION_IMPORT
+        self._cached_functions = OrderedDict()
         self.lock = threading.Lock()
 
     def increase_task_counter(self, job_id, function_descriptor):
@@ -402,7 +410,9 @@ class FunctionActorManager(object):
                     function=f,
                     function_name=function_name,
                     max_calls=max_calls))
-            self._num_task_executions[job_id][function_id] = 0
+            # Keep the counter if the function was evicted from the cache
+            # and is being imported again.
+            self._num_task_executions[job_id].setdefault(function_id, 0)
 
             try:
                 function = pickle.loads(serialized_function)
@@ -462,6 +472,8 @@ class FunctionActorManager(object):
             # the function from GCS.
             with profiling.profile("wait_for_function"):
                 self._wait_for_function(function_descriptor, job_id)
+            if self.lazy_import and self._worker.actor_id.is_nil():
+                self._mark_function_used(job_id, function_descriptor)
         try:
             function_id = function_descriptor.function_id
             info = self._function_execution_info[job_id][function_id]
@@ -499,12 +511,31 @@ class FunctionActorManager(object):
                 "Function {} failed to be loaded from local code.".format(
                     function_descriptor))
 
+    def _mark_function_used(self, job_id, function_descriptor):
+        """Move a lazily imported function to the end of the LRU order.
+
+        Functions beyond ray_constants.FUNCTION_CACHE_SIZE are evicted,
+        starting with the least recently used one. They will be imported
+        again if they are needed later.
+        """
+        key = (job_id, function_descriptor.function_id)
+        self._cached_functions.pop(key, None)
+        self._cached_functions[key] = True
+        while len(self._cached_functions) > ray_constants.FUNCTION_CACHE_SIZE:
+            (evicted_job_id, evicted_function_id), _ = (
+                self._cached_functions.popitem(last=False))
+            with self.lock:
+                self._function_execution_info[evicted_job_id].pop(
+                    evicted_function_id, None)
+
     def _wait_for_function(self, function_descriptor, job_id, timeout=10):
         """Wait until the function to be executed is present on this worker.
 
         This method will simply loop until the import thread has imported the
-        relevant function. If we spend too long in this loop, that may indicate
-        a problem somewhere and we will push an error message to the user.
+        relevant function. If lazy_import is set, the function is fetched
+        from GCS directly instead. If we spend too long in this loop, that may
+        indicate a problem somewhere and we will push an error message to the
+        user.
 
         If this worker is an actor, then this will wait until the actor has
         been defined.
@@ -527,6 +558,13 @@ class FunctionActorManager(object):
                 elif not self._worker.actor_id.is_nil() and (
                         self._worker.actor_id in self._worker.actors):
                     break
+            if self.lazy_import and self._worker.actor_id.is_nil():
+                key = (b"RemoteFunction:" + job_id.binary() + b":" +
+                       function_descriptor.function_id.binary())
+                if self._worker.redis_client.exists(key):
+                    with profiling.profile("register_remote_function"):
+                        self.fetch_and_register_remote_function(key)
+                    continue
             if time.time() - start_time > timeout:
                 warning_message = ("This worker was asked to execute a "
                                    "function that it does not have "
@@ -689,11 +727,16 @@ class FunctionActorManager(object):
         key = (b"ActorClass:" + job_id.binary() + b":" +
                function_descriptor.function_id.binary())
         # Wait for the actor class key to have been imported by the
-        # import thread. TODO(rkn): It shouldn't be possible to end
+        # import thread, or to be in GCS if the import thread skips actor
+        # classes. TODO(rkn): It shouldn't be possible to end
         # up in an infinite loop here, but we should push an error to
         # the driver if too much time is spent here.
-        while key not in self.imported_actor_classes:
-            time.sleep(0.001)
+        if self.lazy_import:
+            while not self._worker.redis_client.exists(key):
+                time.sleep(0.001)
+        else:
+            while key not in self.imported_actor_classes:
+                time.sleep(0.001)
 
         # Fetch raw data from GCS.
         (job_id_str, class_name, module, pickled_class,
@@ -800,6 +843,9 @@ class FunctionActorManager(object):
                         self._save_and_log_checkpoint(actor)
                 return method_returns
 
+        # Copy the annotations that are read when executing the method.
+        actor_method_executor.__ray_cache_arguments__ = getattr(
+            method, "__ray_cache_arguments__", False)
         return actor_method_executor
 
     def _save_and_log_checkpoint(self, actor):
@@ -60,6 +60,11 @@ TablePrefix_ERROR_INFO_string = "ERROR_INFO"
 TablePrefix_PROFILE_string = "PROFILE"
 TablePrefix_JOB_string = "JOB"
 
+# This must be kept up-to-date with kJobIndexPrefix in ray_redis_module.cc.
+# The set at JOB_INDEX:<job_id> on each shard holds the keys of the task and
+# object table entries of the job that are stored on that shard.
+JOB_INDEX_PREFIX = b"JOB_INDEX:"
+
 
 def construct_error_message(job_id, error_type, message, timestamp):
     """Construct a serialized ErrorTableData object.
@@ -102,6 +102,12 @@ class ImportThread(object):
             # the driver should import.
             return
 
+        if (self.worker.function_actor_manager.lazy_import
+                and not key.startswith(b"FunctionsToRun")):
+            # Remote functions and actor classes are fetched by the
+            # FunctionActorManager when they are first used.
+            return
+
         if key.startswith(b"RemoteFunction"):
             with profiling.profile("register_remote_function"):
                 (self.worker.function_actor_manager.
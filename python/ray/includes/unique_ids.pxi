@@ -160,6 +160,11 @@ cdef class ObjectID(BaseID):
     def get_buffer_ref(self):
         return self.buffer_ref
 
+    def __await__(self):
+        # Imported here since asyncio is only available on Python 3.
+        from ray.experimental.async_api import as_future
+        return as_future(self).__await__()
+
     cdef size_t hash(self):
         return self.data.Hash()
 
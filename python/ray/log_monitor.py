@@ -3,12 +3,16 @@ from __future__ import division
 from __future__ import print_function
 
 import argparse
+import ctypes
+import ctypes.util
 import errno
 import glob
 import json
 import logging
 import os
+import select
 import shutil
+import sys
 import time
 import traceback
 
@@ -35,6 +39,67 @@ class LogFileInfo(object):
         self.file_position = file_position
         self.file_handle = file_handle
         self.worker_pid = None
+        # The start of the current rate limiting window, and the number of
+        # lines published and dropped in it.
+        self.window_start = 0
+        self.window_num_lines = 0
+        self.window_num_dropped = 0
+
+
+class InotifyWatcher(object):
+    """Waits for changes in a directory using inotify.
+
+    This is only available on Linux. Only the fact that something in the
+    directory changed is reported, not which file.
+    """
+
+    IN_MODIFY = 0x2
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, path.encode("utf-8"), mask) < 0:
+            errno_value = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno_value, "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        """Wait until something in the directory changes.
+
+        Returns:
+            True if there was a change and False if the timeout expired.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # Drain all pending events.
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    break
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+        return True
+
+
+def create_watcher(path):
+    """Create an InotifyWatcher, or return None if it's not available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatcher(path)
+    except (AttributeError, OSError) as e:
+        logger.warning("Failed to watch {} with inotify, falling back to "
+                       "polling: {}".format(path, e))
+        return None
 
 
 class LogMonitor(object):
@@ -44,7 +109,8 @@ class LogMonitor(object):
     can't simply leave all files open because we'll run out of file
     descriptors.
 
-    The "run" method of this class will cycle between doing several things:
+    The "run" method of this class will cycle between doing several things,
+    waiting for changes in the log directory whenever nothing was published:
     1. First, it will check if any new files have appeared in the log
        directory. If so, they will be added to the list of closed files.
     2. Then, if we are unable to open any new files, we will close all of the
@@ -53,7 +119,8 @@ class LogMonitor(object):
        lines (judged by an increase in file size since the last time the file
        was opened).
     4. Then we will loop through the open files and see if there are any new
-       lines in the file. If so, we will publish them to Redis.
+       lines in the file. If so, we will publish them to Redis, in a single
+       message for all files.
 
     Attributes:
         host (str): The hostname of this machine. Used to improve the log
@@ -67,6 +134,8 @@ class LogMonitor(object):
             files.
         can_open_more_files (bool): True if we can still open more files and
             false otherwise.
+        watcher (InotifyWatcher): Used to wait for changes in the log
+            directory, or None if inotify is not available.
     """
 
     def __init__(self, logs_dir, redis_address, redis_password=None):
@@ -79,6 +148,7 @@ class LogMonitor(object):
         self.open_file_infos = []
         self.closed_file_infos = []
         self.can_open_more_files = True
+        self.watcher = create_watcher(logs_dir)
 
     def close_all_files(self):
         """Close all open files (so that we can open more)."""
@@ -176,7 +246,7 @@ class LogMonitor(object):
                         raise e
 
                 f.seek(file_info.file_position)
-                file_info.filesize_when_last_opened = file_size
+                file_info.size_when_last_opened = file_size
                 file_info.file_handle = f
                 self.open_file_infos.append(file_info)
             else:
@@ -185,38 +255,84 @@ class LogMonitor(object):
         # Add the files with no changes back to the list of closed files.
         self.closed_file_infos += files_with_no_updates
 
+    def read_new_lines(self, file_info):
+        """Read the lines that were added to an open file since the last call.
+
+        Everything that is available is read at once, up to
+        LOG_MONITOR_MAX_READ_BYTES.
+        """
+        max_bytes = ray_constants.LOG_MONITOR_MAX_READ_BYTES
+        try:
+            data = file_info.file_handle.read(max_bytes)
+        except Exception:
+            logger.error("Error: Reading file: {}, position: {} "
+                         "failed.".format(file_info.filename,
+                                          file_info.file_position))
+            raise
+        if not data:
+            return []
+        if len(data) == max_bytes:
+            # Leave the last partial line for the next read, unless a single
+            # line fills the whole chunk.
+            end = data.rfind(b"\n") + 1
+            if end > 0 and end < len(data):
+                data = data[:end]
+                file_info.file_handle.seek(file_info.file_position + end)
+        file_info.file_position += len(data)
+
+        # Replace any characters not in UTF-8 with
+        # a replacement character, see
+        # https://stackoverflow.com/a/38565489/10891801
+        lines = data.decode("utf-8", "replace").split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        return lines
+
+    def limit_lines(self, file_info, lines, now):
+        """Apply the optional rate limit and line length limit."""
+        max_length = ray_constants.LOG_MONITOR_MAX_LINE_LENGTH
+        if max_length > 0:
+            lines = [
+                line if len(line) <= max_length else
+                line[:max_length] + "... (line truncated)" for line in lines
+            ]
+
+        max_lines = ray_constants.LOG_MONITOR_MAX_LINES_PER_SECOND
+        if max_lines <= 0:
+            return lines
+        notice = []
+        if now - file_info.window_start >= 1:
+            if file_info.window_num_dropped > 0:
+                notice = [
+                    "... ({} lines dropped, more than {} lines per "
+                    "second)".format(file_info.window_num_dropped, max_lines)
+                ]
+            file_info.window_start = now
+            file_info.window_num_lines = 0
+            file_info.window_num_dropped = 0
+        num_allowed = max(0, max_lines - file_info.window_num_lines)
+        file_info.window_num_lines += min(len(lines), num_allowed)
+        file_info.window_num_dropped += max(0, len(lines) - num_allowed)
+        return notice + lines[:num_allowed]
+
     def check_log_files_and_publish_updates(self):
         """Get any changes to the log files and push updates to Redis.
 
+        The updates of all files are published in a single message, which is
+        a list of {"ip", "pid", "lines"} dicts.
+
         Returns:
             True if anything was published and false otherwise.
         """
-        anything_published = False
+        now = time.time()
+        updates = []
         for file_info in self.open_file_infos:
             assert not file_info.file_handle.closed
 
-            lines_to_publish = []
-            max_num_lines_to_read = 100
-            for _ in range(max_num_lines_to_read):
-                try:
-                    next_line = file_info.file_handle.readline()
-                    # Replace any characters not in UTF-8 with
-                    # a replacement character, see
-                    # https://stackoverflow.com/a/38565489/10891801
-                    next_line = next_line.decode("utf-8", "replace")
-                    if next_line == "":
-                        break
-                    if next_line[-1] == "\n":
-                        next_line = next_line[:-1]
-                    lines_to_publish.append(next_line)
-                except Exception:
-                    logger.error("Error: Reading file: {}, position: {} "
-                                 "failed.".format(
-                                     file_info.full_path,
-                                     file_info.file_info.file_handle.tell()))
-                    raise
-
-            if file_info.file_position == 0:
+            at_start = file_info.file_position == 0
+            lines_to_publish = self.read_new_lines(file_info)
+
+            if at_start:
                 if (len(lines_to_publish) > 0 and
                         lines_to_publish[0].startswith("Ray worker pid: ")):
                     file_info.worker_pid = int(
@@ -225,35 +341,42 @@ class LogMonitor(object):
                 elif "/raylet" in file_info.filename:
                     file_info.worker_pid = "raylet"
 
-            # Record the current position in the file.
-            file_info.file_position = file_info.file_handle.tell()
-
+            lines_to_publish = self.limit_lines(file_info, lines_to_publish,
+                                                now)
             if len(lines_to_publish) > 0:
-                self.redis_client.publish(
-                    ray.gcs_utils.LOG_FILE_CHANNEL,
-                    json.dumps({
-                        "ip": self.ip,
-                        "pid": file_info.worker_pid,
-                        "lines": lines_to_publish
-                    }))
-                anything_published = True
+                updates.append({
+                    "ip": self.ip,
+                    "pid": file_info.worker_pid,
+                    "lines": lines_to_publish
+                })
 
-        return anything_published
+        if len(updates) > 0:
+            self.redis_client.publish(ray.gcs_utils.LOG_FILE_CHANNEL,
+                                      json.dumps(updates))
+        return len(updates) > 0
 
     def run(self):
         """Run the log monitor.
 
-        This will query Redis once every second to check if there are new log
-        files to monitor. It will also store those log files in Redis.
+        This will check for new log files and new lines in them, and publish
+        the new lines to Redis at most once every
+        LOG_MONITOR_PUBLISH_INTERVAL_S. If nothing was published, it waits for
+        changes in the log directory before checking again.
         """
         while True:
+            start_time = time.time()
             self.update_log_filenames()
             self.open_closed_files()
             anything_published = self.check_log_files_and_publish_updates()
-            # If nothing was published, then wait a little bit before checking
+            # If nothing was published, then wait for changes before checking
             # for logs to avoid using too much CPU.
-            if not anything_published:
-                time.sleep(0.05)
+            if not anything_published and self.watcher is not None:
+                self.watcher.wait(ray_constants.LOG_MONITOR_IDLE_TIMEOUT_S)
+            # Batch the output that arrives in the meantime.
+            remaining = (ray_constants.LOG_MONITOR_PUBLISH_INTERVAL_S -
+                         (time.time() - start_time))
+            if remaining > 0:
+                time.sleep(remaining)
 
 
 if __name__ == "__main__":
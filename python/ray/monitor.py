@@ -15,10 +15,10 @@ import ray
 from ray.autoscaler.autoscaler import LoadMetrics, StandardAutoscaler
 import ray.cloudpickle as pickle
 import ray.gcs_utils
+import ray.object_store_profiler as object_store_profiler
 import ray.utils
 import ray.ray_constants as ray_constants
-from ray.utils import (binary_to_hex, binary_to_object_id, binary_to_task_id,
-                       hex_to_binary, setup_logger)
+from ray.utils import binary_to_hex, setup_logger
 
 logger = logging.getLogger(__name__)
 
@@ -135,69 +135,44 @@ class Monitor(object):
         """Remove this job's object/task entries from redis.
 
         Removes control-state entries of all tasks and task return
-        objects belonging to the driver.
+        objects belonging to the driver. The keys of these entries are
+        tracked per job and shard by the Redis module as they are written,
+        so this reads one index set per shard instead of scanning the
+        tables. The object store profile of the job is removed as well.
 
         Args:
             job_id: The job id.
         """
-
-        xray_task_table_prefix = (
-            ray.gcs_utils.TablePrefix_RAYLET_TASK_string.encode("ascii"))
-        xray_object_table_prefix = (
-            ray.gcs_utils.TablePrefix_OBJECT_string.encode("ascii"))
-
-        task_table_objects = ray.tasks()
-        job_id_hex = binary_to_hex(job_id)
-        job_task_id_bins = set()
-        for task_id_hex, task_info in task_table_objects.items():
-            task_table_object = task_info["TaskSpec"]
-            task_job_id_hex = task_table_object["JobID"]
-            if job_id_hex != task_job_id_hex:
-                # Ignore tasks that aren't from this driver.
-                continue
-            job_task_id_bins.add(hex_to_binary(task_id_hex))
-
-        # Get objects associated with the driver.
-        object_table_objects = ray.objects()
-        job_object_id_bins = set()
-        for object_id, _ in object_table_objects.items():
-            task_id_bin = ray._raylet.compute_task_id(object_id).binary()
-            if task_id_bin in job_task_id_bins:
-                job_object_id_bins.add(object_id.binary())
-
-        def to_shard_index(id_bin):
-            if len(id_bin) == ray.TaskID.size():
-                return binary_to_task_id(id_bin).redis_shard_hash() % len(
-                    ray.state.state.redis_clients)
-            else:
-                return binary_to_object_id(id_bin).redis_shard_hash() % len(
-                    ray.state.state.redis_clients)
-
-        # Form the redis keys to delete.
-        sharded_keys = [[] for _ in range(len(ray.state.state.redis_clients))]
-        for task_id_bin in job_task_id_bins:
-            sharded_keys[to_shard_index(task_id_bin)].append(
-                xray_task_table_prefix + task_id_bin)
-        for object_id_bin in job_object_id_bins:
-            sharded_keys[to_shard_index(object_id_bin)].append(
-                xray_object_table_prefix + object_id_bin)
-
-        # Remove with best effort.
-        for shard_index in range(len(sharded_keys)):
-            keys = sharded_keys[shard_index]
+        start_time = time.time()
+        index_key = ray.gcs_utils.JOB_INDEX_PREFIX + job_id
+        batch_size = ray_constants.MONITOR_CLEANUP_BATCH_SIZE
+        num_indexed = 0
+        num_deleted = 0
+        for shard_index, redis_client in enumerate(
+                ray.state.state.redis_clients):
+            keys = list(redis_client.smembers(index_key))
             if len(keys) == 0:
                 continue
-            redis = ray.state.state.redis_clients[shard_index]
-            num_deleted = redis.delete(*keys)
-            logger.info("Monitor: "
-                        "Removed {} dead redis entries of the "
-                        "driver from redis shard {}.".format(
-                            num_deleted, shard_index))
-            if num_deleted != len(keys):
-                logger.warning("Monitor: "
-                               "Failed to remove {} relevant redis "
-                               "entries from redis shard {}.".format(
-                                   len(keys) - num_deleted, shard_index))
+            # Remove with best effort. Entries that were already deleted,
+            # e.g. by the raylets, are skipped.
+            pipeline = redis_client.pipeline(transaction=False)
+            for i in range(0, len(keys), batch_size):
+                pipeline.delete(*keys[i:i + batch_size])
+            pipeline.delete(index_key)
+            shard_deleted = sum(pipeline.execute()[:-1])
+            logger.debug("Monitor: "
+                         "Removed {} of {} indexed redis entries of the "
+                         "driver from redis shard {}.".format(
+                             shard_deleted, len(keys), shard_index))
+            num_indexed += len(keys)
+            num_deleted += shard_deleted
+        self.redis.delete(*object_store_profiler.job_keys(job_id))
+
+        logger.info("Monitor: "
+                    "Removed {} dead redis entries ({} indexed) of job {} "
+                    "in {:.3f}s.".format(num_deleted, num_indexed,
+                                         binary_to_hex(job_id),
+                                         time.time() - start_time))
 
     def xray_job_notification_handler(self, unused_channel, data):
         """Handle a notification that a job has been added or removed.
@@ -221,7 +196,8 @@ class Monitor(object):
 
         Args:
             channel: unused
-            data: a resource request as JSON, e.g. {"CPU": 1}
+            data: a resource request as JSON, e.g. {"CPU": 1}, or a list of
+                resource bundles, e.g. [{"CPU": 1, "GPU": 1}]
         """
 
         if not self.autoscaler:
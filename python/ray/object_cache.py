@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+import threading
+
+
+class ObjectCache(object):
+    """A size-bounded LRU cache of deserialized objects, keyed by object ID.
+
+    Objects in Ray are immutable, so a value deserialized once can be handed
+    to every later reader on the same worker. Callers must not mutate cached
+    values. Values that were deserialized without a copy, e.g. numpy arrays,
+    keep their object store buffers alive while they're in the cache.
+
+    Attributes:
+        capacity_bytes (int): The maximum total serialized size of the
+            cached objects.
+        num_bytes (int): The total serialized size of the cached objects.
+        num_hits (int): The number of lookups that found a cached value.
+        num_misses (int): The number of lookups that didn't.
+        bytes_saved (int): The total serialized size of the objects that
+            didn't have to be fetched and deserialized again.
+    """
+
+    def __init__(self, capacity_bytes):
+        self.capacity_bytes = capacity_bytes
+        self.num_bytes = 0
+        self.num_hits = 0
+        self.num_misses = 0
+        self.bytes_saved = 0
+        # Map from object ID to (value, size) pairs, oldest first.
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, object_id):
+        return object_id in self._entries
+
+    def lookup(self, object_ids):
+        """Look up the cached values of a list of objects.
+
+        Returns:
+            A tuple of the list of values, with None for missing objects, the
+                list of indices of the missing objects, and the total size of
+                the objects that were found.
+        """
+        values = [None] * len(object_ids)
+        missing = []
+        bytes_saved = 0
+        with self._lock:
+            for i, object_id in enumerate(object_ids):
+                entry = self._entries.pop(object_id, None)
+                if entry is None:
+                    missing.append(i)
+                    continue
+                # Mark the entry as the most recently used one.
+                self._entries[object_id] = entry
+                values[i] = entry[0]
+                bytes_saved += entry[1]
+            self.num_hits += len(object_ids) - len(missing)
+            self.num_misses += len(missing)
+            self.bytes_saved += bytes_saved
+        return values, missing, bytes_saved
+
+    def add(self, object_id, value, size):
+        """Add a value to the cache, evicting the least recently used ones.
+
+        Values larger than the capacity of the cache are not added.
+        """
+        if size > self.capacity_bytes:
+            return
+        with self._lock:
+            if object_id in self._entries:
+                return
+            self._entries[object_id] = (value, size)
+            self.num_bytes += size
+            while self.num_bytes > self.capacity_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.num_bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.num_bytes = 0
+
+    def stats(self):
+        return {
+            "num_objects": len(self._entries),
+            "num_bytes": self.num_bytes,
+            "num_hits": self.num_hits,
+            "num_misses": self.num_misses,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+def cache_arguments(function):
+    """Annotate a remote function or actor method to cache its arguments.
+
+    ObjectID arguments of the function are read through the worker's object
+    cache, as in `ray.get(object_ids, cache=True)`. This avoids deserializing
+    large read-only arguments, e.g. lookup tables, on every call.
+
+    .. code-block:: python
+
+        @ray.remote
+        @ray.cache_arguments
+        def predict(embeddings, batch):
+            return embeddings[batch]
+
+    The arguments must not be mutated by the function.
+    """
+    function.__ray_cache_arguments__ = True
+    return function
@@ -0,0 +1,240 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+import weakref
+
+import ray
+
+# Prefixes of the Redis hashes that hold the profile of each job, keyed by
+# object ID. The records hold the callsite that created each object, the pins
+# the reason it is pinned. The hashes of a job are deleted by the monitor
+# when the job finishes.
+PROFILE_KEY = b"ObjectStoreProfile"
+PINS_KEY = b"ObjectStorePins"
+# Prefix of the Redis hashes of the object ID arguments of the submitted
+# tasks, keyed by the first return ID of each task.
+TASK_ARGS_KEY = b"ObjectStoreTaskArgs"
+
+# The reasons why an object may be pinned, from strongest to weakest.
+SET_BUFFER_REF = "set_buffer_ref"
+ACTOR_HANDLE = "actor handle"
+ARGUMENT_IN_FLIGHT = "argument in flight"
+NOT_PINNED = "not pinned"
+PIN_REASONS = [SET_BUFFER_REF, ACTOR_HANDLE, ARGUMENT_IN_FLIGHT, NOT_PINNED]
+
+# The object table is updated asynchronously, so the records of objects
+# that are not in it are only dropped after this many seconds.
+RECORD_GRACE_PERIOD_S = 30
+
+_RAY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def job_key(prefix, job_id_binary):
+    """Returns the key of the hash with the given prefix for a job."""
+    return prefix + b":" + job_id_binary
+
+
+def job_keys(job_id_binary):
+    """Returns the keys of all hashes of the profile of a job."""
+    return [
+        job_key(prefix, job_id_binary)
+        for prefix in [PROFILE_KEY, PINS_KEY, TASK_ARGS_KEY]
+    ]
+
+
+def get_callsite():
+    """Returns the first frame of the call stack outside of Ray's core.
+
+    Frames in the modules of the ray package itself, e.g. worker.py, are
+    skipped. Frames in libraries like ray.tune count as callsites.
+    """
+    frame = sys._getframe(1)
+    while (frame.f_back is not None
+           and os.path.dirname(frame.f_code.co_filename) == _RAY_DIR):
+        frame = frame.f_back
+    return "{}:{} ({})".format(frame.f_code.co_filename, frame.f_lineno,
+                               frame.f_code.co_name)
+
+
+class _Pin(object):
+    """Holds the buffers that pin an object for ray.put.
+
+    Unlike ObjectIDs, these can be weakly referenced, which lets the
+    profiler notice when the ObjectID holding the pin is collected.
+    """
+
+    __slots__ = ["buffers", "__weakref__"]
+
+    def __init__(self, buffers):
+        self.buffers = buffers
+
+
+class ObjectStoreProfiler(object):
+    """Records which code created the objects in the object store.
+
+    This is enabled by setting RAY_PROFILE_OBJECT_STORE_MEMORY=1 in the
+    environment of the driver and the workers. Each ray.put and each task
+    submission then writes the callsite of the new objects, and the reason
+    they are pinned, to Redis with a single round trip. The sizes of the
+    objects are looked up in the object table when ray.memory_summary is
+    called.
+    """
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        # Maps weak references to the pins of ray.put to the key of the
+        # pins hash and the object ID.
+        self._pins = {}
+        # Keys and object IDs of the pins collected since the last write.
+        self._released = []
+
+    def _unpinned(self, pin_ref):
+        # This runs during garbage collection, so the pin is only removed
+        # from Redis with the next write.
+        self._released.append(self._pins.pop(pin_ref))
+
+    def _pipeline(self):
+        pipe = self.redis_client.pipeline(transaction=False)
+        while self._released:
+            pipe.hdel(*self._released.pop())
+        return pipe
+
+    @staticmethod
+    def _key(prefix):
+        # Workers record objects for the job of the task they execute.
+        job_id = ray.worker.global_worker.current_job_id
+        return job_key(prefix, job_id.binary())
+
+    @staticmethod
+    def _records(object_ids, kind, callsite):
+        record = json.dumps({
+            "callsite": callsite,
+            "kind": kind,
+            "time": time.time(),
+        })
+        return {object_id.binary(): record for object_id in object_ids}
+
+    def record_puts(self, object_ids, pinned):
+        """Records objects created by ray.put.
+
+        Args:
+            object_ids (List[ObjectID]): the IDs returned by ray.put.
+            pinned (bool): whether the IDs pin their objects with
+                set_buffer_ref, in which case the pins are tracked until the
+                IDs are garbage collected.
+        """
+        if not object_ids:
+            return
+        pipe = self._pipeline()
+        pipe.hmset(
+            self._key(PROFILE_KEY),
+            self._records(object_ids, "put", get_callsite()))
+        if pinned:
+            pins_key = self._key(PINS_KEY)
+            for object_id in object_ids:
+                pin = _Pin(object_id.get_buffer_ref())
+                pin_ref = weakref.ref(pin, self._unpinned)
+                self._pins[pin_ref] = (pins_key, object_id.binary())
+                object_id.set_buffer_ref(pin)
+            pipe.hmset(pins_key, {
+                object_id.binary(): SET_BUFFER_REF
+                for object_id in object_ids
+            })
+        pipe.execute()
+
+    def record_tasks(self, args_list, object_ids_list, reason):
+        """Records the return values and the arguments of submitted tasks.
+
+        Args:
+            args_list (List[list]): the arguments of each task.
+            object_ids_list (List[List[ObjectID]]): the return IDs of each
+                task.
+            reason (str): why the object ID arguments are pinned until the
+                tasks finish, ARGUMENT_IN_FLIGHT or ACTOR_HANDLE.
+        """
+        callsite = get_callsite()
+        records = {}
+        task_args = {}
+        for args, object_ids in zip(args_list, object_ids_list):
+            records.update(self._records(object_ids, "task return", callsite))
+            arg_ids = [
+                arg.hex() for arg in args if isinstance(arg, ray.ObjectID)
+            ]
+            # Tasks without return values are never known to be finished.
+            if arg_ids and object_ids:
+                task_args[object_ids[0].binary()] = json.dumps({
+                    "reason": reason,
+                    "args": arg_ids,
+                })
+        if not records and not task_args:
+            return
+        pipe = self._pipeline()
+        if records:
+            pipe.hmset(self._key(PROFILE_KEY), records)
+        if task_args:
+            pipe.hmset(self._key(TASK_ARGS_KEY), task_args)
+        pipe.execute()
+
+
+def summarize(objects, sort_by="bytes", limit=None):
+    """Aggregates the profiled objects by callsite.
+
+    Args:
+        objects: an iterable of dicts with the "callsite", "kind", "size" and
+            "reason" of each object.
+        sort_by (str): "bytes" or "count".
+        limit (int): the maximum number of callsites to return.
+
+    Returns:
+        A list of dicts with the "callsite", the "kind" of objects it
+            created, their "num_objects" and "total_bytes", and the
+            "bytes_by_reason" they are pinned for, with the callsites that
+            created the most bytes or objects first.
+    """
+    if sort_by not in ["bytes", "count"]:
+        raise ValueError(
+            "sort_by must be 'bytes' or 'count', got {}.".format(sort_by))
+    rows = {}
+    for obj in objects:
+        key = (obj["callsite"], obj["kind"])
+        row = rows.get(key)
+        if row is None:
+            row = {
+                "callsite": obj["callsite"],
+                "kind": obj["kind"],
+                "num_objects": 0,
+                "total_bytes": 0,
+                "bytes_by_reason": {},
+            }
+            rows[key] = row
+        row["num_objects"] += 1
+        row["total_bytes"] += obj["size"]
+        row["bytes_by_reason"][obj["reason"]] = (
+            row["bytes_by_reason"].get(obj["reason"], 0) + obj["size"])
+    if sort_by == "bytes":
+        sort_key = (lambda row: (row["total_bytes"], row["num_objects"]))
+    else:
+        sort_key = (lambda row: (row["num_objects"], row["total_bytes"]))
+    return sorted(rows.values(), key=sort_key, reverse=True)[:limit]
+
+
+def format_summary(rows):
+    """Formats the result of ray.memory_summary as a table."""
+    lines = [
+        "{:>12} {:>8}  {:<12} {:<36} {}".format("MB", "objects", "kind",
+                                                "pinned by", "callsite")
+    ]
+    for row in rows:
+        reasons = ", ".join(
+            "{} {:.1f} MB".format(reason, size / 1e6)
+            for reason, size in sorted(
+                row["bytes_by_reason"].items(), key=lambda x: -x[1]))
+        lines.append("{:>12.1f} {:>8}  {:<12} {:<36} {}".format(
+            row["total_bytes"] / 1e6, row["num_objects"], row["kind"], reasons,
+            row["callsite"]))
+    return "\n".join(lines)
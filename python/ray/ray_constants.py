@@ -35,6 +35,31 @@ OBJECT_STORE_MINIMUM_MEMORY_BYTES = 75 * 1024 * 1024
 DEFAULT_REDIS_MAX_MEMORY_BYTES = 10**10
 # The smallest cap on the memory used by Redis that we allow.
 REDIS_MINIMUM_MEMORY_BYTES = 10**7
+# The number of GCS table entries to look up per Redis pipeline when scanning
+# entire tables, e.g., in ray.objects() or ray.timeline().
+GCS_SCAN_BATCH_SIZE = env_integer("RAY_GCS_SCAN_BATCH_SIZE", 1000)
+# If set, workers don't import every exported remote function and actor class
+# in the background. Instead, they fetch a function definition from the GCS
+# the first time they execute it, and only keep the
+# FUNCTION_CACHE_SIZE most recently used ones.
+LAZY_FUNCTION_IMPORT = bool(env_integer("RAY_LAZY_FUNCTION_IMPORT", 0))
+FUNCTION_CACHE_SIZE = env_integer("RAY_FUNCTION_CACHE_SIZE", 1000)
+# Tasks deserialize their object arguments on a thread pool if the arguments
+# have at least this many bytes in total. If 0, the pool is always used.
+PARALLEL_ARGUMENT_DESERIALIZATION_MIN_BYTES = env_integer(
+    "RAY_PARALLEL_ARGUMENT_DESERIALIZATION_MIN_BYTES", 4 * 1024**2)
+# The maximum total size of the deserialized objects that a worker caches for
+# ray.get(cache=True) and remote functions annotated with ray.cache_arguments.
+OBJECT_CACHE_SIZE_BYTES = env_integer("RAY_OBJECT_CACHE_SIZE_BYTES",
+                                      2 * 1024**3)
+# The number of keys to delete per Redis command when the monitor removes the
+# task and object table entries of a job that exited.
+MONITOR_CLEANUP_BATCH_SIZE = env_integer("RAY_MONITOR_CLEANUP_BATCH_SIZE",
+                                         1000)
+# If set, the driver and workers record which code created the objects in the
+# object store, which ray.memory_summary() aggregates.
+PROFILE_OBJECT_STORE_MEMORY = bool(
+    env_integer("RAY_PROFILE_OBJECT_STORE_MEMORY", 0))
 
 # Default resource requirements for actors when no resource requirements are
 # specified.
@@ -144,6 +169,14 @@ AUTOSCALER_HEARTBEAT_TIMEOUT_S = env_integer("AUTOSCALER_HEARTBEAT_TIMEOUT_S",
 
 # The reporter will report its' statistics this often (milliseconds).
 REPORTER_UPDATE_INTERVAL_MS = env_integer("REPORTER_UPDATE_INTERVAL_MS", 500)
+# If nothing significant changed, the reporter doubles its update interval,
+# up to this interval (milliseconds).
+REPORTER_MAX_UPDATE_INTERVAL_MS = env_integer(
+    "REPORTER_MAX_UPDATE_INTERVAL_MS", 2000)
+# The reporter sends only the changed statistics, except for a full
+# snapshot this often (milliseconds).
+REPORTER_FULL_UPDATE_INTERVAL_MS = env_integer(
+    "REPORTER_FULL_UPDATE_INTERVAL_MS", 10000)
 
 # Max number of retries to AWS (default is 5, time increases exponentially)
 BOTO_MAX_RETRIES = env_integer("BOTO_MAX_RETRIES", 12)
@@ -174,6 +207,19 @@ PROCESS_TYPE_REDIS_SERVER = "redis_server"
 PROCESS_TYPE_WEB_UI = "web_ui"
 
 LOG_MONITOR_MAX_OPEN_FILES = 200
+# The maximum number of bytes the log monitor reads from a file at once.
+LOG_MONITOR_MAX_READ_BYTES = 1024 * 1024
+# The log monitor publishes the new lines of all files at most once per this
+# interval. When nothing changes, it waits for file system events instead, and
+# only rescans the log directory every LOG_MONITOR_IDLE_TIMEOUT_S.
+LOG_MONITOR_PUBLISH_INTERVAL_S = 0.05
+LOG_MONITOR_IDLE_TIMEOUT_S = 1
+# If positive, lines are dropped once a worker prints more than this many lines
+# per second, and lines longer than LOG_MONITOR_MAX_LINE_LENGTH characters are
+# truncated, to protect the drivers from log storms.
+LOG_MONITOR_MAX_LINES_PER_SECOND = env_integer(
+    "RAY_LOG_MONITOR_MAX_LINES_PER_SECOND", 0)
+LOG_MONITOR_MAX_LINE_LENGTH = env_integer("RAY_LOG_MONITOR_MAX_LINE_LENGTH", 0)
 
 # A constant used as object metadata to indicate the object is raw binary.
 RAW_BUFFER_METADATA = b"RAW"
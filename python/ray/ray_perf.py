@@ -1,9 +1,13 @@
 """This is the script for `ray microbenchmark`."""
 
+import collections
+import sys
 import time
 import numpy as np
 import multiprocessing
 import ray
+from ray import ray_constants
+from ray.experimental.queue import Queue, Empty
 
 
 @ray.remote
@@ -20,6 +24,21 @@ def small_value():
     return 0
 
 
+@ray.remote
+def small_value_arg(x):
+    return 0
+
+
+@ray.remote
+def many_args(*args):
+    return 0
+
+
+@ray.remote
+def value_of_size(num_bytes):
+    return b"0" * num_bytes
+
+
 @ray.remote
 def small_value_batch(n):
     submitted = [small_value.remote() for _ in range(n)]
@@ -66,6 +85,50 @@ def main():
 
     timeit("single core put gigabytes", put_large, 8 * 0.1)
 
+    for n in [1000, 10000, 100000]:
+        values = list(range(n))
+
+        def put_loop():
+            ray.get([ray.put(v) for v in values])
+
+        def put_many():
+            ray.get(ray.put_many(values))
+
+        def put_many_parallel_get():
+            ray.get(ray.put_many(values), parallel=True)
+
+        timeit("single core put {} small objects with put".format(n), put_loop,
+               n)
+        timeit("single core put {} small objects with put_many".format(n),
+               put_many, n)
+        timeit(
+            "single core put {} small objects with put_many, parallel get".
+            format(n), put_many_parallel_get, n)
+
+    arrays = [np.zeros(1024 * 1024, dtype=np.int64) for _ in range(100)]
+    array_ids = ray.put_many(arrays)
+
+    def get_arrays():
+        ray.get(array_ids)
+
+    def get_arrays_parallel():
+        ray.get(array_ids, parallel=True)
+
+    timeit("single core get gigabytes", get_arrays, 8 * 0.1)
+    timeit("single core parallel get gigabytes", get_arrays_parallel, 8 * 0.1)
+
+    # Unlike numpy arrays, this isn't deserialized without a copy.
+    table_id = ray.put({i: [float(i)] * 10 for i in range(10000)})
+
+    def get_table():
+        ray.get(table_id)
+
+    def get_table_cached():
+        ray.get(table_id, cache=True)
+
+    timeit("single core get of a 10k entry dict", get_table)
+    timeit("single core cached get of a 10k entry dict", get_table_cached)
+
     @ray.remote
     def do_put_small():
         for _ in range(100):
@@ -96,6 +159,68 @@ def main():
 
     timeit("single core tasks async", small_task_async, 1000)
 
+    # Numpy scalars and sets are passed in the task spec, while the deque
+    # is still put in the object store.
+    for name, arg in [("numpy scalar", np.int64(1)), ("set", {1, 2, 3}),
+                      ("deque", collections.deque([1, 2, 3]))]:
+
+        def small_task_arg():
+            ray.get([small_value_arg.remote(arg) for _ in range(1000)])
+
+        timeit("single core tasks async with a {} arg".format(name),
+               small_task_arg, 1000)
+
+    # Python tasks write every return value to the object store, however
+    # small it is, so these cases measure the latency of that path.
+    for num_bytes in [8, 1024, 1024 * 1024]:
+
+        def return_roundtrip():
+            ray.get(value_of_size.remote(num_bytes))
+
+        timeit(
+            "single core task return latency, {} byte value".format(num_bytes),
+            return_roundtrip)
+
+    array_args = [ray.put(np.zeros(1024 * 1024)) for _ in range(4)]
+
+    def array_args_task():
+        ray.get(many_args.remote(*array_args))
+
+    small_args = [ray.put(0) for _ in range(4)]
+
+    def small_args_task():
+        ray.get(many_args.remote(*small_args))
+
+    # Only the array arguments are large enough to be deserialized on a
+    # thread pool. Run with RAY_PARALLEL_ARGUMENT_DESERIALIZATION_MIN_BYTES=0
+    # to compare with always using the pool.
+    threshold = ray_constants.PARALLEL_ARGUMENT_DESERIALIZATION_MIN_BYTES
+    timeit(
+        "single core tasks with 4 array args (pool above {} bytes)".format(
+            threshold), array_args_task)
+    timeit(
+        "single core tasks with 4 small object args (pool above {} bytes)".
+        format(threshold), small_args_task)
+
+    submitted = []
+
+    def submit_tasks():
+        submitted.extend(small_value.remote() for _ in range(1000))
+
+    timeit("single core tasks submitted with remote", submit_tasks, 1000)
+    ray.get(submitted)
+    del submitted[:]
+
+    no_args = [[] for _ in range(1000)]
+
+    def submit_tasks_batch():
+        submitted.extend(small_value.remote_batch(no_args))
+
+    timeit("single core tasks submitted with remote_batch", submit_tasks_batch,
+           1000)
+    ray.get(submitted)
+    del submitted[:]
+
     n = 10000
     m = 4
     actors = [Actor.remote() for _ in range(m)]
@@ -106,6 +231,21 @@ def main():
 
     timeit("multi core tasks async", multi_task, n * m)
 
+    if sys.version_info >= (3, 5):
+        import asyncio
+        from ray.experimental import async_api
+
+        loop = asyncio.get_event_loop()
+
+        def small_task_asyncio():
+            futures = [
+                async_api.as_future(small_value.remote()) for _ in range(1000)
+            ]
+            loop.run_until_complete(asyncio.gather(*futures))
+
+        timeit("single core tasks awaited with asyncio", small_task_asyncio,
+               1000)
+
     a = Actor.remote()
 
     def actor_sync():
@@ -132,6 +272,72 @@ def main():
 
     timeit("multi core actor calls async", actor_multi2, m * n)
 
+    q = Queue()
+
+    def queue_put_get():
+        q.put(0)
+        q.get()
+
+    timeit("single core queue put/get calls", queue_put_get)
+
+    batch = list(range(1000))
+
+    def queue_batch():
+        q.put_batch(batch)
+        q.get_batch(len(batch))
+
+    timeit("single core queue batch items", queue_batch, len(batch))
+
+    n = 1000
+
+    @ray.remote
+    def consume(queue, poll):
+        for _ in range(n):
+            if poll:
+                # This is how blocking gets were implemented before the
+                # queue actor parked waiting consumers.
+                while True:
+                    try:
+                        queue.get_nowait()
+                        break
+                    except Empty:
+                        pass
+            else:
+                queue.get()
+
+    def queue_handoff(poll):
+        q = Queue(1)
+        consumers = [consume.remote(q, poll) for _ in range(m)]
+        for i in range(n * m):
+            q.put(i)
+        ray.get(consumers)
+
+    timeit("multi core queue blocking handoff", lambda: queue_handoff(False),
+           n * m)
+    timeit("multi core queue polling handoff", lambda: queue_handoff(True),
+           n * m)
+
+    def make_function(i):
+        def f():
+            return i
+
+        # Functions with the same name and source get the same function ID.
+        f.__name__ = "f_{}".format(i)
+        return ray.remote(f)
+
+    # Export many remote functions. Every new worker imports all of them
+    # at startup, unless RAY_LAZY_FUNCTION_IMPORT is set.
+    functions = [make_function(i) for i in range(1000)]
+    ray.get([f.remote() for f in functions])
+
+    def worker_cold_start():
+        ray.get(Actor.remote().small_value.remote())
+
+    mode = "lazy" if ray_constants.LAZY_FUNCTION_IMPORT else "eager"
+    timeit(
+        "worker cold starts with 1000 exported functions ({} import)".format(
+            mode), worker_cold_start)
+
 
 if __name__ == "__main__":
     main()
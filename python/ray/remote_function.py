@@ -3,9 +3,11 @@ from __future__ import division
 from __future__ import print_function
 
 import logging
+from collections import namedtuple
 from functools import wraps
 
 from ray.function_manager import FunctionDescriptor
+import ray.object_store_profiler as object_store_profiler
 import ray.signature
 
 # Default parameters for remote functions.
@@ -15,6 +17,10 @@ DEFAULT_REMOTE_FUNCTION_MAX_CALLS = 0
 
 logger = logging.getLogger(__name__)
 
+SubmitSpec = namedtuple("SubmitSpec",
+                        ["num_return_vals", "resources", "invocation"])
+"""SubmitSpec: The precomputed submission options of a remote function."""
+
 
 class RemoteFunction(object):
     """A remote function.
@@ -45,6 +51,10 @@ class RemoteFunction(object):
             return the resulting ObjectIDs. For an example, see
             "test_decorated_function" in "python/ray/tests/test_basic.py".
         _function_signature: The function signature.
+        _function_descriptor_list: The function descriptor as passed to the
+            core worker.
+        _submit_specs: A map from task options to the SubmitSpec that is
+            used to submit tasks with these options.
         _last_export_session_and_job: A pair of the last exported session
             and job to help us to know whether this function was exported.
             This is an imperfect mechanism used to determine if we need to
@@ -78,6 +88,9 @@ class RemoteFunction(object):
         ray.signature.check_signature_supported(self._function)
         self._function_signature = ray.signature.extract_signature(
             self._function)
+        self._function_descriptor_list = (
+            self._function_descriptor.get_function_descriptor_list())
+        self._submit_specs = {}
         self._last_export_session_and_job = None
         # Override task.remote's signature and docstring
         @wraps(function)
@@ -120,7 +133,82 @@ class RemoteFunction(object):
         """Submit the remote function for execution."""
         worker = ray.worker.get_global_worker()
         worker.check_connected()
+        self._export_if_needed(worker)
+
+        kwargs = {} if kwargs is None else kwargs
+        args = [] if args is None else args
+
+        spec = self._get_submit_spec(num_return_vals, num_cpus, num_gpus,
+                                     memory, object_store_memory, resources)
+        return spec.invocation(args, kwargs)
+
+    def remote_batch(self, args_list, kwargs_list=None, **options):
+        """Submit one task per set of arguments.
+
+        This is equivalent to calling `_remote` once per set of arguments
+        with the same options, but the tasks are submitted to the core worker
+        in a single call.
+
+        Args:
+            args_list (list): The positional arguments of each task.
+            kwargs_list (list): The keyword arguments of each task. If this is
+                None, no keyword arguments are passed.
+            options: The task options, as accepted by `_remote`.
+
+        Returns:
+            A list with what `remote` returns for each task.
+        """
+        worker = ray.worker.get_global_worker()
+        worker.check_connected()
+        self._export_if_needed(worker)
+
+        if kwargs_list is None:
+            kwargs_list = [{}] * len(args_list)
+        elif len(kwargs_list) != len(args_list):
+            raise ValueError("args_list and kwargs_list must have the same "
+                             "length, got {} and {}.".format(
+                                 len(args_list), len(kwargs_list)))
+
+        spec = self._get_submit_spec(**options)
+        if (self._decorator is not None
+                or worker.mode == ray.worker.LOCAL_MODE):
+            return [
+                spec.invocation(args, kwargs)
+                for args, kwargs in zip(args_list, kwargs_list)
+            ]
 
+        args_list = [
+            ray.signature.extend_args(self._function_signature, args, kwargs)
+            for args, kwargs in zip(args_list, kwargs_list)
+        ]
+        object_ids_list = worker.core_worker.submit_tasks(
+            self._function_descriptor_list, args_list, spec.num_return_vals,
+            spec.resources)
+        if worker.object_store_profiler is not None:
+            worker.object_store_profiler.record_tasks(
+                args_list, object_ids_list,
+                object_store_profiler.ARGUMENT_IN_FLIGHT)
+        return [
+            _unpack_return_ids(object_ids) for object_ids in object_ids_list
+        ]
+
+    def map(self, items, **options):
+        """Submit one task per item, with the item as the only argument.
+
+        Examples:
+            >>> object_ids = f.map(range(1000))
+            >>> results = ray.get(object_ids)
+
+        Args:
+            items: An iterable of arguments.
+            options: The task options, as accepted by `_remote`.
+
+        Returns:
+            A list with what `remote` returns for each item.
+        """
+        return self.remote_batch([[item] for item in items], **options)
+
+    def _export_if_needed(self, worker):
         if self._last_export_session_and_job != worker.current_session_and_job:
             # If this function was not exported in this session and job,
             # we need to export this function again, because current GCS
@@ -128,8 +216,34 @@ class RemoteFunction(object):
             self._last_export_session_and_job = worker.current_session_and_job
             worker.function_actor_manager.export(self)
 
-        kwargs = {} if kwargs is None else kwargs
-        args = [] if args is None else args
+    def _get_submit_spec(self,
+                         num_return_vals=None,
+                         num_cpus=None,
+                         num_gpus=None,
+                         memory=None,
+                         object_store_memory=None,
+                         resources=None):
+        """Get the SubmitSpec for the given task options.
+
+        The resources and the invocation function only depend on the task
+        options, so they are computed once per combination of options instead
+        of on every call.
+        """
+        resources_key = (None if resources is None else tuple(
+            sorted(resources.items())))
+        options = (num_return_vals, num_cpus, num_gpus, memory,
+                   object_store_memory, resources_key)
+        spec = self._submit_specs.get(options)
+        if spec is None:
+            spec = self._make_submit_spec(num_return_vals, num_cpus, num_gpus,
+                                          memory, object_store_memory,
+                                          resources)
+            self._submit_specs[options] = spec
+        return spec
+
+    def _make_submit_spec(self, num_return_vals, num_cpus, num_gpus, memory,
+                          object_store_memory, resources):
+        worker = ray.worker.get_global_worker()
 
         if num_return_vals is None:
             num_return_vals = self._num_return_vals
@@ -149,15 +263,23 @@ class RemoteFunction(object):
                     num_return_vals)
             else:
                 object_ids = worker.core_worker.submit_task(
-                    self._function_descriptor.get_function_descriptor_list(),
-                    args, num_return_vals, resources)
+                    self._function_descriptor_list, args, num_return_vals,
+                    resources)
+                if worker.object_store_profiler is not None:
+                    worker.object_store_profiler.record_tasks(
+                        [args], [object_ids],
+                        object_store_profiler.ARGUMENT_IN_FLIGHT)
 
-            if len(object_ids) == 1:
-                return object_ids[0]
-            elif len(object_ids) > 1:
-                return object_ids
+            return _unpack_return_ids(object_ids)
 
         if self._decorator is not None:
             invocation = self._decorator(invocation)
 
-        return invocation(args, kwargs)
+        return SubmitSpec(num_return_vals, resources, invocation)
+
+
+def _unpack_return_ids(object_ids):
+    if len(object_ids) == 1:
+        return object_ids[0]
+    elif len(object_ids) > 1:
+        return object_ids
@@ -52,6 +52,15 @@ def is_worker(cmdline):
     return cmdline and cmdline[0].startswith("ray_")
 
 
+# Processes older than this (seconds) are assumed to not become workers,
+# so their command lines are not read again. Workers set their process
+# title shortly after they start.
+NON_WORKER_CACHE_MIN_AGE_S = 30
+# A change of the CPU usage of a node by at least this many percentage
+# points resets the reporter to its fastest update interval.
+SIGNIFICANT_CPU_CHANGE = 5
+
+
 def determine_ip_address():
     """Return the first IP address for an ethernet interface on the system."""
     addrs = [
@@ -89,6 +98,14 @@ class Reporter(object):
 
         self.network_stats_hist = [(0, (0.0, 0.0))]  # time, (sent, recv)
 
+        # Processes that are known to not be workers.
+        self.non_workers = set()
+        # The last reported stats, the number of reports and the time of the
+        # last full report.
+        self.last_stats = None
+        self.seq = 0
+        self.last_full_report_time = 0
+
     @staticmethod
     def get_cpu_percent():
         return psutil.cpu_percent()
@@ -117,15 +134,34 @@ class Reporter(object):
     def get_disk_usage():
         return {x: psutil.disk_usage(x) for x in ["/", "/tmp"]}
 
-    @staticmethod
-    def get_workers():
-        return [
-            x.as_dict(attrs=[
-                "pid", "create_time", "cpu_percent", "cpu_times", "name",
-                "cmdline", "memory_info", "memory_full_info"
-            ]) for x in psutil.process_iter(attrs=["cmdline"])
-            if is_worker(x.info["cmdline"])
-        ]
+    def get_workers(self):
+        """Returns the stats of the worker processes, keyed by PID.
+
+        psutil reuses the Process objects of running processes, which lets
+        us skip reading the command lines of processes known to not be
+        workers.
+        """
+        workers = {}
+        non_workers = set()
+        now = time.time()
+        for process in psutil.process_iter():
+            if process in self.non_workers:
+                non_workers.add(process)
+                continue
+            try:
+                if not is_worker(process.cmdline()):
+                    age = now - process.create_time()
+                    if age > NON_WORKER_CACHE_MIN_AGE_S:
+                        non_workers.add(process)
+                    continue
+                workers[str(process.pid)] = process.as_dict(attrs=[
+                    "pid", "create_time", "cpu_percent", "cpu_times", "name",
+                    "cmdline", "memory_info"
+                ])
+            except psutil.Error:
+                continue
+        self.non_workers = non_workers
+        return workers
 
     def get_load_avg(self):
         load = os.getloadavg()
@@ -157,24 +193,53 @@ class Reporter(object):
         }
 
     def perform_iteration(self):
-        """Get any changes to the log files and push updates to Redis."""
-        stats = self.get_all_stats()
-
-        self.redis_client.publish(
-            self.redis_key,
-            jsonify_asdict(stats),
-        )
+        """Publishes the stats that changed since the last report to Redis.
+
+        Returns:
+            True if the stats changed significantly.
+        """
+        stats = recursive_asdict(self.get_all_stats())
+        now = time.time()
+        full_report_due = (
+            now - self.last_full_report_time >
+            ray_constants.REPORTER_FULL_UPDATE_INTERVAL_MS / 1000)
+        message = {"hostname": self.hostname, "seq": self.seq}
+        if self.last_stats is None or full_report_due:
+            message["stats"] = stats
+            self.last_full_report_time = now
+            significant = True
+        else:
+            message["delta"] = ray.utils.compute_delta(self.last_stats, stats)
+            significant = (
+                set(stats["workers"]) != set(self.last_stats["workers"])
+                or abs(stats["cpu"] - self.last_stats["cpu"]) >=
+                SIGNIFICANT_CPU_CHANGE)
+        self.last_stats = stats
+        self.seq += 1
+
+        self.redis_client.publish(self.redis_key, json.dumps(message))
+        return significant
 
     def run(self):
-        """Run the reporter."""
+        """Run the reporter.
+
+        The update interval doubles while the stats do not change
+        significantly, up to REPORTER_MAX_UPDATE_INTERVAL_MS.
+        """
+        interval_ms = ray_constants.REPORTER_UPDATE_INTERVAL_MS
         while True:
             try:
-                self.perform_iteration()
+                if self.perform_iteration():
+                    interval_ms = ray_constants.REPORTER_UPDATE_INTERVAL_MS
+                else:
+                    interval_ms = min(
+                        2 * interval_ms,
+                        ray_constants.REPORTER_MAX_UPDATE_INTERVAL_MS)
             except Exception:
                 traceback.print_exc()
                 pass
 
-            time.sleep(ray_constants.REPORTER_UPDATE_INTERVAL_MS / 1000)
+            time.sleep(interval_ms / 1000)
 
 
 if __name__ == "__main__":
@@ -2,17 +2,26 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import array
 from collections import defaultdict
+import itertools
 import json
 import logging
+import pickle
+import random
 import sys
+import threading
 import time
 
+from six.moves import queue
+
 import ray
 from ray.function_manager import FunctionDescriptor
 
 from ray import (
     gcs_utils,
+    object_store_profiler,
+    ray_constants,
     services,
 )
 from ray.utils import (decode, binary_to_object_id, binary_to_hex,
@@ -120,6 +129,152 @@ def _parse_resource_table(redis_client, client_id):
     return resources
 
 
+def _chunks(iterable, size):
+    """Yield successive lists of at most size elements from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _put_unless_stopped(output_queue, item, stopped):
+    """Put an item in a bounded queue, giving up once stopped is set.
+
+    Returns:
+        True if the item was put in the queue and False otherwise.
+    """
+    while not stopped.is_set():
+        try:
+            output_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _sample_events(events, sample_rates):
+    """Randomly keep a fraction of the events of each event type.
+
+    Args:
+        events: An iterable of profile events.
+        sample_rates: A dictionary mapping event types to the fraction of
+            events of that type to keep. Other event types are all kept.
+    """
+    for event in events:
+        rate = sample_rates.get(event["event_type"], 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            yield event
+
+
+def _write_json_events(events, outfile):
+    """Incrementally write events to a file as a JSON list."""
+    outfile.write("[")
+    for i, event in enumerate(events):
+        if i > 0:
+            outfile.write(",\n")
+        json.dump(event, outfile)
+    outfile.write("]\n")
+
+
+# Number of events per chunk of a columnar timeline dump.
+COLUMNAR_TIMELINE_CHUNK_SIZE = 10000
+_COLUMNAR_TIMELINE_HEADER = {"format": "ray_columnar_timeline", "version": 1}
+_COLUMNAR_STRING_FIELDS = [
+    "event_type", "component_type", "component_id", "node_ip_address"
+]
+
+
+def _write_columnar_events(events, outfile):
+    """Incrementally write profile events to a compact columnar dump.
+
+    The dump is a header followed by a sequence of pickled chunks. In each
+    chunk, string fields are dictionary-encoded into integer arrays and the
+    times are stored as arrays of doubles.
+    """
+    pickle.dump(_COLUMNAR_TIMELINE_HEADER, outfile, protocol=2)
+    for chunk in _chunks(events, COLUMNAR_TIMELINE_CHUNK_SIZE):
+        strings = {}
+        columns = {
+            field: array.array("i")
+            for field in _COLUMNAR_STRING_FIELDS
+        }
+        start_times = array.array("d")
+        end_times = array.array("d")
+        extra_data = []
+        for event in chunk:
+            for field in _COLUMNAR_STRING_FIELDS:
+                value = event[field]
+                if value not in strings:
+                    strings[value] = len(strings)
+                columns[field].append(strings[value])
+            start_times.append(event["start_time"])
+            end_times.append(event["end_time"])
+            extra_data.append(
+                json.dumps(event["extra_data"]) if event["extra_data"] else "")
+        string_table = [None] * len(strings)
+        for value, index in strings.items():
+            string_table[index] = value
+        pickle.dump(
+            {
+                "strings": string_table,
+                "columns": columns,
+                "start_time": start_times,
+                "end_time": end_times,
+                "extra_data": extra_data,
+            },
+            outfile,
+            protocol=2)
+
+
+def iter_columnar_timeline(filename):
+    """Read the profile events of a columnar timeline dump.
+
+    Args:
+        filename: A file written by ray.timeline(output_format="columnar").
+
+    Yields:
+        Profile events, each a dictionary.
+    """
+    with open(filename, "rb") as infile:
+        header = pickle.load(infile)
+        if header != _COLUMNAR_TIMELINE_HEADER:
+            raise ValueError(
+                "{} is not a columnar timeline dump.".format(filename))
+        while True:
+            try:
+                chunk = pickle.load(infile)
+            except EOFError:
+                return
+            strings = chunk["strings"]
+            for i in range(len(chunk["start_time"])):
+                event = {
+                    field: strings[chunk["columns"][field][i]]
+                    for field in _COLUMNAR_STRING_FIELDS
+                }
+                event["start_time"] = chunk["start_time"][i]
+                event["end_time"] = chunk["end_time"][i]
+                extra_data = chunk["extra_data"][i]
+                event["extra_data"] = (json.loads(extra_data)
+                                       if extra_data else {})
+                yield event
+
+
+def columnar_timeline_to_chrome_tracing(input_filename, output_filename):
+    """Convert a columnar timeline dump into a Chrome tracing JSON file.
+
+    Args:
+        input_filename: A file written by
+            ray.timeline(output_format="columnar").
+        output_filename: The Chrome tracing file to write.
+    """
+    with open(output_filename, "w") as outfile:
+        _write_json_events(
+            (state._chrome_tracing_event(event)
+             for event in iter_columnar_timeline(input_filename)), outfile)
+
+
 class GlobalState(object):
     """A class used to interface with the Ray control state.
 
@@ -245,6 +400,76 @@ class GlobalState(object):
             result.extend(list(client.scan_iter(match=pattern)))
         return result
 
+    def _scan_table(self, table_name, batch_size=None):
+        """Scan all entries of a GCS table on all Redis shards.
+
+        Each shard is scanned by a separate thread, which looks up the
+        scanned keys in pipelined batches instead of one request per key.
+        Results are streamed back as soon as a batch arrives.
+
+        Args:
+            table_name: The name of the table in gcs_utils.TablePrefix,
+                e.g., "OBJECT".
+            batch_size: The number of keys to look up per Redis pipeline.
+                Defaults to ray_constants.GCS_SCAN_BATCH_SIZE.
+
+        Yields:
+            Tuples of the binary ID and the GcsEntry message of each entry.
+        """
+        batch_size = batch_size or ray_constants.GCS_SCAN_BATCH_SIZE
+        key_prefix = getattr(gcs_utils,
+                             "TablePrefix_{}_string".format(table_name))
+        table_prefix = gcs_utils.TablePrefix.Value(table_name)
+        # Bound the number of batches in flight so that a slow consumer
+        # doesn't cause the whole table to be buffered in memory.
+        results = queue.Queue(maxsize=2 * len(self.redis_clients))
+        stopped = threading.Event()
+
+        def scan_shard(client):
+            try:
+                keys = client.scan_iter(
+                    match=key_prefix + "*", count=batch_size)
+                for batch in _chunks(keys, batch_size):
+                    ids_binary = [key[len(key_prefix):] for key in batch]
+                    pipeline = client.pipeline(transaction=False)
+                    for id_binary in ids_binary:
+                        pipeline.execute_command("RAY.TABLE_LOOKUP",
+                                                 table_prefix, "", id_binary)
+                    messages = pipeline.execute()
+                    if not _put_unless_stopped(
+                            results, list(zip(ids_binary, messages)), stopped):
+                        return
+            except Exception as e:
+                _put_unless_stopped(results, e, stopped)
+            _put_unless_stopped(results, None, stopped)
+
+        threads = [
+            threading.Thread(
+                target=scan_shard,
+                args=(client, ),
+                name="ray_scan_{}_shard_{}".format(table_name.lower(), i))
+            for i, client in enumerate(self.redis_clients)
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        num_finished = 0
+        try:
+            while num_finished < len(threads):
+                batch = results.get()
+                if batch is None:
+                    num_finished += 1
+                    continue
+                if isinstance(batch, Exception):
+                    raise batch
+                for id_binary, message in batch:
+                    # Keys may be evicted between the scan and the lookup.
+                    if message is not None:
+                        yield id_binary, message
+        finally:
+            stopped.set()
+
     def _object_table(self, object_id):
         """Fetch and parse the object table information for a single object ID.
 
@@ -264,6 +489,10 @@ class GlobalState(object):
                                         "", object_id.binary())
         if message is None:
             return {}
+        return self._parse_object_table_entry(message)
+
+    def _parse_object_table_entry(self, message):
+        """Parse an object table GcsEntry message."""
         gcs_entry = gcs_utils.GcsEntry.FromString(message)
 
         assert len(gcs_entry.entries) > 0
@@ -277,12 +506,14 @@ class GlobalState(object):
 
         return object_info
 
-    def object_table(self, object_id=None):
+    def object_table(self, object_id=None, limit=None):
         """Fetch and parse the object table info for one or more object IDs.
 
         Args:
             object_id: An object ID to fetch information about. If this is
                 None, then the entire object table is fetched.
+            limit: The maximum number of entries to return when fetching the
+                entire object table.
 
         Returns:
             Information from the object table.
@@ -293,17 +524,22 @@ class GlobalState(object):
             return self._object_table(object_id)
         else:
             # Return the entire object table.
-            object_keys = self._keys(gcs_utils.TablePrefix_OBJECT_string + "*")
-            object_ids_binary = {
-                key[len(gcs_utils.TablePrefix_OBJECT_string):]
-                for key in object_keys
-            }
+            return dict(self.iter_object_table(limit=limit))
+
+    def iter_object_table(self, limit=None):
+        """Stream the entries of the object table.
 
-            results = {}
-            for object_id_binary in object_ids_binary:
-                results[binary_to_object_id(object_id_binary)] = (
-                    self._object_table(binary_to_object_id(object_id_binary)))
-            return results
+        Args:
+            limit: The maximum number of entries to yield.
+
+        Yields:
+            Tuples of the object ID and its object table information.
+        """
+        self._check_connected()
+        entries = ((binary_to_object_id(object_id_binary),
+                    self._parse_object_table_entry(message))
+                   for object_id_binary, message in self._scan_table("OBJECT"))
+        return itertools.islice(entries, limit)
 
     def _task_table(self, task_id):
         """Fetch and parse the task table information for a single task ID.
@@ -320,6 +556,10 @@ class GlobalState(object):
             gcs_utils.TablePrefix.Value("RAYLET_TASK"), "", task_id.binary())
         if message is None:
             return {}
+        return self._parse_task_table_entry(message)
+
+    def _parse_task_table_entry(self, message):
+        """Parse a task table GcsEntry message."""
         gcs_entries = gcs_utils.GcsEntry.FromString(message)
 
         assert len(gcs_entries.entries) == 1
@@ -363,12 +603,14 @@ class GlobalState(object):
             "TaskSpec": task_spec_info
         }
 
-    def task_table(self, task_id=None):
+    def task_table(self, task_id=None, limit=None):
         """Fetch and parse the task table information for one or more task IDs.
 
         Args:
             task_id: A hex string of the task ID to fetch information about. If
                 this is None, then the task object table is fetched.
+            limit: The maximum number of entries to return when fetching the
+                entire task table.
 
         Returns:
             Information from the task table.
@@ -378,18 +620,23 @@ class GlobalState(object):
             task_id = ray.TaskID(hex_to_binary(task_id))
             return self._task_table(task_id)
         else:
-            task_table_keys = self._keys(
-                gcs_utils.TablePrefix_RAYLET_TASK_string + "*")
-            task_ids_binary = [
-                key[len(gcs_utils.TablePrefix_RAYLET_TASK_string):]
-                for key in task_table_keys
-            ]
-
-            results = {}
-            for task_id_binary in task_ids_binary:
-                results[binary_to_hex(task_id_binary)] = self._task_table(
-                    ray.TaskID(task_id_binary))
-            return results
+            return dict(self.iter_task_table(limit=limit))
+
+    def iter_task_table(self, limit=None):
+        """Stream the entries of the task table.
+
+        Args:
+            limit: The maximum number of entries to yield.
+
+        Yields:
+            Tuples of the task ID hex string and its task table information.
+        """
+        self._check_connected()
+        entries = (
+            (binary_to_hex(task_id_binary),
+             self._parse_task_table_entry(message))
+            for task_id_binary, message in self._scan_table("RAYLET_TASK"))
+        return itertools.islice(entries, limit)
 
     def client_table(self):
         """Fetch and parse the Redis DB client table.
@@ -484,8 +731,6 @@ class GlobalState(object):
         Returns:
             A list of the profile events for the specified batch.
         """
-        # TODO(rkn): This method should support limiting the number of log
-        # events and should also support returning a window of events.
         message = self._execute_command(batch_id, "RAY.TABLE_LOOKUP",
                                         gcs_utils.TablePrefix.Value("PROFILE"),
                                         "", batch_id.binary())
@@ -493,6 +738,25 @@ class GlobalState(object):
         if message is None:
             return []
 
+        return self._parse_profile_table_entry(message)
+
+    def _parse_profile_table_entry(self,
+                                   message,
+                                   start_time=None,
+                                   end_time=None,
+                                   component_types=None):
+        """Parse a profile table GcsEntry message into profile events.
+
+        Args:
+            message: The GcsEntry message of a batch of profile events.
+            start_time: If provided, skip events that ended before this time.
+            end_time: If provided, skip events that started after this time.
+            component_types: If provided, only return events of components
+                with these types, e.g., "worker".
+
+        Returns:
+            A list of the profile events in the batch.
+        """
         gcs_entries = gcs_utils.GcsEntry.FromString(message)
 
         profile_events = []
@@ -501,10 +765,19 @@ class GlobalState(object):
                 entry)
 
             component_type = profile_table_message.component_type
+            if (component_types is not None
+                    and component_type not in component_types):
+                continue
             component_id = binary_to_hex(profile_table_message.component_id)
             node_ip_address = profile_table_message.node_ip_address
 
             for profile_event_message in profile_table_message.profile_events:
+                if (start_time is not None
+                        and profile_event_message.end_time < start_time):
+                    continue
+                if (end_time is not None
+                        and profile_event_message.start_time > end_time):
+                    continue
                 profile_event = {
                     "event_type": profile_event_message.event_type,
                     "component_id": component_id,
@@ -519,26 +792,57 @@ class GlobalState(object):
 
         return profile_events
 
-    def profile_table(self):
-        self._check_connected()
-        profile_table_keys = self._keys(gcs_utils.TablePrefix_PROFILE_string +
-                                        "*")
-        batch_identifiers_binary = [
-            key[len(gcs_utils.TablePrefix_PROFILE_string):]
-            for key in profile_table_keys
-        ]
+    def profile_table(self,
+                      limit=None,
+                      start_time=None,
+                      end_time=None,
+                      component_types=None):
+        """Fetch the profile events of all components.
 
-        result = defaultdict(list)
-        for batch_id in batch_identifiers_binary:
-            profile_data = self._profile_table(binary_to_object_id(batch_id))
-            # Note that if keys are being evicted from Redis, then it is
-            # possible that the batch will be evicted before we get it.
-            if len(profile_data) > 0:
-                component_id = profile_data[0]["component_id"]
-                result[component_id].extend(profile_data)
+        Args:
+            limit: The maximum number of profile events to return.
+            start_time: If provided, skip events that ended before this time.
+            end_time: If provided, skip events that started after this time.
+            component_types: If provided, only return events of components
+                with these types, e.g., "worker".
 
+        Returns:
+            A dictionary mapping component ID hex strings to lists of profile
+                events.
+        """
+        result = defaultdict(list)
+        for event in self.iter_profile_events(
+                limit=limit,
+                start_time=start_time,
+                end_time=end_time,
+                component_types=component_types):
+            result[event["component_id"]].append(event)
         return dict(result)
 
+    def iter_profile_events(self,
+                            limit=None,
+                            start_time=None,
+                            end_time=None,
+                            component_types=None):
+        """Stream the profile events of all components.
+
+        The arguments are the same as for profile_table.
+
+        Yields:
+            Profile events, each a dictionary.
+        """
+        self._check_connected()
+        # Note that if keys are being evicted from Redis, then it is
+        # possible that a batch will be evicted before we get it, in which
+        # case it is skipped by _scan_table.
+        events = (event for _, message in self._scan_table("PROFILE")
+                  for event in self._parse_profile_table_entry(
+                      message,
+                      start_time=start_time,
+                      end_time=end_time,
+                      component_types=component_types))
+        return itertools.islice(events, limit)
+
     def _seconds_to_microseconds(self, time_in_seconds):
         """A helper function for converting seconds to microseconds."""
         time_in_microseconds = 10**6 * time_in_seconds
@@ -550,6 +854,7 @@ class GlobalState(object):
         lambda: "generic_work", {
             "worker_idle": "cq_build_abandoned",
             "task": "rail_response",
+            "task:fetch_arguments": "rail_load",
             "task:deserialize_arguments": "rail_load",
             "task:execute": "rail_animation",
             "task:store_outputs": "rail_idle",
@@ -600,7 +905,47 @@ class GlobalState(object):
         "cq_build_attempt_failed",
     ]
 
-    def chrome_tracing_dump(self, filename=None):
+    def _chrome_tracing_event(self, event):
+        """Convert a profile event into a Chrome tracing event."""
+        new_event = {
+            # The category of the event.
+            "cat": event["event_type"],
+            # The string displayed on the event.
+            "name": event["event_type"],
+            # The identifier for the group of rows that the event
+            # appears in.
+            "pid": event["node_ip_address"],
+            # The identifier for the row that the event appears in.
+            "tid": event["component_type"] + ":" + event["component_id"],
+            # The start time in microseconds.
+            "ts": self._seconds_to_microseconds(event["start_time"]),
+            # The duration in microseconds.
+            "dur": self._seconds_to_microseconds(event["end_time"] -
+                                                 event["start_time"]),
+            # What is this?
+            "ph": "X",
+            # This is the name of the color to display the box in.
+            "cname": self._default_color_mapping[event["event_type"]],
+            # The extra user-defined data.
+            "args": event["extra_data"],
+        }
+
+        # Modify the json with the additional user-defined extra data.
+        # This can be used to add fields or override existing fields.
+        if "cname" in event["extra_data"]:
+            new_event["cname"] = event["extra_data"]["cname"]
+        if "name" in event["extra_data"]:
+            new_event["name"] = event["extra_data"]["name"]
+        return new_event
+
+    def chrome_tracing_dump(self,
+                            filename=None,
+                            start_time=None,
+                            end_time=None,
+                            component_types=("worker", "driver"),
+                            sample_rates=None,
+                            limit=None,
+                            output_format="json"):
         """Return a list of profiling events that can viewed as a timeline.
 
         To view this information as a timeline, simply dump it as a json file
@@ -608,9 +953,25 @@ class GlobalState(object):
         chrome://tracing in the Chrome web browser and load the dumped file.
         Make sure to enable "Flow events" in the "View Options" menu.
 
+        When a filename is given, events are streamed from the GCS to the
+        file as they arrive, so the full timeline is never held in memory.
+
         Args:
             filename: If a filename is provided, the timeline is dumped to that
                 file.
+            start_time: If provided, skip events that ended before this UNIX
+                timestamp.
+            end_time: If provided, skip events that started after this UNIX
+                timestamp.
+            component_types: Only include events of components with these
+                types. By default, only workers and drivers are included.
+            sample_rates: Optional dictionary mapping event types (e.g.,
+                "task") to the fraction of those events to keep.
+            limit: The maximum number of events to include.
+            output_format: Either "json" for a Chrome tracing file, or
+                "columnar" for a compact binary dump that can later be
+                converted with ray.state.columnar_timeline_to_chrome_tracing.
+                Only used if a filename is provided.
 
         Returns:
             If filename is not provided, this returns a list of profiling
@@ -618,59 +979,27 @@ class GlobalState(object):
         """
         # TODO(rkn): Support including the task specification data in the
         # timeline.
-        # TODO(rkn): This should support viewing just a window of time or a
-        # limited number of events.
-
-        self._check_connected()
-
-        profile_table = self.profile_table()
-        all_events = []
-
-        for component_id_hex, component_events in profile_table.items():
-            # Only consider workers and drivers.
-            component_type = component_events[0]["component_type"]
-            if component_type not in ["worker", "driver"]:
-                continue
-
-            for event in component_events:
-                new_event = {
-                    # The category of the event.
-                    "cat": event["event_type"],
-                    # The string displayed on the event.
-                    "name": event["event_type"],
-                    # The identifier for the group of rows that the event
-                    # appears in.
-                    "pid": event["node_ip_address"],
-                    # The identifier for the row that the event appears in.
-                    "tid": event["component_type"] + ":" +
-                    event["component_id"],
-                    # The start time in microseconds.
-                    "ts": self._seconds_to_microseconds(event["start_time"]),
-                    # The duration in microseconds.
-                    "dur": self._seconds_to_microseconds(event["end_time"] -
-                                                         event["start_time"]),
-                    # What is this?
-                    "ph": "X",
-                    # This is the name of the color to display the box in.
-                    "cname": self._default_color_mapping[event["event_type"]],
-                    # The extra user-defined data.
-                    "args": event["extra_data"],
-                }
-
-                # Modify the json with the additional user-defined extra data.
-                # This can be used to add fields or override existing fields.
-                if "cname" in event["extra_data"]:
-                    new_event["cname"] = event["extra_data"]["cname"]
-                if "name" in event["extra_data"]:
-                    new_event["name"] = event["extra_data"]["name"]
-
-                all_events.append(new_event)
-
-        if filename is not None:
-            with open(filename, "w") as outfile:
-                json.dump(all_events, outfile)
+        if output_format not in ["json", "columnar"]:
+            raise ValueError("Unknown timeline format '{}', must be 'json' or "
+                             "'columnar'.".format(output_format))
+
+        events = self.iter_profile_events(
+            start_time=start_time,
+            end_time=end_time,
+            component_types=component_types)
+        if sample_rates:
+            events = _sample_events(events, sample_rates)
+        events = itertools.islice(events, limit)
+
+        if filename is None:
+            return [self._chrome_tracing_event(event) for event in events]
+        elif output_format == "columnar":
+            with open(filename, "wb") as outfile:
+                _write_columnar_events(events, outfile)
         else:
-            return all_events
+            with open(filename, "w") as outfile:
+                _write_json_events((self._chrome_tracing_event(event)
+                                    for event in events), outfile)
 
     def chrome_tracing_object_transfer_dump(self, filename=None):
         """Return a list of transfer events that can viewed as a timeline.
@@ -967,6 +1296,138 @@ class GlobalState(object):
             for job_id in job_ids
         }
 
+    def _object_sizes(self, object_ids_binary):
+        """Look up the sizes of objects in the object table.
+
+        The lookups are sent to each Redis shard in pipelined batches of
+        ray_constants.GCS_SCAN_BATCH_SIZE.
+
+        Args:
+            object_ids_binary: The binary IDs of the objects.
+
+        Returns:
+            A dict from the binary ID of each object that is in an object
+                store to its size.
+        """
+        shards = [[] for _ in self.redis_clients]
+        for object_id_binary in object_ids_binary:
+            shard_index = ray.ObjectID(object_id_binary).redis_shard_hash()
+            shards[shard_index % len(shards)].append(object_id_binary)
+        table_prefix = gcs_utils.TablePrefix.Value("OBJECT")
+        sizes = {}
+        for client, ids_binary in zip(self.redis_clients, shards):
+            for batch in _chunks(ids_binary,
+                                 ray_constants.GCS_SCAN_BATCH_SIZE):
+                pipeline = client.pipeline(transaction=False)
+                for id_binary in batch:
+                    pipeline.execute_command("RAY.TABLE_LOOKUP", table_prefix,
+                                             "", id_binary)
+                for id_binary, message in zip(batch, pipeline.execute()):
+                    if message is None:
+                        continue
+                    gcs_entry = gcs_utils.GcsEntry.FromString(message)
+                    if not gcs_entry.entries:
+                        continue
+                    entry = gcs_utils.ObjectTableData.FromString(
+                        gcs_entry.entries[0])
+                    sizes[id_binary] = entry.object_size
+        return sizes
+
+    def _hgetall_by_prefix(self, prefix):
+        """Read the hashes of the object store profile of all jobs.
+
+        Args:
+            prefix: The prefix of the hashes, e.g.
+                object_store_profiler.PROFILE_KEY.
+
+        Returns:
+            A dict from each field of the hashes to a tuple of the key of
+                its hash and its value.
+        """
+        keys = list(self.redis_client.scan_iter(match=prefix + b":*"))
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.hgetall(key)
+        result = {}
+        for key, fields in zip(keys, pipeline.execute()):
+            for field, value in fields.items():
+                result[field] = (key, value)
+        return result
+
+    def memory_summary(self, sort_by="bytes", limit=20):
+        """Aggregates the object store profile of the cluster by callsite.
+
+        Only objects that are in an object store are counted. The records of
+        objects that left the object stores and of finished tasks are
+        removed from Redis along the way. All Redis requests are pipelined,
+        since this also runs when the object store is full.
+
+        Args:
+            sort_by (str): "bytes" or "count".
+            limit (int): the maximum number of callsites to return.
+
+        Returns:
+            A list of dicts with the "callsite", the "kind" of objects it
+                created ("put" or "task return"), their "num_objects" and
+                "total_bytes", and the "bytes_by_reason" they are pinned for.
+        """
+        self._check_connected()
+        rank = {
+            reason: i
+            for i, reason in enumerate(object_store_profiler.PIN_REASONS)
+        }
+        pins = self._hgetall_by_prefix(object_store_profiler.PINS_KEY)
+        task_args = self._hgetall_by_prefix(
+            object_store_profiler.TASK_ARGS_KEY)
+        records = self._hgetall_by_prefix(object_store_profiler.PROFILE_KEY)
+        sizes = self._object_sizes(list(task_args) + list(records))
+        # Maps the keys of the hashes to the stale fields to remove.
+        stale = defaultdict(list)
+
+        reasons = {
+            object_id: object_store_profiler.SET_BUFFER_REF
+            for object_id in pins
+        }
+        for return_id, (key, task) in task_args.items():
+            if return_id in sizes:
+                # The task finished, so its arguments are no longer needed.
+                stale[key].append(return_id)
+                continue
+            task = json.loads(decode(task))
+            for arg in task["args"]:
+                arg = hex_to_binary(arg)
+                reason = reasons.get(arg, object_store_profiler.NOT_PINNED)
+                if rank[task["reason"]] < rank[reason]:
+                    reasons[arg] = task["reason"]
+
+        objects = []
+        now = time.time()
+        for object_id, (key, record) in records.items():
+            record = json.loads(decode(record))
+            if object_id not in sizes:
+                if (now - record["time"] >
+                        object_store_profiler.RECORD_GRACE_PERIOD_S):
+                    stale[key].append(object_id)
+                    if object_id in pins:
+                        stale[pins[object_id][0]].append(object_id)
+                continue
+            objects.append({
+                "callsite": record["callsite"],
+                "kind": record["kind"],
+                "size": sizes[object_id],
+                "reason": reasons.get(object_id,
+                                      object_store_profiler.NOT_PINNED),
+            })
+
+        if stale:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for key, fields in stale.items():
+                for batch in _chunks(fields,
+                                     ray_constants.GCS_SCAN_BATCH_SIZE):
+                    pipeline.hdel(key, *batch)
+            pipeline.execute()
+        return object_store_profiler.summarize(objects, sort_by, limit)
+
     def actor_checkpoint_info(self, actor_id):
         """Get checkpoint info for the given actor id.
          Args:
@@ -1083,48 +1544,85 @@ def nodes():
     return state.client_table()
 
 
-def tasks(task_id=None):
+def tasks(task_id=None, limit=None):
     """Fetch and parse the task table information for one or more task IDs.
 
     Args:
         task_id: A hex string of the task ID to fetch information about. If
             this is None, then the task object table is fetched.
+        limit: The maximum number of entries to return when fetching the
+            entire task table.
 
     Returns:
         Information from the task table.
     """
-    return state.task_table(task_id=task_id)
+    return state.task_table(task_id=task_id, limit=limit)
 
 
-def objects(object_id=None):
+def objects(object_id=None, limit=None):
     """Fetch and parse the object table info for one or more object IDs.
 
     Args:
         object_id: An object ID to fetch information about. If this is None,
             then the entire object table is fetched.
+        limit: The maximum number of entries to return when fetching the
+            entire object table.
 
     Returns:
         Information from the object table.
     """
-    return state.object_table(object_id=object_id)
+    return state.object_table(object_id=object_id, limit=limit)
 
 
-def timeline(filename=None):
+def timeline(filename=None,
+             start_time=None,
+             end_time=None,
+             component_types=("worker", "driver"),
+             sample_rates=None,
+             limit=None,
+             output_format="json"):
     """Return a list of profiling events that can viewed as a timeline.
 
     To view this information as a timeline, simply dump it as a json file by
     passing in "filename" or using using json.dump, and then load go to
     chrome://tracing in the Chrome web browser and load the dumped file.
 
+    For long running jobs, pass a filename so that events are streamed to
+    disk, and use the time window, sampling or columnar format to keep the
+    output small. For example:
+
+        >>> ray.timeline("timeline.bin", start_time=time.time() - 60,
+        ...              sample_rates={"task": 0.1},
+        ...              output_format="columnar")
+        >>> ray.state.columnar_timeline_to_chrome_tracing(
+        ...     "timeline.bin", "timeline.json")
+
     Args:
         filename: If a filename is provided, the timeline is dumped to that
             file.
+        start_time: If provided, skip events that ended before this UNIX
+            timestamp.
+        end_time: If provided, skip events that started after this UNIX
+            timestamp.
+        component_types: Only include events of components with these types.
+        sample_rates: Optional dictionary mapping event types (e.g., "task")
+            to the fraction of those events to keep.
+        limit: The maximum number of events to include.
+        output_format: Either "json" or "columnar", see
+            GlobalState.chrome_tracing_dump.
 
     Returns:
         If filename is not provided, this returns a list of profiling events.
             Each profile event is a dictionary.
     """
-    return state.chrome_tracing_dump(filename=filename)
+    return state.chrome_tracing_dump(
+        filename=filename,
+        start_time=start_time,
+        end_time=end_time,
+        component_types=component_types,
+        sample_rates=sample_rates,
+        limit=limit,
+        output_format=output_format)
 
 
 def object_transfer_timeline(filename=None):
@@ -1174,6 +1672,33 @@ def available_resources():
     return state.available_resources()
 
 
+def memory_summary(sort_by="bytes", limit=20):
+    """Get the callsites that created the most objects in the object stores.
+
+    This requires setting RAY_PROFILE_OBJECT_STORE_MEMORY=1 in the
+    environment before starting Ray, so that the driver and the workers
+    record the callsite of each ray.put and task submission.
+
+    .. code-block:: python
+
+        from ray.object_store_profiler import format_summary
+        print(format_summary(ray.memory_summary()))
+
+    Args:
+        sort_by (str): "bytes" to sort the callsites by the bytes of their
+            objects, or "count" to sort them by the number of objects.
+        limit (int): the maximum number of callsites to return.
+
+    Returns:
+        A list of dicts with the "callsite", the "kind" of objects it
+            created ("put" or "task return"), their "num_objects" and
+            "total_bytes", and the "bytes_by_reason" they are pinned for
+            ("set_buffer_ref", "actor handle", "argument in flight" or
+            "not pinned").
+    """
+    return state.memory_summary(sort_by=sort_by, limit=limit)
+
+
 def errors(all_jobs=False):
     """Get error messages from the cluster.
 
@@ -18,7 +18,10 @@ if sys.version_info >= (3, 0):
 
 @pytest.fixture
 def reload_modules():
-    modules = [ra.core, ra.random, ra.linalg, da.core, da.random, da.linalg]
+    modules = [
+        ra.core, ra.random, ra.linalg, da.core, da.random, da.linalg,
+        da.lazy_array
+    ]
     [reload(module) for module in modules]
 
 
@@ -61,6 +64,83 @@ def test_distributed_array_assemble(ray_start_2_cpus, reload_modules):
         ]))
 
 
+def test_distributed_array_blocks(ray_start_2_cpus, reload_modules):
+    assert da.choose_block_size([10**4, 10**4], num_cpus=8) == 1768
+    assert da.choose_block_size([100, 10], num_cpus=8) == da.BLOCK_SIZE
+    assert da.choose_block_size([10**6], num_cpus=1) == 250000
+
+    x = ray.get(da.random.normal.remote([95, 62], block_size=20))
+    assert x.block_size == 20
+    assert x.num_blocks == [5, 4]
+    x_val = x.assemble()
+    assert x_val.shape == (95, 62)
+    index_expressions = [
+        np.s_[:], np.s_[3], np.s_[15:45, ::7], np.s_[-1, 50:10:-3],
+        np.s_[::-1, 61], np.s_[[1, 2]]
+    ]
+    for index in index_expressions:
+        assert_equal(x[index], x_val[index])
+
+
+def test_lazy_array(ray_start_2_cpus, reload_modules):
+    x = da.random.normal.remote([33, 40], block_size=10)
+    y = da.random.normal.remote([33, 40], block_size=10)
+    x_val = ray.get(da.assemble.remote(x))
+    y_val = ray.get(da.assemble.remote(y))
+    lazy_y = da.lazy(y)
+    z = ((2 * da.lazy(x) + lazy_y - 1) / (abs(lazy_y) + 1)).apply(
+        np.maximum, x)
+    result = z.evaluate()
+    # The whole expression is computed with one task per block.
+    assert result.num_blocks == [4, 4]
+    expected = np.maximum((2 * x_val + y_val - 1) / (np.abs(y_val) + 1), x_val)
+    assert_almost_equal(result.assemble(), expected)
+
+    w = da.random.normal.remote([33, 40], block_size=20)
+    with pytest.raises(Exception):
+        da.lazy(x) + da.lazy(w)
+
+
+def test_distributed_dot(ray_start_2_cpus, reload_modules, tmpdir):
+    x = da.random.normal.remote([45, 62], block_size=10)
+    y = da.random.normal.remote([62, 23], block_size=10)
+    expected = np.dot(
+        ray.get(da.assemble.remote(x)), ray.get(da.assemble.remote(y)))
+    for kwargs in [{
+            "num_groups": 1
+    }, {
+            "num_groups": 3,
+            "fanout": 2
+    }, {
+            "num_groups": 2,
+            "spill_dir": str(tmpdir),
+            "spill": True
+    }]:
+        z = da.dot.remote(x, y, **kwargs)
+        assert_almost_equal(ray.get(da.assemble.remote(z)), expected)
+    # The spilled partial results are removed.
+    assert tmpdir.listdir() == []
+
+    # Arrays of different shapes built with the default block size can be
+    # multiplied.
+    x = da.random.normal.remote([25, 49])
+    y = da.random.normal.remote([49, 18])
+    assert ray.get(x).block_size == ray.get(y).block_size == da.BLOCK_SIZE
+    z = da.dot.remote(x, y)
+    assert_almost_equal(
+        ray.get(da.assemble.remote(z)),
+        np.dot(ray.get(da.assemble.remote(x)), ray.get(da.assemble.remote(y))))
+    z = da.dot.remote(da.ones.remote([7, 130]), da.zeros.remote([130, 3]))
+    assert_equal(ray.get(da.assemble.remote(z)), np.zeros([7, 3]))
+
+    block = ray.put(np.arange(4))
+    copies = da.core.broadcast(block, 10, fanout=3)
+    assert len(copies) == 10
+    assert 1 < len(set(copies)) < 10
+    for copy in copies:
+        assert_equal(ray.get(copy), np.arange(4))
+
+
 def test_distributed_array_methods(ray_start_cluster_2_nodes, reload_modules):
     x = da.zeros.remote([9, 25, 51], "float")
     assert_equal(ray.get(da.assemble.remote(x)), np.zeros([9, 25, 51]))
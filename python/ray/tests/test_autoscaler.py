@@ -17,6 +17,8 @@ from ray.autoscaler.autoscaler import StandardAutoscaler, LoadMetrics, \
 from ray.autoscaler.tags import TAG_RAY_NODE_TYPE, TAG_RAY_NODE_STATUS, \
     STATUS_UP_TO_DATE, STATUS_UPDATE_FAILED
 from ray.autoscaler.node_provider import NODE_PROVIDERS, NodeProvider
+from ray.autoscaler.resource_demand_scheduler import demands_from_load, \
+    demands_from_requests, get_nodes_to_launch
 from ray.tests.utils import RayTestTimeoutException
 import pytest
 
@@ -267,6 +269,63 @@ class LoadMetricsTest(unittest.TestCase):
         assert "NumNodesConnected=3" in debug
         assert "NumNodesUsed=2.88" in debug
 
+    def testResourceDemands(self):
+        lm = LoadMetrics()
+        lm.update("1.1.1.1", {"CPU": 2}, {"CPU": 0}, {"CPU": 10, "GPU": 2})
+        lm.update("2.2.2.2", {"CPU": 2}, {"CPU": 2}, {"CPU": 0})
+        assert lm.get_resource_demands() == [({"CPU": 1.0, "GPU": 0.2}, 10)]
+
+
+class ResourceDemandSchedulerTest(unittest.TestCase):
+    def testDemandsFromRequests(self):
+        cpu_request = {"CPU": 3.5, "GPU": 0}
+        assert demands_from_requests(cpu_request) == [({"CPU": 1}, 4)]
+        bundles = [{"CPU": 2, "GPU": 1}, {"GPU": 1, "CPU": 2}, {}]
+        bundle_demand = ({"CPU": 2, "GPU": 1}, 2)
+        assert demands_from_requests(bundles) == [bundle_demand]
+
+    def testPackExistingNodesFirst(self):
+        existing = [{"CPU": 3}, {"CPU": 1, "GPU": 1}]
+        node_types = {"worker": {"CPU": 4}}
+        assert get_nodes_to_launch(existing, node_types, [({
+            "CPU": 1
+        }, 4)]) == {}
+        assert get_nodes_to_launch(existing, node_types, [({
+            "CPU": 1
+        }, 13)]) == {
+            "worker": 3
+        }
+        assert existing == [{"CPU": 3}, {"CPU": 1, "GPU": 1}]
+
+    def testHeterogeneousNodeTypes(self):
+        node_types = {"cpu": {"CPU": 16}, "gpu": {"CPU": 8, "GPU": 4}}
+        # Thousands of tasks in a few shapes. The CPU tasks first fill the
+        # CPUs left on the GPU nodes.
+        demands = [({
+            "CPU": 1
+        }, 3000), ({
+            "CPU": 4
+        }, 100), ({
+            "CPU": 1,
+            "GPU": 1
+        }, 2040)]
+        assert get_nodes_to_launch([], node_types, demands) == {
+            "gpu": 510,
+            "cpu": 85,
+        }
+        assert get_nodes_to_launch([], node_types,
+                                   demands_from_load({
+                                       "CPU": 1000
+                                   })) == {
+                                       "cpu": 63
+                                   }
+
+    def testInfeasibleAndMaxToLaunch(self):
+        node_types = {"worker": {"CPU": 2}}
+        demands = [({"GPU": 1}, 10), ({"CPU": 1}, 100)]
+        assert get_nodes_to_launch([], node_types, demands) == {"worker": 50}
+        assert get_nodes_to_launch([], node_types, demands, 5) == {"worker": 5}
+
 
 class AutoscalingTest(unittest.TestCase):
     def setUp(self):
@@ -851,6 +910,71 @@ class AutoscalingTest(unittest.TestCase):
         assert autoscaler.num_launches_pending.value == 0
         assert len(self.provider.non_terminated_nodes({})) == 1
 
+    def testScaleUpBasedOnResourceDemands(self):
+        config = SMALL_CLUSTER.copy()
+        config["min_workers"] = 0
+        config["max_workers"] = 1000
+        config["target_utilization_fraction"] = 1.0
+        config["worker_nodes"] = {"Resources": {"CPU": 4, "GPU": 1}}
+        config_path = self.write_config(config)
+        self.provider = MockProvider()
+        lm = LoadMetrics()
+        runner = MockProcessRunner()
+        autoscaler = StandardAutoscaler(
+            config_path,
+            lm,
+            max_launch_batch=10,
+            max_concurrent_launches=10,
+            max_failures=0,
+            process_runner=runner,
+            update_interval_s=0)
+        local_ip = services.get_node_ip_address()
+
+        # Thousands of queued tasks are packed onto the worker node shape.
+        lm.update(local_ip, {"CPU": 4}, {"CPU": 0}, {"CPU": 2000})
+        assert autoscaler.target_num_workers() == 500
+        lm.update(local_ip, {"CPU": 4}, {"CPU": 0}, {"CPU": 300, "GPU": 300})
+        assert autoscaler.target_num_workers() == 300
+        lm.update(local_ip, {"CPU": 4}, {"CPU": 4}, {})
+        autoscaler.request_resources({"GPU": 8})
+        assert autoscaler.target_num_workers() == 8
+        autoscaler.request_resources([{"CPU": 3, "GPU": 1}] * 10)
+        assert autoscaler.target_num_workers() == 10
+        autoscaler.resource_requests.clear()
+        autoscaler.resource_request_bundles = []
+
+        # Launched workers count as empty nodes until they report.
+        lm.update(local_ip, {"CPU": 4}, {"CPU": 0}, {"CPU": 20})
+        autoscaler.update()
+        self.waitForNodes(5)
+        autoscaler.update()
+        self.waitForNodes(5)
+        for i in range(5):
+            lm.update("172.0.0.{}".format(i), {
+                "CPU": 4,
+                "GPU": 1
+            }, {
+                "CPU": 0,
+                "GPU": 1
+            }, {})
+        lm.update(local_ip, {"CPU": 4}, {"CPU": 0}, {"CPU": 4})
+        autoscaler.update()
+        self.waitForNodes(6)
+
+        # Scales down once the load is gone.
+        lm.update(local_ip, {"CPU": 4}, {"CPU": 4}, {})
+        for i in range(6):
+            lm.update("172.0.0.{}".format(i), {
+                "CPU": 4,
+                "GPU": 1
+            }, {
+                "CPU": 4,
+                "GPU": 1
+            }, {})
+            lm.last_used_time_by_ip["172.0.0.{}".format(i)] = 0
+        autoscaler.update()
+        self.waitForNodes(0)
+
     def testDontScaleBelowTarget(self):
         config = SMALL_CLUSTER.copy()
         config["min_workers"] = 0
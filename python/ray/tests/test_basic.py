@@ -429,6 +429,30 @@ def test_passing_arguments_by_value_out_of_the_box(ray_start_regular):
     ray.get(ray.put(Foo))
 
 
+def test_small_arguments_passed_by_value():
+    # These arguments are inlined in the task spec instead of being put in
+    # the object store.
+    small_values = [
+        np.int64(5),
+        np.float32(1.9),
+        np.zeros(10),
+        {1, (1, 2, "hi")},
+        frozenset([1, 2]),
+        [np.uint8(3), (np.float64(1.0), )],
+    ]
+    large_values = [
+        np.zeros(10**6),
+        set(range(10**5)),
+        np.array([object()]),
+        {1, object()},
+        collections.deque([1, 2]),
+    ]
+    for value in small_values:
+        assert ray._raylet.check_simple_value(value)
+    for value in large_values:
+        assert not ray._raylet.check_simple_value(value)
+
+
 def test_putting_object_that_closes_over_object_id(ray_start_regular):
     # This test is here to prevent a regression of
     # https://github.com/ray-project/ray/issues/1317.
@@ -930,6 +954,35 @@ def test_submit_api(shutdown_only):
     assert ray.get([id1, id2, id3, id4]) == [0, 1, "test", 2]
 
 
+def test_batch_submit_api(shutdown_only):
+    ray.init(num_cpus=2, num_gpus=1)
+
+    @ray.remote
+    def f(x, y=0):
+        return x + y
+
+    @ray.remote
+    def g():
+        return ray.get_gpu_ids()
+
+    @ray.remote
+    def h(x):
+        return x, x
+
+    assert ray.get(f.map(range(10))) == list(range(10))
+    assert f.map([]) == []
+    assert ray.get(f.remote_batch([[1], [2, 3]])) == [1, 5]
+    assert ray.get(f.remote_batch([[1], [2]], [{"y": 1}, {}])) == [2, 2]
+    with pytest.raises(ValueError):
+        f.remote_batch([[1], [2]], [{}])
+    id_pairs = h.remote_batch([[1], [2]], num_return_vals=2)
+    assert [ray.get(ids) for ids in id_pairs] == [[1, 1], [2, 2]]
+    assert f.remote_batch([[1]], num_return_vals=0) == [None]
+    assert ray.get(g.remote_batch([[]], num_gpus=1)) == [[0]]
+    # The options of earlier calls don't affect later ones.
+    assert ray.get(g.remote()) == []
+
+
 def test_many_fractional_resources(shutdown_only):
     ray.init(num_cpus=2, num_gpus=2, resources={"Custom": 2})
 
@@ -1004,6 +1057,32 @@ def test_get_multiple(ray_start_regular):
     assert results == indices
 
 
+def test_put_many_and_parallel_get(ray_start_regular):
+    class Foo(object):
+        def __init__(self, x):
+            self.x = x
+
+        def __eq__(self, other):
+            return type(other) is Foo and self.x == other.x
+
+    values = [1, "h", b"raw", [1] * 10, np.arange(1000), Foo(1), {"a": 2}]
+    object_ids = ray.put_many(values)
+    assert len(object_ids) == len(values)
+    assert all(object_id.get_buffer_ref() for object_id in object_ids)
+    results = ray.get(object_ids)
+    assert results[:4] == values[:4]
+    assert np.array_equal(results[4], values[4])
+    assert results[5:] == values[5:]
+
+    assert ray.put_many([]) == []
+    object_ids = ray.put_many(list(range(100)), weakref=True)
+    assert ray.get(object_ids, parallel=True) == list(range(100))
+
+    arrays = [np.ones(10**5) * i for i in range(10)]
+    results = ray.get(ray.put_many(arrays), parallel=True)
+    assert all(np.array_equal(a, b) for a, b in zip(arrays, results))
+
+
 def test_get_multiple_experimental(ray_start_regular):
     object_ids = [ray.put(i) for i in range(10)]
 
@@ -1223,6 +1302,7 @@ def test_profiling_api(ray_start_2_cpus):
         expected_types = [
             "worker_idle",
             "task",
+            "task:fetch_arguments",
             "task:deserialize_arguments",
             "task:execute",
             "task:store_outputs",
@@ -3061,6 +3141,34 @@ def test_load_code_from_local(shutdown_only):
     assert ray.get(base_actor.get_data.remote()) == message
 
 
+def test_lazy_function_import(shutdown_only, monkeypatch):
+    # The workers started by the raylet inherit the environment.
+    monkeypatch.setenv("RAY_LAZY_FUNCTION_IMPORT", "1")
+    monkeypatch.setenv("RAY_FUNCTION_CACHE_SIZE", "2")
+    ray.init(num_cpus=1)
+
+    def make_function(i):
+        def f():
+            manager = ray.worker.global_worker.function_actor_manager
+            return i, manager.lazy_import, len(manager._cached_functions)
+
+        # Functions with the same name and source get the same function ID.
+        f.__name__ = "f_{}".format(i)
+        return ray.remote(f)
+
+    functions = [make_function(i) for i in range(5)]
+    # Evicted functions are imported again when they are used.
+    for _ in range(2):
+        for i, f in enumerate(functions):
+            result, lazy_import, num_cached = ray.get(f.remote())
+            assert result == i
+            assert lazy_import
+            assert 1 <= num_cached <= 2
+    # Test that actor classes are imported on demand too.
+    actor = WithConstructor.remote(1)
+    assert ray.get(actor.get_data.remote()) == 1
+
+
 def test_shutdown_disconnect_global_state():
     ray.init(num_cpus=0)
     ray.shutdown()
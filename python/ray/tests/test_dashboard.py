@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+
+import pytest
+
+import ray
+
+
+def test_compute_and_apply_delta():
+    old = {
+        "cpu": 10.0,
+        "workers": {
+            "1": {
+                "pid": 1,
+                "cpu_percent": 5.0
+            },
+            "2": {
+                "pid": 2,
+                "cpu_percent": 0.0
+            },
+        },
+        "load_avg": [[0.5, 0.4, 0.3], [0.1, 0.1, 0.1]],
+    }
+    new = {
+        "cpu": 12.0,
+        "workers": {
+            "1": {
+                "pid": 1,
+                "cpu_percent": 5.0
+            },
+            "3": {
+                "pid": 3,
+                "cpu_percent": 50.0
+            },
+        },
+        "load_avg": [[0.5, 0.4, 0.3], [0.1, 0.1, 0.1]],
+    }
+    delta = ray.utils.compute_delta(old, new)
+    assert delta == {
+        "cpu": 12.0,
+        "workers": {
+            "3": {
+                "pid": 3,
+                "cpu_percent": 50.0
+            },
+            ray.utils.DELTA_REMOVED_KEY: ["2"],
+        },
+    }
+    assert ray.utils.apply_delta(old, delta) == new
+    assert ray.utils.compute_delta(new, new) == {}
+
+
+def _node_stats_message(seq, workers, delta=False, hostname="node1"):
+    stats = {
+        "now": 0,
+        "hostname": hostname,
+        "boot_time": 1,
+        "workers": {
+            str(pid): {
+                "pid": pid,
+                "name": "ray_worker"
+            }
+            for pid in workers
+        },
+        "cpus": [4, 8],
+        "mem": [100, 50, 50],
+        "disk": {
+            "/": {
+                "free": 10,
+                "total": 20
+            }
+        },
+        "load_avg": [[1.0, 1.0, 1.0]],
+        "net": [0, 0],
+    }
+    message = {"hostname": hostname, "seq": seq}
+    if delta:
+        message["delta"] = {"workers": stats["workers"]}
+    else:
+        message["stats"] = stats
+    return message
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 5, 3), reason="requires python3.5.3 or higher")
+def test_node_stats_seq_gap(call_ray_start):
+    pytest.importorskip("aiohttp")
+    from ray.dashboard.dashboard import NodeStats
+
+    node_stats = NodeStats(call_ray_start)
+
+    def num_workers():
+        return node_stats.calculate_totals()["n_workers"]
+
+    # Deltas are ignored until the first full report
+    node_stats.update_node(_node_stats_message(0, [1, 2], delta=True))
+    assert num_workers() == 0
+    node_stats.update_node(_node_stats_message(1, [1]))
+    assert num_workers() == 1
+    node_stats.update_node(_node_stats_message(2, [1, 2], delta=True))
+    assert num_workers() == 2
+    assert node_stats.calculate_tasks() == {"ray_worker": 2}
+
+    # Report 3 is missed, so the following deltas are ignored
+    node_stats.update_node(_node_stats_message(4, [1, 2, 3], delta=True))
+    node_stats.update_node(_node_stats_message(5, [1, 2, 3, 4], delta=True))
+    assert num_workers() == 2
+
+    # The next full report resynchronizes the node, and deltas apply again
+    node_stats.update_node(_node_stats_message(6, [1, 2, 3]))
+    assert num_workers() == 3
+    node_stats.update_node(_node_stats_message(7, [1, 2, 3, 4], delta=True))
+    assert num_workers() == 4
+    assert node_stats.calculate_tasks() == {"ray_worker": 4}
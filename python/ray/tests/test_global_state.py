@@ -7,6 +7,8 @@ try:
     import pytest_timeout
 except ImportError:
     pytest_timeout = None
+import json
+import os
 import time
 
 import ray
@@ -78,3 +80,84 @@ def test_add_remove_cluster_resources(ray_start_cluster_head):
         nodes += [cluster.add_node(num_cpus=1)]
     cluster.wait_for_nodes()
     assert ray.cluster_resources()["CPU"] == 6
+
+
+def test_batched_table_scans(ray_start_regular, monkeypatch):
+    # Use a tiny batch size so that the scans span many Redis pipelines.
+    monkeypatch.setattr(ray.ray_constants, "GCS_SCAN_BATCH_SIZE", 3)
+
+    @ray.remote
+    def f():
+        with ray.profile("custom_event"):
+            pass
+
+    ray.get([f.remote() for _ in range(20)])
+
+    task_keys = ray.state.state._keys(
+        ray.gcs_utils.TablePrefix_RAYLET_TASK_string + "*")
+    task_table = ray.tasks()
+    assert len(task_table) == len(task_keys)
+    for task_id, task_info in task_table.items():
+        assert task_info == ray.tasks(task_id)
+    assert len(ray.tasks(limit=5)) == 5
+
+    object_keys = ray.state.state._keys(
+        ray.gcs_utils.TablePrefix_OBJECT_string + "*")
+    assert len(ray.objects()) == len(object_keys)
+    assert len(list(ray.state.state.iter_object_table(limit=2))) == 2
+
+    # The profiling information only flushes once every second.
+    start_time = time.time()
+    while not ray.state.state.profile_table(limit=1):
+        assert time.time() - start_time < 10
+        time.sleep(0.5)
+    events = list(ray.state.state.iter_profile_events())
+    window_start = min(event["start_time"] for event in events)
+    window_end = window_start + 1e-6
+    windowed = list(
+        ray.state.state.iter_profile_events(
+            start_time=window_start, end_time=window_end))
+    assert 0 < len(windowed) <= len(events)
+    for event in windowed:
+        assert event["end_time"] >= window_start
+        assert event["start_time"] <= window_end
+    for event in ray.state.state.iter_profile_events(
+            component_types=["worker"]):
+        assert event["component_type"] == "worker"
+
+
+def test_streaming_timeline(ray_start_regular, tmpdir):
+    @ray.remote
+    def f():
+        pass
+
+    ray.get([f.remote() for _ in range(10)])
+
+    # The profiling information only flushes once every second.
+    start_time = time.time()
+    while not any(event["cat"] == "task" for event in ray.timeline()):
+        assert time.time() - start_time < 10
+        time.sleep(0.5)
+    events = ray.timeline()
+
+    json_file = os.path.join(str(tmpdir), "timeline.json")
+    ray.timeline(filename=json_file)
+    with open(json_file) as f:
+        assert len(json.load(f)) >= len(events)
+
+    # Convert a columnar dump back to a Chrome tracing file.
+    columnar_file = os.path.join(str(tmpdir), "timeline.bin")
+    converted_file = os.path.join(str(tmpdir), "converted.json")
+    ray.timeline(filename=columnar_file, output_format="columnar")
+    ray.state.columnar_timeline_to_chrome_tracing(columnar_file,
+                                                  converted_file)
+    with open(converted_file) as f:
+        converted = json.load(f)
+    assert len(converted) >= len(events)
+    assert {event["cat"] for event in converted} >= {"task"}
+
+    assert len(ray.timeline(limit=3)) == 3
+    assert not any(event["cat"] == "task"
+                   for event in ray.timeline(sample_rates={"task": 0.0}))
+    assert not ray.timeline(end_time=0)
+    assert not ray.timeline(component_types=["nonexistent"])
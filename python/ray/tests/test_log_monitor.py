@@ -0,0 +1,94 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+import ray
+import ray.ray_constants as ray_constants
+from ray.log_monitor import LogMonitor
+
+
+class FakeRedisClient(object):
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, channel, message):
+        assert channel == ray.gcs_utils.LOG_FILE_CHANNEL
+        self.messages.append(json.loads(message))
+
+
+def make_log_monitor(logs_dir):
+    log_monitor = LogMonitor(logs_dir, "127.0.0.1:6379")
+    log_monitor.redis_client = FakeRedisClient()
+    return log_monitor
+
+
+def check_and_publish(log_monitor):
+    log_monitor.update_log_filenames()
+    log_monitor.open_closed_files()
+    return log_monitor.check_log_files_and_publish_updates()
+
+
+def test_log_monitor_batches_files(tmpdir):
+    logs_dir = str(tmpdir)
+    log_monitor = make_log_monitor(logs_dir)
+    for pid in [1, 2]:
+        with open(os.path.join(logs_dir, "worker-{}.out".format(pid)),
+                  "w") as f:
+            f.write("Ray worker pid: {}\nhello\nworld\n".format(pid))
+
+    assert check_and_publish(log_monitor)
+    # The lines of both files are published in one message.
+    assert len(log_monitor.redis_client.messages) == 1
+    updates = sorted(
+        log_monitor.redis_client.messages[0], key=lambda u: u["pid"])
+    assert [u["pid"] for u in updates] == [1, 2]
+    assert all(u["lines"] == ["hello", "world"] for u in updates)
+
+    assert not check_and_publish(log_monitor)
+    with open(os.path.join(logs_dir, "worker-1.out"), "a") as f:
+        f.write("partial")
+    assert check_and_publish(log_monitor)
+    assert log_monitor.redis_client.messages[-1] == [{
+        "ip": log_monitor.ip,
+        "pid": 1,
+        "lines": ["partial"]
+    }]
+
+
+def test_log_monitor_chunked_reads(tmpdir, monkeypatch):
+    monkeypatch.setattr(ray_constants, "LOG_MONITOR_MAX_READ_BYTES", 10)
+    logs_dir = str(tmpdir)
+    log_monitor = make_log_monitor(logs_dir)
+    with open(os.path.join(logs_dir, "raylet.err"), "w") as f:
+        f.write("line 1\nline 2\nline 3\nlong line 4\n")
+
+    for _ in range(5):
+        check_and_publish(log_monitor)
+    lines = [
+        line for message in log_monitor.redis_client.messages
+        for update in message for line in update["lines"]
+    ]
+    # Lines are only split if a single line is longer than a chunk.
+    assert lines == ["line 1", "line 2", "line 3", "long line ", "4"]
+
+
+def test_log_monitor_limits(tmpdir, monkeypatch):
+    monkeypatch.setattr(ray_constants, "LOG_MONITOR_MAX_LINES_PER_SECOND", 2)
+    monkeypatch.setattr(ray_constants, "LOG_MONITOR_MAX_LINE_LENGTH", 5)
+    logs_dir = str(tmpdir)
+    log_monitor = make_log_monitor(logs_dir)
+    with open(os.path.join(logs_dir, "worker-1.out"), "w") as f:
+        f.write("Ray worker pid: 1\n")
+    log_monitor.update_log_filenames()
+    file_info = log_monitor.closed_file_infos[0]
+
+    assert log_monitor.limit_lines(file_info, ["a", "b", "c"],
+                                   100) == ["a", "b"]
+    assert log_monitor.limit_lines(file_info, ["d"], 100.5) == []
+    assert log_monitor.limit_lines(file_info, ["e", "toolong"], 101) == [
+        "... (2 lines dropped, more than 2 lines per second)", "e",
+        "toolo... (line truncated)"
+    ]
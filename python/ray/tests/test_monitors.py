@@ -35,10 +35,16 @@ def _test_cleanup_on_driver_exit(num_redis_shards):
         task_tbl_len = len(ray.tasks())
         return obj_tbl_len, task_tbl_len
 
-    def Driver(success):
+    def JobIndexSize(job_id):
+        index_key = ray.gcs_utils.JOB_INDEX_PREFIX + job_id
+        return sum(
+            redis.scard(index_key) for redis in ray.state.state.redis_clients)
+
+    def Driver(success, job_id):
         success.value = True
         # Start driver.
         ray.init(address=address)
+        job_id.raw = ray.worker.global_worker.current_job_id.binary()
         summary_start = StateSummary()
         if (0, 1) != summary_start:
             success.value = False
@@ -70,10 +76,15 @@ def _test_cleanup_on_driver_exit(num_redis_shards):
                 success.value = False
                 break
 
+        # All task and object entries of the driver are indexed.
+        if JobIndexSize(job_id.raw) != 6:
+            success.value = False
+
         ray.shutdown()
 
     success = multiprocessing.Value("b", False)
-    driver = multiprocessing.Process(target=Driver, args=(success, ))
+    job_id = multiprocessing.Array("c", ray.JobID.size())
+    driver = multiprocessing.Process(target=Driver, args=(success, job_id))
     driver.start()
     # Wait for client to exit.
     driver.join()
@@ -89,6 +100,7 @@ def _test_cleanup_on_driver_exit(num_redis_shards):
         if attempts == max_attempts_before_failing:
             break
     assert (0, 1) == StateSummary()
+    assert JobIndexSize(job_id.raw) == 0
 
     ray.shutdown()
     subprocess.check_output(["ray", "stop"])
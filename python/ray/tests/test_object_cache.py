@@ -0,0 +1,87 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import pytest
+
+import ray
+from ray.object_cache import ObjectCache
+
+
+def test_object_cache_eviction():
+    cache = ObjectCache(100)
+    ids = [ray.ObjectID.from_random() for _ in range(4)]
+    cache.add(ids[0], "a", 40)
+    cache.add(ids[1], "b", 40)
+    # Looking up the first object makes the second one the oldest.
+    values, missing, bytes_saved = cache.lookup([ids[0], ids[2]])
+    assert values == ["a", None]
+    assert missing == [1]
+    assert bytes_saved == 40
+    cache.add(ids[2], "c", 40)
+    assert ids[0] in cache and ids[1] not in cache and ids[2] in cache
+    assert cache.num_bytes == 80
+    # Values larger than the cache are not added.
+    cache.add(ids[3], "d", 101)
+    assert ids[3] not in cache
+    assert cache.stats() == {
+        "num_objects": 2,
+        "num_bytes": 80,
+        "num_hits": 1,
+        "num_misses": 1,
+        "bytes_saved": 40,
+    }
+
+
+def test_get_with_cache(ray_start_regular):
+    array = np.arange(1000)
+    object_id = ray.put(array)
+    worker = ray.worker.global_worker
+
+    value = ray.get(object_id, cache=True)
+    assert np.array_equal(value, array)
+    assert ray.get(object_id, cache=True) is value
+    assert ray.get(object_id) is not value
+    assert worker.object_cache.num_hits == 1
+    assert worker.object_cache.num_misses == 1
+    assert worker.object_cache.bytes_saved >= array.nbytes
+
+    # Errors are not cached.
+    @ray.remote
+    def fail():
+        raise ValueError("failed")
+
+    error_id = fail.remote()
+    for _ in range(2):
+        with pytest.raises(ray.exceptions.RayTaskError):
+            ray.get(error_id, cache=True)
+    assert error_id not in worker.object_cache
+
+
+def test_cache_arguments(ray_start_regular):
+    @ray.remote
+    @ray.cache_arguments
+    def f(table, i):
+        return id(table), table[i]
+
+    @ray.remote
+    class Actor(object):
+        @ray.cache_arguments
+        def f(self, table, i):
+            return id(table), table[i]
+
+        def cache_stats(self):
+            return ray.worker.global_worker.object_cache.stats()
+
+    table_id = ray.put(np.arange(1000))
+    actor = Actor.remote()
+    results = ray.get([actor.f.remote(table_id, i) for i in range(10)])
+    # The table is deserialized only once.
+    assert len({table for table, _ in results}) == 1
+    assert [value for _, value in results] == list(range(10))
+    stats = ray.get(actor.cache_stats.remote())
+    assert stats["num_misses"] == 1
+    assert stats["num_hits"] == 9
+
+    assert ray.get(f.remote(table_id, 5))[1] == 5
@@ -0,0 +1,170 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import pytest
+
+import ray
+import ray.ray_constants as ray_constants
+from ray.object_store_profiler import (
+    summarize, format_summary, SET_BUFFER_REF, ARGUMENT_IN_FLIGHT, NOT_PINNED)
+from ray.tests.utils import run_string_as_driver, wait_for_condition
+
+
+def test_summarize():
+    objects = [
+        {
+            "callsite": "a.py:1 (f)",
+            "kind": "put",
+            "size": 100,
+            "reason": SET_BUFFER_REF
+        },
+        {
+            "callsite": "a.py:1 (f)",
+            "kind": "put",
+            "size": 50,
+            "reason": NOT_PINNED
+        },
+        {
+            "callsite": "b.py:2 (g)",
+            "kind": "task return",
+            "size": 10,
+            "reason": NOT_PINNED
+        },
+        {
+            "callsite": "b.py:2 (g)",
+            "kind": "task return",
+            "size": 10,
+            "reason": NOT_PINNED
+        },
+        {
+            "callsite": "b.py:2 (g)",
+            "kind": "task return",
+            "size": 10,
+            "reason": NOT_PINNED
+        },
+    ]
+    rows = summarize(objects)
+    assert rows[0] == {
+        "callsite": "a.py:1 (f)",
+        "kind": "put",
+        "num_objects": 2,
+        "total_bytes": 150,
+        "bytes_by_reason": {
+            SET_BUFFER_REF: 100,
+            NOT_PINNED: 50
+        },
+    }
+    assert rows[1]["callsite"] == "b.py:2 (g)"
+    rows = summarize(objects, sort_by="count", limit=1)
+    assert [row["callsite"] for row in rows] == ["b.py:2 (g)"]
+    assert "a.py:1 (f)" in format_summary(summarize(objects))
+    with pytest.raises(ValueError):
+        summarize(objects, sort_by="size")
+
+
+def test_memory_summary(shutdown_only, monkeypatch):
+    # The workers started by the raylet inherit the environment.
+    monkeypatch.setenv("RAY_PROFILE_OBJECT_STORE_MEMORY", "1")
+    monkeypatch.setattr(ray_constants, "PROFILE_OBJECT_STORE_MEMORY", True)
+    ray.init(num_cpus=1)
+
+    @ray.remote
+    def f(x):
+        return np.zeros(10**6, dtype=np.uint8)
+
+    x_id = ray.put(np.zeros(5 * 10**6, dtype=np.uint8))
+    ray.get([f.remote(x_id) for _ in range(3)])
+
+    def summary_complete():
+        rows = ray.memory_summary()
+        return (len(rows) == 2
+                and sum(row["num_objects"] for row in rows) == 4)
+
+    # The object table is updated asynchronously.
+    assert wait_for_condition(summary_complete, timeout_ms=10000)
+    put_row, task_row = ray.memory_summary()
+    assert put_row["kind"] == "put"
+    assert "test_memory_summary" in put_row["callsite"]
+    assert put_row["total_bytes"] >= 5 * 10**6
+    assert list(put_row["bytes_by_reason"]) == [SET_BUFFER_REF]
+    assert task_row["kind"] == "task return"
+    assert task_row["num_objects"] == 3
+    assert task_row["total_bytes"] >= 3 * 10**6
+    rows = ray.memory_summary(sort_by="count")
+    assert rows[0]["kind"] == "task return"
+
+    # The pin is released once the ID is collected.
+    del x_id
+
+    def unpinned():
+        # Another put writes the released pin to Redis.
+        ray.put(0)
+        rows = [
+            row for row in ray.memory_summary(limit=None)
+            if row["total_bytes"] >= 5 * 10**6
+        ]
+        return rows and list(rows[0]["bytes_by_reason"]) == [NOT_PINNED]
+
+    assert wait_for_condition(unpinned, timeout_ms=10000)
+
+
+def test_memory_summary_arguments_in_flight(shutdown_only, monkeypatch):
+    monkeypatch.setenv("RAY_PROFILE_OBJECT_STORE_MEMORY", "1")
+    monkeypatch.setattr(ray_constants, "PROFILE_OBJECT_STORE_MEMORY", True)
+    ray.init(num_cpus=1)
+
+    # The task waits for the signal object, which is put later.
+    @ray.remote
+    def wait(signal, x):
+        return signal
+
+    signal_id = ray.ObjectID.from_random()
+    x_id = ray.put(np.zeros(10**6, dtype=np.uint8), weakref=True)
+    result_id = wait.remote(signal_id, x_id)
+
+    def in_flight():
+        rows = [row for row in ray.memory_summary() if row["kind"] == "put"]
+        return (rows
+                and list(rows[0]["bytes_by_reason"]) == [ARGUMENT_IN_FLIGHT])
+
+    assert wait_for_condition(in_flight, timeout_ms=10000)
+    ray.worker.global_worker.put_object(signal_id, 1)
+    assert ray.get(result_id) == 1
+
+    def not_in_flight():
+        rows = [row for row in ray.memory_summary() if row["kind"] == "put"]
+        return rows and list(rows[0]["bytes_by_reason"]) == [NOT_PINNED]
+
+    assert wait_for_condition(not_in_flight, timeout_ms=10000)
+
+
+def test_profile_removed_with_job(shutdown_only, monkeypatch):
+    # The other driver and the workers inherit the environment.
+    monkeypatch.setenv("RAY_PROFILE_OBJECT_STORE_MEMORY", "1")
+    address_info = ray.init(num_cpus=1)
+
+    driver_script = """
+import ray
+ray.init(address="{}")
+x_id = ray.put(0)
+@ray.remote
+def f(x):
+    return x
+assert ray.get(f.remote(x_id)) == 0
+assert ray.worker.global_worker.redis_client.keys(b"ObjectStoreProfile*")
+print("success")
+""".format(address_info["redis_address"])
+    out = run_string_as_driver(driver_script)
+    assert "success" in out
+
+    # The monitor removes the profile of the job when the driver exits.
+    redis_client = ray.worker.global_worker.redis_client
+    assert wait_for_condition(
+        lambda: not redis_client.keys(b"ObjectStore*"), timeout_ms=10000)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main(["-v", __file__]))
@@ -119,3 +119,100 @@ def test_queue(ray_start_regular):
         assert q.get() == item
         size -= 1
         assert q.qsize() == size
+
+
+def test_queue_batch(ray_start_regular):
+    q = Queue()
+    assert q.empty()
+
+    items = list(range(10))
+    q.put_batch(items)
+    assert not q.empty()
+    assert q.get_batch(3) == items[:3]
+    assert q.get_batch(100) == items[3:]
+
+    with pytest.raises(Empty):
+        q.get_batch(1, block=False)
+
+    with pytest.raises(Empty):
+        q.get_batch(1, timeout=0.2)
+
+    with pytest.raises(ValueError):
+        q.get_batch(0)
+
+    # Batch puts are all-or-nothing when not blocking.
+    q = Queue(3)
+    q.put(0)
+    with pytest.raises(Full):
+        q.put_batch([1, 2, 3], block=False)
+    assert q.qsize() == 1
+    q.put_batch([1, 2], block=False)
+    assert q.full()
+
+    # Blocking batch puts add the items as room frees up.
+    @ray.remote
+    def put_batch_async(queue, items):
+        queue.put_batch(items)
+
+    put_id = put_batch_async.remote(q, [3, 4, 5])
+    received = []
+    while len(received) < 6:
+        received.extend(q.get_batch(2))
+    assert received == list(range(6))
+    ray.get(put_id)
+
+    with pytest.raises(Full):
+        q.put_batch([0, 1, 2, 3], timeout=0.2)
+
+
+def test_queue_parks_waiters(ray_start_regular):
+    @ray.remote
+    def get_async(queue):
+        return queue.get()
+
+    q = Queue(1)
+
+    # Consumers are parked in the actor and served in FIFO order.
+    consumers = [get_async.remote(q) for _ in range(5)]
+    time.sleep(0.5)
+    ready, _ = ray.wait(consumers, timeout=0)
+    assert not ready
+    for item in range(5):
+        q.put(item)
+    assert set(ray.get(consumers)) == set(range(5))
+
+    # Parked consumers are served in the order they called the actor.
+    getters = []
+    for _ in range(3):
+        ready, object_id = ray.get(q.actor.get_wait.remote())
+        assert not ready
+        getters.append(ray.ObjectID(object_id))
+    q.put_batch([0, 1, 2])
+    assert ray.get(getters) == [0, 1, 2]
+
+    # Parked producers are admitted in the order they called the actor.
+    q.put(0)
+    ack_ids = [ray.get(q.actor.put_wait.remote([item])) for item in [1, 2]]
+    assert [q.get() for _ in range(3)] == [0, 1, 2]
+    assert ray.get(
+        [ray.ObjectID(ack_id) for ack_id in ack_ids]) == [True, True]
+
+    # A timed out consumer does not take an item.
+    with pytest.raises(Empty):
+        q.get(timeout=0.1)
+    q.put(0)
+    assert q.get() == 0
+
+
+def test_queue_waiter_actor_died(ray_start_regular):
+    @ray.remote
+    def get_async(queue):
+        return queue.get()
+
+    q = Queue()
+    consumer = get_async.remote(q)
+    time.sleep(0.5)
+    q.actor.__ray_terminate__.remote()
+    # The parked consumer fails instead of waiting forever.
+    with pytest.raises(ray.exceptions.RayError):
+        ray.get(consumer)
@@ -341,6 +341,52 @@ def resources_from_resource_arguments(
 
 _default_handler = None
 
+# The key under which compute_delta lists the keys that were removed.
+DELTA_REMOVED_KEY = "__removed__"
+
+
+def compute_delta(old, new):
+    """Computes the changes from one JSON-like dict to another.
+
+    Nested dicts are compared recursively, all other values are replaced
+    as a whole if they changed.
+
+    Args:
+        old: The previous dict.
+        new: The current dict.
+
+    Returns:
+        A dict of the changed keys, which turns old into new when passed to
+            apply_delta. It is empty if nothing changed.
+    """
+    delta = {}
+    for key, value in new.items():
+        if key not in old:
+            delta[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested_delta = compute_delta(old[key], value)
+            if nested_delta:
+                delta[key] = nested_delta
+        elif old[key] != value:
+            delta[key] = value
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta[DELTA_REMOVED_KEY] = removed
+    return delta
+
+
+def apply_delta(state, delta):
+    """Applies a delta from compute_delta to a dict in place."""
+    for key, value in delta.items():
+        if key == DELTA_REMOVED_KEY:
+            for removed_key in value:
+                state.pop(removed_key, None)
+        elif isinstance(value, dict) and isinstance(state.get(key), dict):
+            apply_delta(state[key], value)
+        else:
+            state[key] = value
+    return state
+
 
 def setup_logger(logging_level, logging_format):
     """Setup default logging for ray."""
@@ -11,6 +11,7 @@ import inspect
 import io
 import json
 import logging
+from multiprocessing.pool import ThreadPool
 import numpy as np
 import os
 import redis
@@ -31,6 +32,8 @@ import ray.experimental.signal as ray_signal
 import ray.experimental.no_return
 import ray.gcs_utils
 import ray.memory_monitor as memory_monitor
+import ray.object_store_profiler as object_store_profiler
+from ray.object_cache import ObjectCache
 import ray.node
 import ray.parameter
 import ray.ray_constants as ray_constants
@@ -139,10 +142,20 @@ class Worker(object):
         # The number of threads Plasma should use when putting an object in the
         # object store.
         self.memcopy_threads = 12
+        # The number of threads used to deserialize objects when ray.get is
+        # called with parallel=True, and the pool of these threads.
+        self.deserialization_threads = 4
+        self._deserialization_pool = None
+        # Deserialized objects that are read with ray.get(cache=True) or by
+        # remote functions annotated with ray.cache_arguments.
+        self.object_cache = ObjectCache(ray_constants.OBJECT_CACHE_SIZE_BYTES)
         # When the worker is constructed. Record the original value of the
         # CUDA_VISIBLE_DEVICES environment variable.
         self.original_gpu_ids = ray.utils.get_cuda_visible_devices()
         self.memory_monitor = memory_monitor.MemoryMonitor()
+        # Records the callsites of new objects if
+        # RAY_PROFILE_OBJECT_STORE_MEMORY is set.
+        self.object_store_profiler = None
         # A dictionary that maps from driver id to SerializationContext
         # TODO: clean up the SerializationContext once the job finished.
         self.serialization_context_map = {}
@@ -406,10 +419,80 @@ class Worker(object):
                     self.dump_object_store_memory_usage()
                     raise e
 
+    def put_objects(self, object_ids, values):
+        """Put many values in the local object store.
+
+        The values are serialized first and then written to the object store
+        with a single core worker call. Values that need special handling,
+        e.g. raw bytes or classes that don't have a serializer registered
+        yet, are stored with `put_object` instead.
+
+        Args:
+            object_ids (List[object_id.ObjectID]): The object IDs of the
+                values to be put.
+            values (list): The values to put in the object store.
+
+        Raises:
+            ray.exceptions.ObjectStoreFullError: This is raised if the attempt
+                to store the objects fails because the object store is full
+                even after multiple retries.
+        """
+        serialization_context = self.get_serialization_context(
+            self.current_job_id)
+        batch_ids = []
+        serialized_objects = []
+        for object_id, value in zip(object_ids, values):
+            if USE_NEW_SERIALIZER or isinstance(value, (bytes, ObjectID)):
+                self.put_object(object_id, value)
+                continue
+            try:
+                serialized_object = pyarrow.serialize(value,
+                                                      serialization_context)
+            except (pyarrow.SerializationCallbackError, TypeError):
+                # Let put_object register a serializer for this class.
+                self.put_object(object_id, value)
+                continue
+            batch_ids.append(object_id)
+            serialized_objects.append(serialized_object)
+
+        if not batch_ids:
+            return
+        delay = ray_constants.DEFAULT_PUT_OBJECT_DELAY
+        for attempt in reversed(
+                range(ray_constants.DEFAULT_PUT_OBJECT_RETRIES)):
+            try:
+                # Objects that were stored by a failed attempt are skipped.
+                self.core_worker.put_serialized_objects(
+                    serialized_objects,
+                    batch_ids,
+                    memcopy_threads=self.memcopy_threads)
+                break
+            except ObjectStoreFullError as e:
+                if attempt:
+                    logger.warning("Waiting {} seconds for space to free up "
+                                   "in the object store.".format(delay))
+                    time.sleep(delay)
+                    delay *= 2
+                else:
+                    self.dump_object_store_memory_usage()
+                    raise e
+
     def dump_object_store_memory_usage(self):
-        """Prints object store debug string to stdout."""
+        """Prints object store debug string to stdout.
+
+        If the object store is profiled, this also prints the callsites that
+        created the most bytes in the object store.
+        """
         logger.warning("Local object store memory usage:\n{}\n".format(
             self.core_worker.object_store_memory_usage_string()))
+        if self.object_store_profiler is not None:
+            try:
+                summary = ray.state.state.memory_summary(limit=10)
+            except Exception:
+                logger.exception("Failed to summarize the object store.")
+                return
+            logger.warning("Top object store memory users:\n{}\n".format(
+                object_store_profiler.format_summary(summary)))
 
     def store_with_plasma(self, object_id, value):
         """Serialize and store an object.
@@ -468,25 +551,83 @@ class Worker(object):
             logger.warning(warning_message)
             self.store_and_register(object_id, value)
 
-    def retrieve_and_deserialize(self, object_ids, error_timeout=10):
+    def retrieve_and_deserialize(self,
+                                 object_ids,
+                                 error_timeout=10,
+                                 parallel=False):
         data_metadata_pairs = self.core_worker.get_objects(
             object_ids, self.current_task_id)
+        return self.deserialize_objects(
+            data_metadata_pairs,
+            object_ids,
+            error_timeout=error_timeout,
+            parallel=parallel)
+
+    def deserialize_objects(self,
+                            data_metadata_pairs,
+                            object_ids,
+                            error_timeout=10,
+                            parallel=False,
+                            parallel_min_bytes=0):
+        """Deserializes objects read from the object store.
+
+        Args:
+            data_metadata_pairs: The data and metadata buffers of the objects.
+            object_ids: The IDs of the objects.
+            error_timeout: Seconds after which to warn that a class definition
+                that is needed to deserialize an object has not arrived.
+            parallel (bool): Whether to deserialize the objects on a thread
+                pool.
+            parallel_min_bytes (int): The thread pool is only used if the
+                objects have at least this many bytes of data in total, since
+                small objects deserialize faster than the pool dispatches.
+
+        Returns:
+            The deserialized objects.
+        """
         assert len(data_metadata_pairs) == len(object_ids)
 
         start_time = time.time()
         serialization_context = self.get_serialization_context(
             self.current_job_id)
-        results = []
+        results = [None] * len(object_ids)
+        pending = list(range(len(object_ids)))
+
+        if parallel and len(object_ids) > 1 and parallel_min_bytes > 0:
+            parallel = sum(data.size for data, _ in data_metadata_pairs
+                           if data is not None) >= parallel_min_bytes
+        if parallel and len(object_ids) > 1:
+            # Deserialization of large buffers, e.g. numpy arrays, releases
+            # the GIL, so this can use multiple cores. Objects whose class
+            # definition hasn't been imported yet are retried below.
+            def deserialize(i):
+                data, metadata = data_metadata_pairs[i]
+                try:
+                    return True, self._deserialize_object_from_arrow(
+                        data, metadata, object_ids[i], serialization_context)
+                except pyarrow.DeserializationCallbackError:
+                    return False, None
+
+            if self._deserialization_pool is None:
+                self._deserialization_pool = ThreadPool(
+                    self.deserialization_threads)
+            outputs = self._deserialization_pool.map(deserialize, pending)
+            pending = []
+            for i, (success, value) in enumerate(outputs):
+                if success:
+                    results[i] = value
+                else:
+                    pending.append(i)
+
         warning_sent = False
-        i = 0
-        while i < len(object_ids):
-            object_id = object_ids[i]
+        j = 0
+        while j < len(pending):
+            i = pending[j]
             data, metadata = data_metadata_pairs[i]
             try:
-                results.append(
-                    self._deserialize_object_from_arrow(
-                        data, metadata, object_id, serialization_context))
-                i += 1
+                results[i] = self._deserialize_object_from_arrow(
+                    data, metadata, object_ids[i], serialization_context)
+                j += 1
             except pyarrow.DeserializationCallbackError:
                 # Wait a little bit for the import thread to import the class.
                 # If we currently have the worker lock, we need to release it
@@ -539,7 +680,7 @@ class Worker(object):
             # Object isn't available in plasma.
             return plasma.ObjectNotAvailable
 
-    def get_objects(self, object_ids):
+    def get_objects(self, object_ids, parallel=False, cache=False):
         """Get the values in the object store associated with the IDs.
 
         Return the values from the local object store for object_ids. This will
@@ -549,6 +690,10 @@ class Worker(object):
         Args:
             object_ids (List[object_id.ObjectID]): A list of the object IDs
                 whose values should be retrieved.
+            parallel (bool): Whether to deserialize the values on a thread
+                pool.
+            cache (bool): Whether to read the values through the worker's
+                cache of deserialized objects.
 
         Raises:
             Exception if running in LOCAL_MODE and any of the object IDs do not
@@ -564,10 +709,41 @@ class Worker(object):
         if self.mode == LOCAL_MODE:
             return self.local_mode_manager.get_objects(object_ids)
 
-        results = self.retrieve_and_deserialize(object_ids)
+        if cache:
+            return self._get_cached_objects(object_ids, parallel)
+
+        results = self.retrieve_and_deserialize(object_ids, parallel=parallel)
         assert len(results) == len(object_ids)
         return results
 
+    def _get_cached_objects(self, object_ids, parallel, parallel_min_bytes=0):
+        extra_data = {}
+        with profiling.profile("object_cache", extra_data=extra_data):
+            results, missing, bytes_saved = self.object_cache.lookup(
+                object_ids)
+            if missing:
+                missing_ids = [object_ids[i] for i in missing]
+                data_metadata_pairs = self.core_worker.get_objects(
+                    missing_ids, self.current_task_id)
+                values = self.deserialize_objects(
+                    data_metadata_pairs,
+                    missing_ids,
+                    parallel=parallel,
+                    parallel_min_bytes=parallel_min_bytes)
+                for i, (data, _), value in zip(missing, data_metadata_pairs,
+                                               values):
+                    results[i] = value
+                    # Errors are not cached, so that a later read can see
+                    # the reconstructed object.
+                    if (not isinstance(value, RayError)
+                            and value is not plasma.ObjectNotAvailable):
+                        size = data.size if data is not None else 0
+                        self.object_cache.add(object_ids[i], value, size)
+            extra_data["hits"] = str(len(object_ids) - len(missing))
+            extra_data["misses"] = str(len(missing))
+            extra_data["bytes_saved"] = str(bytes_saved)
+        return results
+
     def run_function_on_all_workers(self, function,
                                     run_on_other_drivers=False):
         """Run arbitrary code on all of the workers.
@@ -626,7 +802,10 @@ class Worker(object):
             # operations into a transaction (or by implementing a custom
             # command that does all three things).
 
-    def _get_arguments_for_execution(self, function_name, serialized_args):
+    def _get_arguments_for_execution(self,
+                                     function_name,
+                                     serialized_args,
+                                     cache=False):
         """Retrieve the arguments for the remote function.
 
         This retrieves the values for the arguments to the remote function that
@@ -640,6 +819,8 @@ class Worker(object):
             serialized_args (List): The arguments to the function. These are
                 either strings representing serialized objects passed by value
                 or they are ray.ObjectIDs.
+            cache (bool): Whether to read the arguments through the worker's
+                object cache.
 
         Returns:
             The retrieved arguments in addition to the arguments that were
@@ -661,14 +842,31 @@ class Worker(object):
                 # pass the argument by value
                 arguments[i] = arg
 
-        # Get the objects from the local object store.
-        if len(object_ids) > 0:
-            values = self.get_objects(object_ids)
-            for i, value in enumerate(values):
-                if isinstance(value, RayError):
-                    raise value
-                else:
-                    arguments[object_indices[i]] = value
+        # Get the objects from the local object store. Fetching and
+        # deserialization are profiled as separate phases, and multiple
+        # arguments are deserialized in parallel if they are large.
+        min_bytes = ray_constants.PARALLEL_ARGUMENT_DESERIALIZATION_MIN_BYTES
+        data_metadata_pairs = []
+        with profiling.profile("task:fetch_arguments"):
+            if len(object_ids) > 0 and not cache:
+                data_metadata_pairs = self.core_worker.get_objects(
+                    object_ids, self.current_task_id)
+        with profiling.profile("task:deserialize_arguments"):
+            if cache:
+                # Only the objects that aren't cached yet are fetched.
+                values = self._get_cached_objects(
+                    object_ids, parallel=True, parallel_min_bytes=min_bytes)
+            else:
+                values = self.deserialize_objects(
+                    data_metadata_pairs,
+                    object_ids,
+                    parallel=True,
+                    parallel_min_bytes=min_bytes)
+        for i, value in enumerate(values):
+            if isinstance(value, RayError):
+                raise value
+            else:
+                arguments[object_indices[i]] = value
 
         return arguments
 
@@ -692,6 +890,10 @@ class Worker(object):
                 output was wrapped in a tuple with one element prior to being
                 passed into this function.
         """
+        # TODO: Inline small return values into the reply to the caller
+        # instead of the object store, as the core worker's direct actor
+        # transport does. This needs Python workers to execute tasks through
+        # the core worker.
         for i in range(len(object_ids)):
             if isinstance(outputs[i], ray.actor.ActorHandle):
                 raise Exception("Returning an actor handle from a remote "
@@ -749,9 +951,11 @@ class Worker(object):
             if function_name != "__ray_terminate__":
                 self.reraise_actor_init_error()
                 self.memory_monitor.raise_if_low_memory()
-            with profiling.profile("task:deserialize_arguments"):
-                arguments = self._get_arguments_for_execution(
-                    function_name, args)
+            arguments = self._get_arguments_for_execution(
+                function_name,
+                args,
+                cache=getattr(function_executor, "__ray_cache_arguments__",
+                              False))
         except Exception as e:
             self._handle_process_task_failure(
                 function_descriptor, return_object_ids, e,
@@ -1430,6 +1634,7 @@ def shutdown(exiting_interpreter=False):
     # should simply set "global_worker" to equal "None" or something like that.
     global_worker.set_mode(None)
     global_worker._post_get_hooks = []
+    global_worker.object_cache.clear()
 
 
 atexit.register(shutdown, True)
@@ -1492,7 +1697,8 @@ def print_logs(redis_client, threads_stopped):
                 continue
             num_consecutive_messages_received += 1
 
-            data = json.loads(ray.utils.decode(msg["data"]))
+            # The log monitor publishes the new lines of many files at once.
+            updates = json.loads(ray.utils.decode(msg["data"]))
 
             def color_for(data):
                 if data["pid"] == "raylet":
@@ -1500,16 +1706,17 @@ def print_logs(redis_client, threads_stopped):
                 else:
                     return colorama.Fore.CYAN
 
-            if data["ip"] == localhost:
-                for line in data["lines"]:
-                    print("{}{}(pid={}){} {}".format(
-                        colorama.Style.DIM, color_for(data), data["pid"],
-                        colorama.Style.RESET_ALL, line))
-            else:
-                for line in data["lines"]:
-                    print("{}{}(pid={}, ip={}){} {}".format(
-                        colorama.Style.DIM, color_for(data), data["pid"],
-                        data["ip"], colorama.Style.RESET_ALL, line))
+            for data in updates:
+                if data["ip"] == localhost:
+                    for line in data["lines"]:
+                        print("{}{}(pid={}){} {}".format(
+                            colorama.Style.DIM, color_for(data), data["pid"],
+                            colorama.Style.RESET_ALL, line))
+                else:
+                    for line in data["lines"]:
+                        print("{}{}(pid={}, ip={}){} {}".format(
+                            colorama.Style.DIM, color_for(data), data["pid"],
+                            data["ip"], colorama.Style.RESET_ALL, line))
 
             if (num_consecutive_messages_received % 100 == 0
                     and num_consecutive_messages_received > 0):
@@ -1733,6 +1940,10 @@ def connect(node,
     ray.state.state._initialize_global_state(
         node.redis_address, redis_password=node.redis_password)
 
+    if mode is not LOCAL_MODE and ray_constants.PROFILE_OBJECT_STORE_MEMORY:
+        worker.object_store_profiler = (
+            object_store_profiler.ObjectStoreProfiler(worker.redis_client))
+
     # Register the worker with Redis.
     if mode == SCRIPT_MODE:
         # The concept of a driver is the same as the concept of a "job".
@@ -1902,6 +2113,7 @@ def disconnect():
         worker._session_index += 1
 
     worker.node = None  # Disconnect the worker from the node.
+    worker.object_store_profiler = None
     worker.cached_functions_to_run = []
     worker.function_actor_manager.reset_cache()
     worker.serialization_context_map.clear()
@@ -2079,7 +2291,7 @@ def register_custom_serializer(cls,
         register_class_for_serialization({"worker": worker})
 
 
-def get(object_ids):
+def get(object_ids, parallel=False, cache=False):
     """Get a remote object or a list of remote objects from the object store.
 
     This method blocks until the object corresponding to the object ID is
@@ -2091,6 +2303,12 @@ def get(object_ids):
     Args:
         object_ids: Object ID of the object to get or a list of object IDs to
             get.
+        parallel (bool): If True, deserialize the objects on a thread pool.
+            This is only faster for lists of objects whose deserialization
+            releases the GIL, e.g. large numpy arrays.
+        cache (bool): If True, keep the deserialized objects in a size-bounded
+            cache on this worker, and return the cached values if they were
+            read before. The returned values must not be mutated.
 
     Returns:
         A Python object or a list of Python objects.
@@ -2111,7 +2329,7 @@ def get(object_ids):
                              "or a list of object IDs.")
 
         global last_task_error_raise_time
-        values = worker.get_objects(object_ids)
+        values = worker.get_objects(object_ids, parallel=parallel, cache=cache)
         for i, value in enumerate(values):
             if isinstance(value, RayError):
                 last_task_error_raise_time = time.time()
@@ -2178,9 +2396,63 @@ def put(value, weakref=False):
             object_id.set_buffer_ref(
                 worker.core_worker.get_objects([object_id],
                                                worker.current_task_id))
+        if worker.object_store_profiler is not None:
+            worker.object_store_profiler.record_puts(
+                [object_id], pinned=not weakref)
         return object_id
 
 
+def put_many(values, weakref=False):
+    """Store a list of objects in the object store.
+
+    This is equivalent to `[ray.put(value) for value in values]`, but the
+    values are written to the object store with a single core worker call,
+    and pinned with a single object store request instead of one per value.
+
+    Args:
+        values (list): The Python objects to be stored.
+        weakref: If set, allows the objects to be evicted while references
+            to the returned IDs exist.
+
+    Returns:
+        A list with the object ID assigned to each value.
+    """
+    worker = global_worker
+    worker.check_connected()
+    if worker.mode == LOCAL_MODE:
+        return [put(value, weakref=weakref) for value in values]
+
+    with profiling.profile("ray.put_many"):
+        object_ids = []
+        for _ in values:
+            object_ids.append(
+                ray._raylet.compute_put_id(
+                    worker.current_task_id,
+                    worker.task_context.put_index,
+                ))
+            worker.task_context.put_index += 1
+        try:
+            worker.put_objects(object_ids, values)
+        except ObjectStoreFullError:
+            logger.info(
+                "Put failed since the values were either too large or the "
+                "store was full of pinned objects. If you are putting "
+                "and holding references to a lot of object ids, consider "
+                "ray.put_many(values, weakref=True) to allow object data to "
+                "be evicted early.")
+            raise
+        # Pin the object buffers with the returned ids, see ray.put.
+        if not weakref:
+            buffers = worker.core_worker.get_objects(object_ids,
+                                                     worker.current_task_id)
+            for object_id, buffer in zip(object_ids, buffers):
+                object_id.set_buffer_ref([buffer])
+        if worker.object_store_profiler is not None:
+            worker.object_store_profiler.record_puts(
+                object_ids, pinned=not weakref)
+        return object_ids
+
+
 def wait(object_ids, num_returns=1, timeout=None):
     """Return a list of IDs that are ready and a list of IDs that are not.
 
@@ -47,14 +47,6 @@ DEFAULT_CONFIG = with_common_config({
 # yapf: enable
 
 
-@ray.remote
-def create_shared_noise(count):
-    """Create a large array of noise to be shared by all workers."""
-    seed = 123
-    noise = np.random.RandomState(seed).randn(count).astype(np.float32)
-    return noise
-
-
 class SharedNoiseTable(object):
     def __init__(self, noise):
         self.noise = noise
@@ -73,10 +65,11 @@ class SharedNoiseTable(object):
 
 @ray.remote
 class Worker(object):
-    def __init__(self, config, env_creator, noise, min_task_runtime=0.2):
+    def __init__(self, config, env_creator, min_task_runtime=0.2):
         self.min_task_runtime = min_task_runtime
         self.config = config
-        self.noise = SharedNoiseTable(noise)
+        self.noise = SharedNoiseTable(
+            utils.get_shared_noise(config["noise_size"]))
 
         self.env = env_creator(config["env_config"])
         from ray.rllib import models
@@ -157,6 +150,19 @@ class Worker(object):
             eval_returns=eval_returns,
             eval_lengths=eval_lengths)
 
+    def weighted_noise_sum(self, weights, noise_indices):
+        """Returns the sum of the noise vectors scaled by the given weights.
+
+        This is done on the workers, which already hold the noise table, so
+        that the driver doesn't have to read the noise of every episode.
+        """
+        total, count = utils.batched_weighted_sum(
+            weights, (self.noise.get(index, self.policy.num_params)
+                      for index in noise_indices),
+            batch_size=500)
+        assert count == len(noise_indices) > 0
+        return total
+
 
 class ARSTrainer(Trainer):
     """Large-scale implementation of Augmented Random Search in Ray."""
@@ -180,15 +186,10 @@ class ARSTrainer(Trainer):
         self.num_rollouts = config["num_rollouts"]
         self.report_length = config["report_length"]
 
-        # Create the shared noise table.
-        logger.info("Creating shared noise table.")
-        noise_id = create_shared_noise.remote(config["noise_size"])
-        self.noise = SharedNoiseTable(ray.get(noise_id))
-
         # Create the actors.
         logger.info("Creating actors.")
         self.workers = [
-            Worker.remote(config, env_creator, noise_id)
+            Worker.remote(config, env_creator)
             for _ in range(config["num_workers"])
         ]
 
@@ -251,11 +252,8 @@ class ARSTrainer(Trainer):
         noisy_returns = noisy_returns[idx, :]
 
         # Compute and take a step.
-        g, count = utils.batched_weighted_sum(
-            noisy_returns[:, 0] - noisy_returns[:, 1],
-            (self.noise.get(index, self.policy.num_params)
-             for index in noise_idx),
-            batch_size=min(500, noisy_returns[:, 0].size))
+        g = self._weighted_noise_sum(noisy_returns[:, 0] - noisy_returns[:, 1],
+                                     noise_idx)
         g /= noise_idx.size
         # scale the returns by their standard deviation
         if not np.isclose(np.std(noisy_returns), 0.0):
@@ -302,6 +300,21 @@ class ARSTrainer(Trainer):
     def compute_action(self, observation):
         return self.policy.compute(observation, update=True)[0]
 
+    def _weighted_noise_sum(self, weights, noise_indices):
+        """Computes the weighted sum of the noise vectors on the workers.
+
+        Each worker sums an equal share of the noise vectors, so the driver
+        only adds up one vector per worker.
+        """
+        chunks = np.array_split(
+            np.arange(len(noise_indices)), len(self.workers))
+        sum_ids = [
+            worker.weighted_noise_sum.remote(weights[chunk],
+                                             noise_indices[chunk])
+            for worker, chunk in zip(self.workers, chunks) if len(chunk) > 0
+        ]
+        return sum(ray_get_and_free(sum_ids))
+
     def _collect_results(self, theta_id, min_episodes):
         num_episodes, num_timesteps = 0, 0
         results = []
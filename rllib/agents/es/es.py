@@ -47,14 +47,6 @@ DEFAULT_CONFIG = with_common_config({
 # yapf: enable
 
 
-@ray.remote
-def create_shared_noise(count):
-    """Create a large array of noise to be shared by all workers."""
-    seed = 123
-    noise = np.random.RandomState(seed).randn(count).astype(np.float32)
-    return noise
-
-
 class SharedNoiseTable(object):
     def __init__(self, noise):
         self.noise = noise
@@ -73,12 +65,12 @@ class Worker(object):
                  config,
                  policy_params,
                  env_creator,
-                 noise,
                  min_task_runtime=0.2):
         self.min_task_runtime = min_task_runtime
         self.config = config
         self.policy_params = policy_params
-        self.noise = SharedNoiseTable(noise)
+        self.noise = SharedNoiseTable(
+            utils.get_shared_noise(config["noise_size"]))
 
         self.env = env_creator(config["env_config"])
         from ray.rllib import models
@@ -163,6 +155,19 @@ class Worker(object):
             eval_returns=eval_returns,
             eval_lengths=eval_lengths)
 
+    def weighted_noise_sum(self, weights, noise_indices):
+        """Returns the sum of the noise vectors scaled by the given weights.
+
+        This is done on the workers, which already hold the noise table, so
+        that the driver doesn't have to read the noise of every episode.
+        """
+        total, count = utils.batched_weighted_sum(
+            weights, (self.noise.get(index, self.policy.num_params)
+                      for index in noise_indices),
+            batch_size=500)
+        assert count == len(noise_indices) > 0
+        return total
+
 
 class ESTrainer(Trainer):
     """Large-scale implementation of Evolution Strategies in Ray."""
@@ -185,15 +190,10 @@ class ESTrainer(Trainer):
         self.optimizer = optimizers.Adam(self.policy, config["stepsize"])
         self.report_length = config["report_length"]
 
-        # Create the shared noise table.
-        logger.info("Creating shared noise table.")
-        noise_id = create_shared_noise.remote(config["noise_size"])
-        self.noise = SharedNoiseTable(ray.get(noise_id))
-
         # Create the actors.
         logger.info("Creating actors.")
         self._workers = [
-            Worker.remote(config, policy_params, env_creator, noise_id)
+            Worker.remote(config, policy_params, env_creator)
             for _ in range(config["num_workers"])
         ]
 
@@ -250,14 +250,11 @@ class ESTrainer(Trainer):
             raise NotImplementedError(config["return_proc_mode"])
 
         # Compute and take a step.
-        g, count = utils.batched_weighted_sum(
-            proc_noisy_returns[:, 0] - proc_noisy_returns[:, 1],
-            (self.noise.get(index, self.policy.num_params)
-             for index in noise_indices),
-            batch_size=500)
+        g = self._weighted_noise_sum(
+            proc_noisy_returns[:, 0] - proc_noisy_returns[:, 1], noise_indices)
         g /= noisy_returns.size
-        assert (g.shape == (self.policy.num_params, ) and g.dtype == np.float32
-                and count == len(noise_indices))
+        assert (g.shape == (self.policy.num_params, )
+                and g.dtype == np.float32)
         # Compute the new weights theta.
         theta, update_ratio = self.optimizer.update(-g +
                                                     config["l2_coeff"] * theta)
@@ -299,6 +296,21 @@ class ESTrainer(Trainer):
         for w in self._workers:
             w.__ray_terminate__.remote()
 
+    def _weighted_noise_sum(self, weights, noise_indices):
+        """Computes the weighted sum of the noise vectors on the workers.
+
+        Each worker sums an equal share of the noise vectors, so the driver
+        only adds up one vector per worker.
+        """
+        chunks = np.array_split(
+            np.arange(len(noise_indices)), len(self._workers))
+        sum_ids = [
+            worker.weighted_noise_sum.remote(weights[chunk],
+                                             noise_indices[chunk])
+            for worker, chunk in zip(self._workers, chunks) if len(chunk) > 0
+        ]
+        return sum(ray_get_and_free(sum_ids))
+
     def _collect_results(self, theta_id, min_episodes, min_timesteps):
         num_episodes, num_timesteps = 0, 0
         results = []
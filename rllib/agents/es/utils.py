@@ -5,7 +5,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import tempfile
+
+from filelock import FileLock
 import numpy as np
+
+import ray
 from ray.rllib.utils import try_import_tf
 
 tf = try_import_tf()
@@ -61,3 +67,31 @@ def batched_weighted_sum(weights, vecs, batch_size):
             np.asarray(batch_vecs, dtype=np.float32))
         num_items_summed += len(batch_weights)
     return total, num_items_summed
+
+
+def get_shared_noise(count, seed=123):
+    """Returns a large read-only array of noise shared by all workers.
+
+    The noise is generated once per node into a file in the Ray temp
+    directory. Every process on the node memory-maps this file, so they all
+    share the same physical pages, and later runs reuse the file.
+    """
+    node = ray.worker.global_worker.node
+    temp_dir = node.get_temp_dir_path() if node else tempfile.gettempdir()
+    path = os.path.join(temp_dir, "es_noise_{}_{}.npy".format(seed, count))
+    with FileLock(path + ".lock"):
+        if not os.path.exists(path):
+            tmp_path = "{}.{}.tmp".format(path, os.getpid())
+            noise = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=np.float32, shape=(count, ))
+            # Drawing the noise in chunks gives the same numbers as drawing
+            # it at once, without materializing it in memory.
+            random_state = np.random.RandomState(seed)
+            chunk_size = 1 << 22
+            for start in range(0, count, chunk_size):
+                end = min(start + chunk_size, count)
+                noise[start:end] = random_state.randn(end - start)
+            noise.flush()
+            del noise
+            os.rename(tmp_path, path)
+    return np.load(path, mmap_mode="r")
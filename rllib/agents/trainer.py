@@ -427,10 +427,17 @@ class Trainer(Trainable):
         if (self.config.get("observation_filter", "NoFilter") != "NoFilter"
                 and hasattr(self, "workers")
                 and isinstance(self.workers, WorkerSet)):
-            FilterManager.synchronize(
-                self.workers.local_worker().filters,
-                self.workers.remote_workers(),
-                update_remote=self.config["synchronize_filters"])
+            tree_sync = (self._has_policy_optimizer()
+                         and getattr(self.optimizer, "tree_sync", None))
+            if tree_sync:
+                tree_sync.synchronize_filters(
+                    self.workers.local_worker().filters,
+                    update_remote=self.config["synchronize_filters"])
+            else:
+                FilterManager.synchronize(
+                    self.workers.local_worker().filters,
+                    self.workers.remote_workers(),
+                    update_remote=self.config["synchronize_filters"])
             logger.debug("synchronized filters: {}".format(
                 self.workers.local_worker().filters))
 
@@ -0,0 +1,174 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ray.rllib.evaluation.rollout_metrics import RolloutMetrics
+from ray.rllib.offline.off_policy_estimator import OffPolicyEstimate
+from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID
+from ray.rllib.utils.annotations import DeveloperAPI
+
+
+class SummaryStat(object):
+    """Count, sum, min and max of a stream of values, which can be merged.
+
+    NaN values count towards the mean but are ignored by min and max.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        if value == value:  # Not NaN.
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else float("nan")
+
+    @property
+    def min_or_nan(self):
+        return self.min if self.min <= self.max else float("nan")
+
+    @property
+    def max_or_nan(self):
+        return self.max if self.min <= self.max else float("nan")
+
+
+def _merge_stats(stats, other_stats):
+    for key, stat in other_stats.items():
+        stats.setdefault(key, SummaryStat()).merge(stat)
+
+
+@DeveloperAPI
+class EpisodeSummary(object):
+    """Mergeable summary of the metrics of a set of episodes.
+
+    Workers summarize their episodes before sending them to the driver, so
+    that the driver merges one small summary per worker instead of
+    iterating over every episode.
+    """
+
+    def __init__(self):
+        self.num_episodes = 0
+        self.num_estimates = 0
+        self.episode_reward = SummaryStat()
+        self.episode_length = SummaryStat()
+        self.policy_rewards = {}
+        self.custom_metrics = {}
+        self.perf_stats = {}
+        # Maps estimator name to a dict of metric name to stat.
+        self.off_policy_estimates = {}
+        # The last of the summarized RolloutMetrics and OffPolicyEstimates,
+        # which are kept so that results can be smoothed over past episodes.
+        self.recent_episodes = []
+
+    @staticmethod
+    def from_episodes(episodes, num_recent=0):
+        """Summarizes a list of RolloutMetrics and OffPolicyEstimates.
+
+        Arguments:
+            episodes (list): the metrics to summarize.
+            num_recent (int): how many of the last metrics to keep in
+                recent_episodes.
+        """
+        summary = EpisodeSummary()
+        for episode in episodes:
+            summary.add(episode)
+        if num_recent > 0:
+            summary.recent_episodes = list(episodes[-num_recent:])
+        return summary
+
+    @property
+    def num_metrics(self):
+        """The number of summarized RolloutMetrics and OffPolicyEstimates."""
+        return self.num_episodes + self.num_estimates
+
+    def add(self, episode):
+        """Adds a RolloutMetrics or OffPolicyEstimate to the summary."""
+        if isinstance(episode, OffPolicyEstimate):
+            self.num_estimates += 1
+            stats = self.off_policy_estimates.setdefault(
+                episode.estimator_name, {})
+            for k, v in episode.metrics.items():
+                stats.setdefault(k, SummaryStat()).add(v)
+            return
+        if not isinstance(episode, RolloutMetrics):
+            raise ValueError("Unknown metric type: {}".format(episode))
+        self.num_episodes += 1
+        self.episode_reward.add(episode.episode_reward)
+        self.episode_length.add(episode.episode_length)
+        for k, v in episode.custom_metrics.items():
+            self.custom_metrics.setdefault(k, SummaryStat()).add(v)
+        for k, v in episode.perf_stats.items():
+            self.perf_stats.setdefault(k, SummaryStat()).add(v)
+        for (_, policy_id), reward in episode.agent_rewards.items():
+            if policy_id != DEFAULT_POLICY_ID:
+                self.policy_rewards.setdefault(policy_id,
+                                               SummaryStat()).add(reward)
+
+    def merge(self, other):
+        """Adds the episodes of another summary to this one."""
+        self.num_episodes += other.num_episodes
+        self.num_estimates += other.num_estimates
+        self.recent_episodes.extend(other.recent_episodes)
+        self.episode_reward.merge(other.episode_reward)
+        self.episode_length.merge(other.episode_length)
+        _merge_stats(self.policy_rewards, other.policy_rewards)
+        _merge_stats(self.custom_metrics, other.custom_metrics)
+        _merge_stats(self.perf_stats, other.perf_stats)
+        for name, stats in other.off_policy_estimates.items():
+            _merge_stats(self.off_policy_estimates.setdefault(name, {}), stats)
+        return self
+
+    def to_result(self, episodes_this_iter=None):
+        """Returns the metrics in the format of summarize_episodes.
+
+        Arguments:
+            episodes_this_iter (int): the number of new episodes, defaults
+                to the number of episodes in the summary.
+        """
+        if episodes_this_iter is None:
+            episodes_this_iter = self.num_episodes
+        custom_metrics = {}
+        for k, stat in self.custom_metrics.items():
+            custom_metrics[k + "_mean"] = stat.mean
+            custom_metrics[k + "_min"] = stat.min_or_nan
+            custom_metrics[k + "_max"] = stat.max_or_nan
+        return dict(
+            episode_reward_max=self.episode_reward.max_or_nan,
+            episode_reward_min=self.episode_reward.min_or_nan,
+            episode_reward_mean=self.episode_reward.mean,
+            episode_len_mean=self.episode_length.mean,
+            episodes_this_iter=episodes_this_iter,
+            policy_reward_min={
+                k: stat.min_or_nan
+                for k, stat in self.policy_rewards.items()
+            },
+            policy_reward_max={
+                k: stat.max_or_nan
+                for k, stat in self.policy_rewards.items()
+            },
+            policy_reward_mean={
+                k: stat.mean
+                for k, stat in self.policy_rewards.items()
+            },
+            custom_metrics=custom_metrics,
+            sampler_perf={k: stat.mean
+                          for k, stat in self.perf_stats.items()},
+            off_policy_estimator={
+                name: {k: stat.mean
+                       for k, stat in stats.items()}
+                for name, stats in self.off_policy_estimates.items()
+            })
@@ -7,6 +7,7 @@ import numpy as np
 import collections
 
 import ray
+from ray.rllib.evaluation.episode_summary import EpisodeSummary
 from ray.rllib.evaluation.rollout_metrics import RolloutMetrics
 from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID
 from ray.rllib.offline.off_policy_estimator import OffPolicyEstimate
@@ -46,13 +47,59 @@ def collect_metrics(local_worker=None,
                     timeout_seconds=180):
     """Gathers episode metrics from RolloutWorker instances."""
 
-    episodes, to_be_collected = collect_episodes(
+    summaries, to_be_collected = collect_episode_summaries(
         local_worker,
         remote_workers,
         to_be_collected,
         timeout_seconds=timeout_seconds)
-    metrics = summarize_episodes(episodes, episodes)
-    return metrics
+    return merge_summaries(summaries).to_result()
+
+
+@DeveloperAPI
+def collect_episode_summaries(local_worker=None,
+                              remote_workers=[],
+                              to_be_collected=[],
+                              timeout_seconds=180,
+                              num_recent=0):
+    """Gathers summaries of the new episodes from the given workers.
+
+    Unlike collect_episodes, the episodes are summarized on the workers, so
+    only one small summary per worker is sent to the driver, along with the
+    last num_recent episodes of the worker.
+    """
+
+    if remote_workers:
+        pending = [
+            a.apply.remote(lambda ev: ev.get_metrics_summary(num_recent))
+            for a in remote_workers
+        ] + to_be_collected
+        collected, to_be_collected = ray.wait(
+            pending, num_returns=len(pending), timeout=timeout_seconds * 1.0)
+        if pending and len(collected) == 0:
+            logger.warning(
+                "WARNING: collected no metrics in {} seconds".format(
+                    timeout_seconds))
+        summaries = ray_get_and_free(collected)
+    else:
+        summaries = []
+
+    if local_worker:
+        summaries.append(local_worker.get_metrics_summary(num_recent))
+    # Results left over from collect_episodes are lists of episodes.
+    return [
+        EpisodeSummary.from_episodes(s, num_recent)
+        if isinstance(s, list) else s for s in summaries
+    ], to_be_collected
+
+
+@DeveloperAPI
+def merge_summaries(summaries):
+    """Merges a list of EpisodeSummary objects into a new summary."""
+
+    merged = EpisodeSummary()
+    for summary in summaries:
+        merged.merge(summary)
+    return merged
 
 
 @DeveloperAPI
@@ -60,7 +107,11 @@ def collect_episodes(local_worker=None,
                      remote_workers=[],
                      to_be_collected=[],
                      timeout_seconds=180):
-    """Gathers new episodes metrics tuples from the given evaluators."""
+    """Gathers new episodes metrics tuples from the given evaluators.
+
+    This sends every episode to the driver. Use collect_episode_summaries if
+    only the summarized metrics are needed.
+    """
 
     if remote_workers:
         pending = [
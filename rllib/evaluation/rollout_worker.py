@@ -16,6 +16,7 @@ from ray.rllib.env.external_env import ExternalEnv
 from ray.rllib.env.multi_agent_env import MultiAgentEnv
 from ray.rllib.env.external_multi_agent_env import ExternalMultiAgentEnv
 from ray.rllib.env.vector_env import VectorEnv
+from ray.rllib.evaluation.episode_summary import EpisodeSummary
 from ray.rllib.evaluation.interface import EvaluatorInterface
 from ray.rllib.evaluation.sampler import AsyncSampler, SyncSampler
 from ray.rllib.policy.sample_batch import MultiAgentBatch, DEFAULT_POLICY_ID
@@ -32,6 +33,7 @@ from ray.rllib.utils.debug import disable_log_once_globally, log_once, \
     summarize, enable_periodic_logging
 from ray.rllib.utils.filter import get_filter
 from ray.rllib.utils.tf_run_builder import TFRunBuilder
+from ray.rllib.utils.weight_sync import WeightsDecoder, WeightsUpdate
 from ray.rllib.utils import try_import_tf
 
 tf = try_import_tf()
@@ -368,6 +370,7 @@ class RolloutWorker(EvaluatorInterface):
         }
         if self.worker_index == 0:
             logger.info("Built filter map: {}".format(self.filters))
+        self.weights_decoder = WeightsDecoder()
 
         # Always use vector env for consistency even if num_envs = 1
         self.async_env = BaseEnv.to_base_env(
@@ -527,6 +530,11 @@ class RolloutWorker(EvaluatorInterface):
 
     @override(EvaluatorInterface)
     def set_weights(self, weights):
+        if isinstance(weights, WeightsUpdate):
+            weights = self.weights_decoder.decode(weights)
+            if weights is None:
+                # Already at this version, skip the redundant update
+                return
         for pid, w in weights.items():
             self.policy_map[pid].set_weights(w)
 
@@ -622,6 +630,16 @@ class RolloutWorker(EvaluatorInterface):
             out.extend(m.get_metrics())
         return out
 
+    @DeveloperAPI
+    def get_metrics_summary(self, num_recent=0):
+        """Returns an EpisodeSummary of the new metrics from evaluation.
+
+        This consumes the same metrics as get_metrics. The last num_recent
+        metrics are also returned unsummarized in recent_episodes.
+        """
+
+        return EpisodeSummary.from_episodes(self.get_metrics(), num_recent)
+
     @DeveloperAPI
     def foreach_env(self, func):
         """Apply the given function to each underlying env instance."""
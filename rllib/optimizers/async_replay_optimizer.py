@@ -25,6 +25,8 @@ from ray.rllib.utils.annotations import override
 from ray.rllib.utils.actors import TaskPool, create_colocated
 from ray.rllib.utils.memory import ray_get_and_free
 from ray.rllib.utils.timer import TimerStat
+from ray.rllib.utils.tree_sync import TreeSync
+from ray.rllib.utils.weight_sync import WeightsEncoder
 from ray.rllib.utils.window_stat import WindowStat
 
 SAMPLE_QUEUE_DEPTH = 2
@@ -60,7 +62,9 @@ class AsyncReplayOptimizer(PolicyOptimizer):
                  num_replay_buffer_shards=1,
                  max_weight_sync_delay=400,
                  debug=False,
-                 batch_replay=False):
+                 batch_replay=False,
+                 num_aggregation_workers=0,
+                 weight_sync_mode="full"):
         """Initialize an async replay optimizer.
 
         Arguments:
@@ -81,6 +85,10 @@ class AsyncReplayOptimizer(PolicyOptimizer):
             debug (bool): return extra debug stats
             batch_replay (bool): replay entire sequential batches of
                 experiences instead of sampling steps individually
+            num_aggregation_workers (int): if positive, broadcast weights
+                to rollout workers through this many intermediate actors
+            weight_sync_mode (str): one of "full", "changed" or "quantized",
+                see `WeightsEncoder` for details
         """
         PolicyOptimizer.__init__(self, workers)
 
@@ -90,6 +98,8 @@ class AsyncReplayOptimizer(PolicyOptimizer):
         self.prioritized_replay_beta = prioritized_replay_beta
         self.prioritized_replay_eps = prioritized_replay_eps
         self.max_weight_sync_delay = max_weight_sync_delay
+        self.num_aggregation_workers = num_aggregation_workers
+        self.weights_encoder = WeightsEncoder(weight_sync_mode)
 
         self.learner = LearnerThread(self.workers.local_worker())
         self.learner.start()
@@ -117,6 +127,7 @@ class AsyncReplayOptimizer(PolicyOptimizer):
             ]
         }
         self.num_weight_syncs = 0
+        self.weight_sync_bytes = 0
         self.num_samples_dropped = 0
         self.learning_started = False
 
@@ -155,12 +166,16 @@ class AsyncReplayOptimizer(PolicyOptimizer):
     def stop(self):
         for r in self.replay_actors:
             r.__ray_terminate__.remote()
+        if self.tree_sync:
+            self.tree_sync.stop()
         self.learner.stopped = True
 
     @override(PolicyOptimizer)
     def reset(self, remote_workers):
         self.workers.reset(remote_workers)
         self.sample_tasks.reset_workers(remote_workers)
+        if self.tree_sync:
+            self.tree_sync.reset(remote_workers)
 
     @override(PolicyOptimizer)
     def stats(self):
@@ -179,6 +194,7 @@ class AsyncReplayOptimizer(PolicyOptimizer):
                                        3),
             "train_throughput": round(self.timers["train"].mean_throughput, 3),
             "num_weight_syncs": self.num_weight_syncs,
+            "weight_sync_total_bytes": self.weight_sync_bytes,
             "num_samples_dropped": self.num_samples_dropped,
             "learner_queue": self.learner.learner_queue_size.stats(),
             "replay_shard_0": replay_stats,
@@ -192,14 +208,27 @@ class AsyncReplayOptimizer(PolicyOptimizer):
             stats.update(debug_stats)
         if self.learner.stats:
             stats["learner"] = self.learner.stats
+        stats.update(self.weights_encoder.stats())
         return dict(PolicyOptimizer.stats(self), **stats)
 
     # For https://github.com/ray-project/ray/issues/2541 only
     def _set_workers(self, remote_workers):
         self.workers.reset(remote_workers)
-        weights = self.workers.local_worker().get_weights()
+        update = self.weights_encoder.encode(
+            self.workers.local_worker().get_weights())
+        weights = ray.put(update)
+        if self.num_aggregation_workers > 0:
+            if self.tree_sync:
+                self.tree_sync.reset(remote_workers)
+            else:
+                self.tree_sync = TreeSync(remote_workers,
+                                          self.num_aggregation_workers)
+            self.weights_encoder.track(
+                update, self.tree_sync.broadcast_weights(weights))
         for ev in self.workers.remote_workers():
-            ev.set_weights.remote(weights)
+            if not self.tree_sync:
+                self.weights_encoder.track(update,
+                                           [ev.set_weights.remote(weights)])
             self.steps_since_update[ev] = 0
             for _ in range(SAMPLE_QUEUE_DEPTH):
                 self.sample_tasks.add(ev, ev.sample_with_count.remote())
@@ -207,6 +236,9 @@ class AsyncReplayOptimizer(PolicyOptimizer):
     def _step(self):
         sample_timesteps, train_timesteps = 0, 0
         weights = None
+        # Workers to update through the tree, grouped by weights object
+        tree_syncs = collections.defaultdict(list)
+        updates = {}
 
         with self.timers["sample_processing"]:
             completed = list(self.sample_tasks.completed())
@@ -226,15 +258,31 @@ class AsyncReplayOptimizer(PolicyOptimizer):
                     if weights is None or self.learner.weights_updated:
                         self.learner.weights_updated = False
                         with self.timers["put_weights"]:
-                            weights = ray.put(
+                            update = self.weights_encoder.encode(
                                 self.workers.local_worker().get_weights())
-                    ev.set_weights.remote(weights)
+                            weights = ray.put(update)
+                            updates[weights] = update
                     self.num_weight_syncs += 1
+                    self.weight_sync_bytes += self.weights_encoder.last_bytes
                     self.steps_since_update[ev] = 0
+                    if self.tree_sync:
+                        # Hold the next sample request until the weights
+                        # have been broadcast below
+                        tree_syncs[weights].append(ev)
+                        continue
+                    self.weights_encoder.track(
+                        updates[weights], [ev.set_weights.remote(weights)])
 
                 # Kick off another sample request
                 self.sample_tasks.add(ev, ev.sample_with_count.remote())
 
+            for weights, evs in tree_syncs.items():
+                self.weights_encoder.track(
+                    updates[weights],
+                    self.tree_sync.broadcast_weights(weights, evs))
+                for ev in evs:
+                    self.sample_tasks.add(ev, ev.sample_with_count.remote())
+
         with self.timers["replay_processing"]:
             for ra, replay in self.replay_tasks.completed():
                 self.replay_tasks.add(ra, ra.replay.remote())
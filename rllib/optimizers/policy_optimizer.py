@@ -5,7 +5,9 @@ from __future__ import print_function
 import logging
 
 from ray.rllib.utils.annotations import DeveloperAPI
-from ray.rllib.evaluation.metrics import collect_episodes, summarize_episodes
+from ray.rllib.evaluation.episode_summary import EpisodeSummary
+from ray.rllib.evaluation.metrics import (collect_episode_summaries,
+                                          merge_summaries)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,8 @@ class PolicyOptimizer(object):
         workers (WorkerSet): The set of rollout workers to use.
         num_steps_trained (int): Number of timesteps trained on so far.
         num_steps_sampled (int): Number of timesteps sampled so far.
+        tree_sync (TreeSync): Optional helper that routes filter and weight
+            syncs through intermediate aggregation actors.
     """
 
     @DeveloperAPI
@@ -37,6 +41,7 @@ class PolicyOptimizer(object):
         self.workers = workers
         self.episode_history = []
         self.to_be_collected = []
+        self.tree_sync = None
 
         # Counters that should be updated by sub-classes
         self.num_steps_trained = 0
@@ -81,7 +86,8 @@ class PolicyOptimizer(object):
     @DeveloperAPI
     def stop(self):
         """Release any resources used by this optimizer."""
-        pass
+        if self.tree_sync:
+            self.tree_sync.stop()
 
     @DeveloperAPI
     def collect_metrics(self,
@@ -101,19 +107,23 @@ class PolicyOptimizer(object):
             res (dict): A training result dict from worker metrics with
                 `info` replaced with stats from self.
         """
-        episodes, self.to_be_collected = collect_episodes(
+        summaries, self.to_be_collected = collect_episode_summaries(
             self.workers.local_worker(),
             selected_workers or self.workers.remote_workers(),
             self.to_be_collected,
-            timeout_seconds=timeout_seconds)
-        orig_episodes = list(episodes)
-        missing = min_history - len(episodes)
+            timeout_seconds=timeout_seconds,
+            num_recent=min_history)
+        new_summary = merge_summaries(summaries)
+        smoothed = merge_summaries([new_summary])
+        # The workers also return their last min_history episodes, which
+        # fill up the smoothing window if there are too few new ones.
+        missing = min_history - new_summary.num_metrics
         if missing > 0:
-            episodes.extend(self.episode_history[-missing:])
-            assert len(episodes) <= min_history
-        self.episode_history.extend(orig_episodes)
+            smoothed.merge(
+                EpisodeSummary.from_episodes(self.episode_history[-missing:]))
+        self.episode_history.extend(new_summary.recent_episodes)
         self.episode_history = self.episode_history[-min_history:]
-        res = summarize_episodes(episodes, orig_episodes)
+        res = smoothed.to_result(new_summary.num_episodes)
         res.update(info=self.stats())
         return res
 
@@ -121,6 +131,8 @@ class PolicyOptimizer(object):
     def reset(self, remote_workers):
         """Called to change the set of remote workers being used."""
         self.workers.reset(remote_workers)
+        if self.tree_sync:
+            self.tree_sync.reset(remote_workers)
 
     @DeveloperAPI
     def foreach_worker(self, func):
@@ -16,6 +16,8 @@ from ray.rllib.utils.annotations import override
 from ray.rllib.utils.filter import RunningStat
 from ray.rllib.utils.timer import TimerStat
 from ray.rllib.utils.memory import ray_get_and_free
+from ray.rllib.utils.tree_sync import TreeSync
+from ray.rllib.utils.weight_sync import WeightsEncoder
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,11 @@ class SyncSamplesOptimizer(PolicyOptimizer):
     In each step, this optimizer pulls samples from a number of remote
     workers, concatenates them, and then updates a local model. The updated
     model weights are then broadcast to all remote workers.
+
+    If `num_aggregation_workers` is set, the weights are broadcast through
+    that many intermediate actors instead of directly from the driver.
+    Setting `weight_sync_mode` to "changed" or "quantized" broadcasts only
+    deltas against a versioned base, see `WeightsEncoder`.
     """
 
     def __init__(self,
@@ -33,7 +40,9 @@ class SyncSamplesOptimizer(PolicyOptimizer):
                  num_sgd_iter=1,
                  train_batch_size=1,
                  sgd_minibatch_size=0,
-                 standardize_fields=frozenset([])):
+                 standardize_fields=frozenset([]),
+                 num_aggregation_workers=0,
+                 weight_sync_mode="full"):
         PolicyOptimizer.__init__(self, workers)
 
         self.update_weights_timer = TimerStat()
@@ -45,17 +54,29 @@ class SyncSamplesOptimizer(PolicyOptimizer):
         self.sgd_minibatch_size = sgd_minibatch_size
         self.train_batch_size = train_batch_size
         self.learner_stats = {}
+        self.weights_encoder = WeightsEncoder(weight_sync_mode)
         self.policies = dict(self.workers.local_worker()
                              .foreach_trainable_policy(lambda p, i: (i, p)))
         logger.debug("Policies to train: {}".format(self.policies))
+        if num_aggregation_workers > 0:
+            self.tree_sync = TreeSync(self.workers.remote_workers(),
+                                      num_aggregation_workers)
 
     @override(PolicyOptimizer)
     def step(self):
         with self.update_weights_timer:
             if self.workers.remote_workers():
-                weights = ray.put(self.workers.local_worker().get_weights())
-                for e in self.workers.remote_workers():
-                    e.set_weights.remote(weights)
+                update = self.weights_encoder.encode(
+                    self.workers.local_worker().get_weights())
+                weights = ray.put(update)
+                if self.tree_sync:
+                    acks = self.tree_sync.broadcast_weights(weights)
+                else:
+                    acks = [
+                        e.set_weights.remote(weights)
+                        for e in self.workers.remote_workers()
+                    ]
+                self.weights_encoder.track(update, acks)
 
         with self.sample_timer:
             samples = []
@@ -115,7 +136,7 @@ class SyncSamplesOptimizer(PolicyOptimizer):
 
     @override(PolicyOptimizer)
     def stats(self):
-        return dict(
+        stats = dict(
             PolicyOptimizer.stats(self), **{
                 "sample_time_ms": round(1000 * self.sample_timer.mean, 3),
                 "grad_time_ms": round(1000 * self.grad_timer.mean, 3),
@@ -128,6 +149,8 @@ class SyncSamplesOptimizer(PolicyOptimizer):
                 "opt_samples": round(self.grad_timer.mean_units_processed, 3),
                 "learner": self.learner_stats,
             })
+        stats.update(self.weights_encoder.stats())
+        return stats
 
     def _minibatches(self, samples):
         if not self.sgd_minibatch_size:
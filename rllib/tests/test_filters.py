@@ -8,6 +8,7 @@ import numpy as np
 import ray
 from ray.rllib.utils.filter import RunningStat, MeanStdFilter
 from ray.rllib.utils import FilterManager
+from ray.rllib.utils.tree_sync import TreeSync
 from ray.rllib.tests.mock_worker import _MockWorker
 
 
@@ -105,6 +106,39 @@ class FilterManagerTest(unittest.TestCase):
         self.assertEqual(obs_f.rs.n, filt1.rs.n)
         self.assertEqual(obs_f.buffer.n, filt1.buffer.n)
 
+    def testTreeSynchronize(self):
+        """Tree sync merges deltas of all workers before applying them"""
+        filt1 = MeanStdFilter(())
+        for i in range(10):
+            filt1(i)
+        filt1.clear_buffer()
+
+        RemoteWorker = ray.remote(num_cpus=0)(_MockWorker)
+        remotes = [RemoteWorker.remote(sample_count=10) for _ in range(3)]
+        ray.get([r.sample.remote() for r in remotes])
+
+        tree = TreeSync(remotes, 2)
+        tree.synchronize_filters({
+            "obs_filter": filt1,
+            "rew_filter": filt1.copy()
+        })
+        self.assertEqual(filt1.rs.n, 40)
+        self.assertEqual(filt1.buffer.n, 0)
+
+        # Filter and weight updates are forwarded asynchronously
+        tree.broadcast_weights(ray.put(np.zeros(4)), remotes[:1])
+        ray.get([agg.get_filters.remote() for agg in tree.aggregators])
+        for r in remotes:
+            obs_f = ray.get(r.get_filters.remote())["obs_filter"]
+            self.assertEqual(obs_f.rs.n, filt1.rs.n)
+        self.assertTrue(
+            np.array_equal(
+                ray.get(remotes[0].get_weights.remote()), np.zeros(4)))
+        self.assertFalse(
+            np.array_equal(
+                ray.get(remotes[1].get_weights.remote()), np.zeros(4)))
+        tree.stop()
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import math
+import unittest
+
+from ray.rllib.evaluation.episode_summary import EpisodeSummary
+from ray.rllib.evaluation.metrics import summarize_episodes, merge_summaries
+from ray.rllib.evaluation.rollout_metrics import RolloutMetrics
+from ray.rllib.offline.off_policy_estimator import OffPolicyEstimate
+from ray.rllib.optimizers.policy_optimizer import PolicyOptimizer
+
+
+def make_episode(i):
+    return RolloutMetrics(
+        episode_length=10 + i,
+        episode_reward=float(i),
+        agent_rewards={
+            (0, "p0"): float(i),
+            (1, "p1"): -float(i)
+        },
+        custom_metrics={"m": float("nan") if i == 3 else i * 2.0},
+        perf_stats={"env_wait_time_ms": 1.0 + i})
+
+
+class _FakeWorker(object):
+    def __init__(self):
+        self.episodes = []
+
+    def get_metrics_summary(self, num_recent=0):
+        episodes, self.episodes = self.episodes, []
+        return EpisodeSummary.from_episodes(episodes, num_recent)
+
+
+class _FakeWorkerSet(object):
+    def __init__(self):
+        self.worker = _FakeWorker()
+
+    def local_worker(self):
+        return self.worker
+
+    def remote_workers(self):
+        return []
+
+
+class EpisodeSummaryTest(unittest.TestCase):
+    def assertResultsEqual(self, result, expected):
+        self.assertEqual(sorted(result.keys()), sorted(expected.keys()))
+        for k, v in expected.items():
+            if isinstance(v, dict):
+                self.assertResultsEqual(result[k], v)
+            elif isinstance(v, float) and math.isnan(v):
+                self.assertTrue(math.isnan(result[k]), k)
+            else:
+                self.assertAlmostEqual(result[k], v, msg=k)
+
+    def testMatchesSummarizeEpisodes(self):
+        episodes = [make_episode(i) for i in range(7)]
+        episodes.append(OffPolicyEstimate("is", {"v_new": 2.0}))
+        episodes.append(OffPolicyEstimate("is", {"v_new": 4.0}))
+        expected = summarize_episodes(episodes, episodes)
+
+        # Summaries of parts of the episodes merge to the same result.
+        summaries = [
+            EpisodeSummary.from_episodes(episodes[:3]),
+            EpisodeSummary.from_episodes(episodes[3:8]),
+            EpisodeSummary.from_episodes(episodes[8:]),
+        ]
+        merged = merge_summaries(summaries)
+        self.assertEqual(merged.num_episodes, 7)
+        self.assertResultsEqual(merged.to_result(), expected)
+
+    def testEmpty(self):
+        result = EpisodeSummary().to_result()
+        self.assertResultsEqual(result, summarize_episodes([], []))
+        self.assertEqual(result["episodes_this_iter"], 0)
+
+    def testSmoothedOverMinHistory(self):
+        workers = _FakeWorkerSet()
+        optimizer = PolicyOptimizer(workers)
+
+        def collect(episodes):
+            workers.worker.episodes = list(episodes)
+            result = optimizer.collect_metrics(1, min_history=100)
+            del result["info"]
+            return result
+
+        old = [make_episode(i) for i in range(150)]
+        self.assertResultsEqual(collect(old), summarize_episodes(old, old))
+
+        # Few new episodes are smoothed over exactly min_history episodes,
+        # however many episodes the previous iteration had.
+        new = [make_episode(1000 + i) for i in range(10)]
+        result = collect(new)
+        self.assertResultsEqual(result, summarize_episodes(
+            new + old[-90:], new))
+        self.assertEqual(result["episodes_this_iter"], 10)
+
+        # The history spans iterations.
+        newer = [make_episode(2000 + i) for i in range(5)]
+        self.assertResultsEqual(
+            collect(newer), summarize_episodes(newer + old[-85:] + new, newer))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,136 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+import unittest
+import numpy as np
+
+import ray
+from ray.rllib.utils.weight_sync import WeightsEncoder, WeightsDecoder, \
+    WeightsUpdate
+
+
+def _make_weights():
+    return {
+        "policy_1": [
+            np.ones((10, 10), dtype=np.float32),
+            np.zeros(10, dtype=np.float32)
+        ],
+        "policy_2": {
+            "w": np.random.randn(100).astype(np.float32)
+        },
+    }
+
+
+@ray.remote
+class _DecodingWorker(object):
+    def __init__(self):
+        self.decoder = WeightsDecoder()
+        self.weights = None
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def set_weights(self, update):
+        self.weights = self.decoder.decode(update) or self.weights
+
+    def get_weights(self):
+        return self.weights
+
+
+class WeightSyncTest(unittest.TestCase):
+    def setUp(self):
+        ray.init(num_cpus=1, object_store_memory=100 * 1024 * 1024)
+
+    def tearDown(self):
+        ray.shutdown()
+
+    def testFullMode(self):
+        encoder = WeightsEncoder("full")
+        weights = _make_weights()
+        self.assertIs(encoder.encode(weights), weights)
+        self.assertEqual(encoder.stats()["weight_sync_compression_ratio"], 1.0)
+
+    def testChangedMode(self):
+        encoder = WeightsEncoder("changed")
+        decoder = WeightsDecoder()
+        weights = _make_weights()
+        first = encoder.encode(weights)
+        self.assertIsInstance(first, WeightsUpdate)
+        self.assertEqual(encoder.num_rebases, 1)
+        self.assertEqual(decoder.decode(first)["policy_1"][0].sum(), 100)
+
+        weights["policy_1"][1] = np.ones(10, dtype=np.float32)
+        update = encoder.encode(weights)
+        self.assertEqual(list(update.leaves), [("policy_1", 1)])
+        self.assertEqual(update.nbytes(), 40)
+        self.assertEqual(encoder.num_rebases, 1)
+        decoded = decoder.decode(update)
+        for a, b in zip(decoded["policy_1"], weights["policy_1"]):
+            self.assertTrue(np.array_equal(a, b))
+        self.assertTrue(
+            np.array_equal(decoded["policy_2"]["w"], weights["policy_2"]["w"]))
+
+        # Redundant updates are skipped
+        self.assertIsNone(decoder.decode(update))
+
+    def testQuantizedMode(self):
+        encoder = WeightsEncoder("quantized")
+        decoder = WeightsDecoder()
+        weights = _make_weights()
+        decoder.decode(encoder.encode(weights))
+        for _ in range(5):
+            weights["policy_2"]["w"] += np.random.uniform(
+                -0.1, 0.1, size=100).astype(np.float32)
+            update = encoder.encode(weights)
+            self.assertEqual(update.nbytes(), 100)
+            decoded = decoder.decode(update)
+            self.assertTrue(
+                np.allclose(
+                    decoded["policy_2"]["w"],
+                    weights["policy_2"]["w"],
+                    atol=1e-2))
+        self.assertEqual(encoder.num_rebases, 1)
+        self.assertGreater(encoder.stats()["weight_sync_compression_ratio"],
+                           1.0)
+
+    def testRebase(self):
+        encoder = WeightsEncoder("changed", rebase_interval=2)
+        decoder = WeightsDecoder()
+        weights = _make_weights()
+        for i in range(5):
+            weights["policy_1"][1] = np.full(10, i, dtype=np.float32)
+            decoded = decoder.decode(encoder.encode(weights))
+            self.assertTrue(
+                np.array_equal(decoded["policy_1"][1], weights["policy_1"][1]))
+        self.assertEqual(encoder.num_rebases, 2)
+        self.assertEqual(decoder.base_version, encoder.base_version)
+
+    def testRebaseWithPendingUpdates(self):
+        encoder = WeightsEncoder("changed", rebase_interval=0)
+        worker = _DecodingWorker.remote()
+        weights = _make_weights()
+        # Keep the worker busy so that the updates stay queued
+        worker.sleep.remote(2)
+        acks = []
+        for i in range(3):
+            weights["policy_1"][1] = np.full(10, i, dtype=np.float32)
+            update = encoder.encode(weights)
+            ack = worker.set_weights.remote(ray.put(update))
+            encoder.track(update, [ack])
+            acks.append(ack)
+        self.assertEqual(encoder.num_rebases, 3)
+        self.assertEqual(sorted(encoder.live_bases), [1, 2, 3])
+
+        ray.get(acks)
+        decoded = ray.get(worker.get_weights.remote())
+        self.assertTrue(
+            np.array_equal(decoded["policy_1"][1], weights["policy_1"][1]))
+        encoder.encode(weights)
+        self.assertEqual(sorted(encoder.live_bases), [4])
+        self.assertEqual(encoder.stats()["weight_sync_live_bases"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
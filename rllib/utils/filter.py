@@ -16,6 +16,10 @@ class Filter(object):
         """Updates self with "new state" from other filter."""
         raise NotImplementedError
 
+    def merge_buffer(self, other):
+        """Merges the accumulated delta of other filter into own buffer."""
+        raise NotImplementedError
+
     def copy(self):
         """Creates a new object with same state as self.
 
@@ -51,6 +55,9 @@ class NoFilter(Filter):
     def apply_changes(self, other, *args, **kwargs):
         pass
 
+    def merge_buffer(self, other):
+        pass
+
     def copy(self):
         return self
 
@@ -180,6 +187,23 @@ class MeanStdFilter(Filter):
         if with_buffer:
             self.buffer = other.buffer.copy()
 
+    def merge_buffer(self, other):
+        """Combines the buffer of another filter with own buffer.
+
+        This is used to reduce deltas from several workers into one before
+        applying them with `apply_changes`.
+
+        Examples:
+            >>> a = MeanStdFilter(())
+            >>> a(1)
+            >>> b = MeanStdFilter(())
+            >>> b(3)
+            >>> a.merge_buffer(b)
+            >>> print([a.rs.n, a.buffer.n])
+            [1, 2]
+        """
+        self.buffer.update(other.buffer)
+
     def copy(self):
         """Returns a copy of Filter."""
         other = MeanStdFilter(self.shape)
@@ -0,0 +1,170 @@
+"""Hierarchical filter aggregation and weight broadcast.
+
+With many remote workers, pulling every filter delta to the driver and
+pushing weights to every worker from the driver makes the driver a
+serialization hotspot. The helpers here route both through a layer of
+intermediate actors, similar to how `TreeAggregator` handles samples.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import logging
+
+import ray
+from ray.rllib.utils.annotations import DeveloperAPI
+from ray.rllib.utils.filter_manager import FilterManager
+from ray.rllib.utils.memory import ray_get_and_free
+
+logger = logging.getLogger(__name__)
+
+
+@DeveloperAPI
+class TreeSync(object):
+    """Tree-reduces filter deltas and tree-broadcasts weights.
+
+    The given remote workers are divided among a number of aggregation
+    actors. Each aggregation actor exposes the same `get_filters`,
+    `sync_filters` and `set_weights` methods as a rollout worker, so the
+    driver only ever talks to `num_aggregation_workers` actors.
+
+    Examples:
+        >>> tree = TreeSync(workers.remote_workers(), 4)
+        >>> tree.synchronize_filters(workers.local_worker().filters)
+        >>> tree.broadcast_weights(
+        ...     ray.put(workers.local_worker().get_weights()))
+    """
+
+    def __init__(self, remote_workers, num_aggregation_workers):
+        """Initialize a tree sync helper.
+
+        Arguments:
+            remote_workers (list): remote rollout workers to sync
+            num_aggregation_workers (int): number of intermediate actors to
+                use for filter aggregation and weight broadcast
+        """
+        if num_aggregation_workers < 1:
+            raise ValueError("num_aggregation_workers must be positive, "
+                             "got {}".format(num_aggregation_workers))
+        if len(remote_workers) < num_aggregation_workers:
+            raise ValueError(
+                "The number of aggregation workers should not exceed the "
+                "number of total remote workers ({} vs {})".format(
+                    num_aggregation_workers, len(remote_workers)))
+
+        self.num_aggregation_workers = num_aggregation_workers
+        self.aggregators = [
+            TreeSyncWorker.remote() for _ in range(num_aggregation_workers)
+        ]
+        self.reset(remote_workers)
+
+    def reset(self, remote_workers):
+        """Reassigns the given remote workers to the aggregation actors."""
+
+        self.assigned_workers = collections.defaultdict(list)
+        self._worker_to_aggregator = {}
+        for i, w in enumerate(remote_workers):
+            agg_index = i % self.num_aggregation_workers
+            self.assigned_workers[agg_index].append(w)
+            self._worker_to_aggregator[w] = agg_index
+
+        for i, agg in enumerate(self.aggregators):
+            agg.set_children.remote(self.assigned_workers[i])
+
+    def active_aggregators(self):
+        """Returns the aggregation actors that have workers assigned."""
+
+        return [
+            agg for i, agg in enumerate(self.aggregators)
+            if self.assigned_workers[i]
+        ]
+
+    def synchronize_filters(self, local_filters, update_remote=True):
+        """Aggregates all remote filters through the aggregation actors.
+
+        This has the same semantics as `FilterManager.synchronize`.
+
+        Args:
+            local_filters (dict): Filters to be synchronized.
+            update_remote (bool): Whether to push updates to remote filters.
+        """
+        FilterManager.synchronize(
+            local_filters,
+            self.active_aggregators(),
+            update_remote=update_remote)
+
+    def broadcast_weights(self, weights, workers=None):
+        """Sends weights to remote workers through the aggregation actors.
+
+        Args:
+            weights (ObjectID|dict): Weights, ideally already put in the
+                object store so that they are serialized only once.
+            workers (list): Subset of remote workers to update. Defaults to
+                all assigned workers.
+
+        Returns:
+            List of ObjectIDs, one per aggregation actor used, that each
+            resolve to the list of `set_weights` results of its workers.
+        """
+        if workers is None:
+            return [
+                agg.set_weights.remote(weights)
+                for agg in self.active_aggregators()
+            ]
+
+        subsets = collections.defaultdict(list)
+        for w in workers:
+            subsets[self._worker_to_aggregator[w]].append(w)
+        return [
+            self.aggregators[agg_index].set_weights.remote(weights, children)
+            for agg_index, children in subsets.items()
+        ]
+
+    def stop(self):
+        """Terminates the aggregation actors."""
+
+        for agg in self.aggregators:
+            agg.__ray_terminate__.remote()
+
+
+@ray.remote(num_cpus=0)
+class TreeSyncWorker(object):
+    """Intermediate node that merges and fans out state for its workers."""
+
+    def __init__(self):
+        self.children = []
+
+    def set_children(self, children):
+        self.children = children
+
+    def get_filters(self, flush_after=False):
+        """Returns the merged filter deltas of all child workers.
+
+        The buffers of the returned filters hold the combined delta of all
+        children, which is all `Filter.apply_changes` reads on the driver.
+        """
+        merged = {}
+        child_filters = ray_get_and_free([
+            c.get_filters.remote(flush_after=flush_after)
+            for c in self.children
+        ])
+        for filters in child_filters:
+            for k, f in filters.items():
+                if k in merged:
+                    merged[k].merge_buffer(f)
+                else:
+                    merged[k] = f
+        return merged
+
+    def sync_filters(self, new_filters):
+        new_filters_id = ray.put(new_filters)
+        for c in self.children:
+            c.sync_filters.remote(new_filters_id)
+
+    def set_weights(self, weights, children=None):
+        weights_id = ray.put(weights)
+        if children is None:
+            children = self.children
+        return [c.set_weights.remote(weights_id) for c in children]
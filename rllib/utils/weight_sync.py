@@ -0,0 +1,325 @@
+"""Versioned delta encoding of weights broadcast to rollout workers.
+
+By default optimizers put the full weights dict in the object store for
+every sync. The encoder here instead keeps a full copy of the weights (the
+"base") in the object store, and encodes each sync as a small update against
+that base. Workers fetch the base once per rebase, then reconstruct weights
+locally from each update. The encoder keeps each base alive until every
+update sent against it has been applied, see `WeightsEncoder.track`.
+
+Supported modes:
+    "full": send the full weights every time (default behavior).
+    "changed": send only the arrays that differ from the base, exactly.
+    "quantized": send the difference of changed arrays to the base,
+        quantized to 8 bits per element. The error does not accumulate since
+        updates are always relative to the exactly known base.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import logging
+
+import numpy as np
+
+import ray
+from ray.exceptions import RayError
+from ray.rllib.utils.annotations import DeveloperAPI
+
+logger = logging.getLogger(__name__)
+
+WEIGHT_SYNC_MODES = ["full", "changed", "quantized"]
+
+
+def _flatten(struct, path=()):
+    """Returns a list of (path, leaf) pairs of a nested dict/list/tuple."""
+
+    if isinstance(struct, dict):
+        items = sorted(struct.items(), key=lambda kv: str(kv[0]))
+    elif isinstance(struct, (list, tuple)):
+        items = enumerate(struct)
+    else:
+        return [(path, struct)]
+    leaves = []
+    for k, v in items:
+        leaves.extend(_flatten(v, path + (k, )))
+    return leaves
+
+
+def _replace_leaves(struct, replacements, path=()):
+    """Returns a copy of struct with the leaves at the given paths replaced."""
+
+    if isinstance(struct, dict):
+        return {
+            k: _replace_leaves(v, replacements, path + (k, ))
+            for k, v in struct.items()
+        }
+    elif isinstance(struct, (list, tuple)):
+        return type(struct)(_replace_leaves(v, replacements, path + (i, ))
+                            for i, v in enumerate(struct))
+    return replacements.get(path, struct)
+
+
+def _nbytes(leaf):
+    if isinstance(leaf, np.ndarray):
+        return leaf.nbytes
+    elif isinstance(leaf, QuantizedArray):
+        return leaf.data.nbytes
+    # Unknown leaf types (e.g., torch tensors) are counted once per sync.
+    return getattr(leaf, "nbytes", 0)
+
+
+class QuantizedArray(object):
+    """Linearly quantized 8-bit version of a float array."""
+
+    def __init__(self, array):
+        self.dtype = array.dtype
+        self.low = array.min()
+        self.scale = (array.max() - self.low) / 255.0 or 1.0
+        self.data = np.round((array - self.low) / self.scale).astype(np.uint8)
+
+    def dequantize(self):
+        return (self.data.astype(self.dtype) * self.scale + self.low).astype(
+            self.dtype)
+
+
+@DeveloperAPI
+class WeightsUpdate(object):
+    """An encoded weights update relative to a versioned base.
+
+    Attributes:
+        version (int): Version of the weights this update reconstructs.
+        base_version (int): Version of the base the update is relative to.
+        base_id (ObjectID): Object store id of the full base weights.
+        mode (str): The weight sync mode used for encoding.
+        leaves (dict): Map from leaf path to its encoded value.
+    """
+
+    def __init__(self, version, base_version, base_id, mode, leaves):
+        self.version = version
+        self.base_version = base_version
+        self.base_id = base_id
+        self.mode = mode
+        self.leaves = leaves
+
+    def apply(self, base):
+        """Reconstructs the full weights from the given base weights."""
+
+        if self.mode == "quantized":
+            base_leaves = dict(_flatten(base))
+            replacements = {
+                path: (base_leaves[path] + leaf.dequantize()
+                       if isinstance(leaf, QuantizedArray) else leaf)
+                for path, leaf in self.leaves.items()
+            }
+        else:
+            replacements = self.leaves
+        return _replace_leaves(base, replacements)
+
+    def nbytes(self):
+        return sum(_nbytes(leaf) for leaf in self.leaves.values())
+
+
+@DeveloperAPI
+class WeightsEncoder(object):
+    """Encodes successive weights as updates against a versioned base.
+
+    This is used on the driver by policy optimizers. The encoded weights
+    can be passed as-is to `RolloutWorker.set_weights`.
+
+    Examples:
+        >>> encoder = WeightsEncoder("quantized")
+        >>> update = encoder.encode(local_worker.get_weights())
+        >>> weights = ray.put(update)
+        >>> acks = [w.set_weights.remote(weights) for w in remote_workers]
+        >>> encoder.track(update, acks)
+    """
+
+    def __init__(self, mode="full", rebase_interval=100, rebase_ratio=0.5):
+        """Initialize a weights encoder.
+
+        Arguments:
+            mode (str): one of "full", "changed" or "quantized"
+            rebase_interval (int): max number of updates to encode against
+                the same base
+            rebase_ratio (float): rebase whenever an update is larger than
+                this fraction of the full weights size
+        """
+        if mode not in WEIGHT_SYNC_MODES:
+            raise ValueError("Unknown weight sync mode {}, must be one of "
+                             "{}".format(mode, WEIGHT_SYNC_MODES))
+        self.mode = mode
+        self.rebase_interval = rebase_interval
+        self.rebase_ratio = rebase_ratio
+        self.version = 0
+        self.base_version = None
+        self.base_id = None
+        self.base_leaves = None
+        # Bases that sent updates may still refer to, by version. Only the
+        # ObjectID returned by ray.put pins an object, copies nested in
+        # updates do not.
+        self.live_bases = {}
+        # (base version, ObjectID) pairs for updates not yet applied
+        self.pending_acks = []
+        self.updates_since_rebase = 0
+        self.num_rebases = 0
+        self.last_bytes = 0
+        self.total_bytes = 0
+        self.total_full_bytes = 0
+
+    def encode(self, weights):
+        """Returns the encoded weights for the next sync.
+
+        In "full" mode, the weights are returned unchanged.
+        """
+        self.version += 1
+        leaves = _flatten(weights)
+        full_bytes = sum(_nbytes(leaf) for _, leaf in leaves)
+        self.total_full_bytes += full_bytes
+
+        if self.mode == "full":
+            self._record(full_bytes)
+            return weights
+
+        if self._needs_rebase(leaves):
+            self._rebase(weights, leaves)
+            update = WeightsUpdate(self.version, self.base_version,
+                                   self.base_id, self.mode, {})
+            self._record(full_bytes)
+            return update
+
+        update = WeightsUpdate(self.version, self.base_version, self.base_id,
+                               self.mode, self._encode_leaves(leaves))
+        nbytes = update.nbytes()
+        self.updates_since_rebase += 1
+        if nbytes > self.rebase_ratio * full_bytes:
+            # Rebase now so that later updates are small again
+            self._rebase(weights, leaves)
+            update = WeightsUpdate(self.version, self.base_version,
+                                   self.base_id, self.mode, {})
+            nbytes = full_bytes
+        self._record(nbytes)
+        return update
+
+    def track(self, update, acks):
+        """Keeps the base of a sent update alive until it has been applied.
+
+        Arguments:
+            update (WeightsUpdate|dict): value returned by `encode`
+            acks (list): ObjectIDs that become ready once the update has
+                been applied, e.g. the results of `set_weights` tasks. An ack
+                may also resolve to a list of further acks, as returned by
+                `TreeSync.broadcast_weights`.
+        """
+        if isinstance(update, WeightsUpdate):
+            self.pending_acks.extend((update.base_version, a) for a in acks)
+
+    def stats(self):
+        num_syncs = max(1, self.version)
+        return {
+            "weight_sync_version": self.version,
+            "weight_sync_num_rebases": self.num_rebases,
+            "weight_sync_live_bases": len(self.live_bases),
+            "weight_sync_last_bytes": self.last_bytes,
+            "weight_sync_mean_bytes": round(self.total_bytes / num_syncs, 1),
+            "weight_sync_compression_ratio": round(
+                self.total_full_bytes / max(1, self.total_bytes), 3),
+        }
+
+    def _needs_rebase(self, leaves):
+        if self.base_leaves is None:
+            return True
+        if self.updates_since_rebase >= self.rebase_interval:
+            return True
+        if len(leaves) != len(self.base_leaves):
+            return True
+        for path, leaf in leaves:
+            base = self.base_leaves.get(path)
+            if base is None or getattr(base, "shape", None) != getattr(
+                    leaf, "shape", None):
+                return True
+        return False
+
+    def _rebase(self, weights, leaves):
+        self.base_id = ray.put(weights)
+        self.base_version = self.version
+        self.live_bases[self.base_version] = self.base_id
+        self._release_bases()
+        self.base_leaves = {
+            path: np.copy(leaf) if isinstance(leaf, np.ndarray) else leaf
+            for path, leaf in leaves
+        }
+        self.updates_since_rebase = 0
+        self.num_rebases += 1
+
+    def _release_bases(self):
+        """Drops the old bases that no pending update refers to anymore."""
+
+        if self.pending_acks:
+            acks = list({a for _, a in self.pending_acks})
+            ready, _ = ray.wait(acks, num_returns=len(acks), timeout=0)
+            ready = set(ready)
+            pending = []
+            for version, ack in self.pending_acks:
+                if ack not in ready:
+                    pending.append((version, ack))
+                    continue
+                try:
+                    nested = ray.get(ack)
+                except RayError:
+                    # The worker died and won't decode the update
+                    continue
+                if isinstance(nested, list):
+                    pending.extend((version, a) for a in nested)
+            self.pending_acks = pending
+
+        needed = {version for version, _ in self.pending_acks}
+        needed.add(self.base_version)
+        for version in list(self.live_bases):
+            if version not in needed:
+                del self.live_bases[version]
+
+    def _encode_leaves(self, leaves):
+        encoded = {}
+        for path, leaf in leaves:
+            base = self.base_leaves[path]
+            if not isinstance(leaf, np.ndarray):
+                encoded[path] = leaf
+            elif np.array_equal(leaf, base):
+                continue
+            elif (self.mode == "quantized" and leaf.size > 0
+                  and np.issubdtype(leaf.dtype, np.floating)):
+                encoded[path] = QuantizedArray(leaf - base)
+            else:
+                encoded[path] = leaf
+        return encoded
+
+    def _record(self, nbytes):
+        self.last_bytes = nbytes
+        self.total_bytes += nbytes
+
+
+@DeveloperAPI
+class WeightsDecoder(object):
+    """Reconstructs weights from WeightsUpdates on the rollout worker side.
+
+    The decoder tracks the version of the last applied weights, so that
+    redundant updates can be skipped.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.base_version = None
+        self.base = None
+
+    def decode(self, update):
+        """Returns the full weights, or None if already at this version."""
+
+        if update.version == self.version:
+            return None
+        if update.base_version != self.base_version:
+            self.base = ray.get(update.base_id)
+            self.base_version = update.base_version
+        self.version = update.version
+        return update.apply(self.base)
@@ -158,6 +158,51 @@ Status OpenPrefixedKey(RedisModuleKey **out, RedisModuleCtx *ctx,
                          /*mutated_key_str=*/nullptr);
 }
 
+/// Prefix of the per-job secondary index. On every shard, the set at
+/// JOB_INDEX:<job_id> holds the keys of the task and object table entries of
+/// that job that are stored on the shard, so that the monitor can remove them
+/// once the job exits without scanning the tables.
+static const char *kJobIndexPrefix = "JOB_INDEX:";
+
+/// Add the key of a task or object table entry to the index of the job that
+/// created it. Entries of other tables are not indexed.
+///
+/// \param prefix_enum The TablePrefix of the entry as a RedisModuleString.
+/// \param keyname The ID of the entry.
+/// \return OK if the entry was indexed or doesn't need to be.
+Status AddToJobIndex(RedisModuleCtx *ctx, RedisModuleString *prefix_enum,
+                     RedisModuleString *keyname) {
+  TablePrefix prefix;
+  RAY_RETURN_NOT_OK(ParseTablePrefix(prefix_enum, &prefix));
+  size_t size;
+  const char *data = RedisModule_StringPtrLen(keyname, &size);
+  std::string task_id;
+  if (prefix == TablePrefix::RAYLET_TASK && size == ray::TaskID::Size()) {
+    task_id.assign(data, size);
+  } else if (prefix == TablePrefix::OBJECT && size == ray::ObjectID::Size()) {
+    // Task returns and put objects embed the ID of the task that created
+    // them. Other object IDs, e.g. random ones, belong to no job.
+    const auto object_id = ray::ObjectID::FromBinary(std::string(data, size));
+    if (!object_id.CreatedByTask()) {
+      return Status::OK();
+    }
+    task_id = object_id.TaskId().Binary();
+  } else {
+    return Status::OK();
+  }
+  // The job ID makes up the last bytes of a task ID.
+  const std::string job_id =
+      task_id.substr(ray::TaskID::Size() - ray::JobID::Size(), ray::JobID::Size());
+  const std::string index_key = kJobIndexPrefix + job_id;
+  RedisModuleCallReply *reply =
+      RedisModule_Call(ctx, "SADD", "bs", index_key.data(), index_key.size(),
+                       PrefixedKeyString(ctx, prefix_enum, keyname));
+  if (RedisModule_CallReplyType(reply) == REDISMODULE_REPLY_ERROR) {
+    return Status::RedisError("Failed to update the job index");
+  }
+  return Status::OK();
+}
+
 /// Open the key used to store the channels that should be published to when an
 /// update happens at the given keyname.
 Status GetBroadcastKey(RedisModuleCtx *ctx, RedisModuleString *pubsub_channel_str,
@@ -270,6 +315,7 @@ int TableAdd_DoWrite(RedisModuleCtx *ctx, RedisModuleString **argv, int argc,
   REPLY_AND_RETURN_IF_NOT_OK(OpenPrefixedKey(
       &key, ctx, prefix_str, id, REDISMODULE_READ | REDISMODULE_WRITE, mutated_key_str));
   RedisModule_StringSet(key, data);
+  REPLY_AND_RETURN_IF_NOT_OK(AddToJobIndex(ctx, prefix_str, id));
   return REDISMODULE_OK;
 }
 
@@ -465,6 +511,9 @@ int Set_DoWrite(RedisModuleCtx *ctx, RedisModuleString **argv, int argc, bool is
       RedisModule_Call(ctx, is_add ? "SADD" : "SREM", "ss", key_string, data);
   if (RedisModule_CallReplyType(reply) != REDISMODULE_REPLY_ERROR) {
     *changed = RedisModule_CallReplyInteger(reply) > 0;
+    if (is_add && *changed) {
+      REPLY_AND_RETURN_IF_NOT_OK(AddToJobIndex(ctx, prefix_str, id));
+    }
     if (!is_add && *changed) {
       // try to delete the empty set.
       RedisModuleKey *key;